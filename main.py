@@ -1,34 +1,44 @@
 # main.py
-from fastapi import FastAPI, UploadFile, File
+# BLAS / OpenMP 스레드 수는 numpy / torch가 로드되기 전에 정해야 한다 (uvicorn 워커 수 기준)
+from services.runtime_config import apply_thread_env
+apply_thread_env()
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
-from starlette.responses import HTMLResponse, FileResponse
+from starlette.responses import HTMLResponse, FileResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
+import asyncio
+import json
 import os
 import uuid
-
-from modules.module_a_speech import analyze_speech
-from modules.module_b_sound import analyze_sound, analyze_sound_from_file
-from modules.module_c_fusion import fuse_situation
-
-# 영상 → 오디오 추출을 위한 라이브러리
-try:
-    # moviepy 2.x는 video.io에서 VideoFileClip을 import
-    from moviepy.video.io.VideoFileClip import VideoFileClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    try:
-        # moviepy 1.x 호환성 (구버전)
-        from moviepy.editor import VideoFileClip
-        MOVIEPY_AVAILABLE = True
-    except ImportError:
-        MOVIEPY_AVAILABLE = False
-        # 서버 시작 시에만 경고 출력 (매번 출력하지 않도록)
-        import sys
-        if sys.argv[0].endswith('uvicorn') or 'main.py' in sys.argv[0]:
-            print("⚠️  moviepy가 설치되지 않았습니다. 영상 분석 기능을 사용하려면 설치하세요: pip install moviepy")
-
+import numpy as np
+
+from services.pipeline import (
+    fusion_stage,
+    guideline_stage,
+    guideline_stage_with_status,
+    sound_label_stage,
+    sound_waveform_stage,
+    speech_stage,
+)
+from services.executors import run_in_stage, shutdown_executors
+from modules.module_b_sound import DURATION, get_activity_gate, get_feature_cache, split_windows
+from modules.module_a_speech import add_reload_listener, get_rules_status, reload_rules
+from modules.module_c_fusion import is_fallback_situation
+from services.whisper_registry import WHISPER_PRELOAD, get_whisper_stats
+from services.stt_scheduler import get_stt_scheduler, get_stt_scheduler_stats
+from services.media_decoder import (
+    SAMPLE_RATE,
+    StreamingPCMDecoder,
+    decode_audio_file,
+    extract_audio_to_wav,
+)
+from services.stream_session import StreamingAnalysisSession
+from services.result_cache import get_analyze_cache
+from services.warmup import WARMUP_COMPONENTS, get_warmup_status, run_warmup
+from services.runtime_config import apply_runtime_config, format_runtime_report, get_runtime_report
 
 app = FastAPI(title="Emergency Assistant (Local MVP)")
 
@@ -41,10 +51,30 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더 허용
 )
 
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Content-Length가 MAX_UPLOAD_BYTES를 넘는 업로드는 본문을 읽기 전에 거절"""
+    if request.method == "POST" and request.url.path == "/api/emergency/analyze-video":
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"업로드 파일이 너무 큽니다. (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"},
+            )
+    return await call_next(request)
+
 # 임시 파일 저장 폴더
 TEMP_DIR = "temp_media"
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# 이 크기 이하의 업로드는 임시 파일 없이 디코더로 바로 스트리밍 (0이면 항상 디스크 경로)
+INMEMORY_MAX_BYTES = int(os.getenv("INMEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# 업로드 최대 크기 / 한 번에 읽는 청크 크기 (요청당 입력 메모리는 청크 크기로 제한됨)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
 
 # ==========================================
 # 유틸리티 함수
@@ -53,26 +83,108 @@ def extract_audio_from_video(video_path: str) -> str:
     """
     mp4 등 영상 파일에서 오디오 트랙만 추출하여 WAV 파일로 저장.
     
+    ffmpeg로 오디오 스트림만 demux 하므로 영상 디코더를 띄우지 않는다.
+    (분석 파이프라인은 WAV를 거치지 않고 load_pcm으로 영상에서 바로 PCM을 얻는다)
+    
     Input: 영상 파일 경로
     Output: 추출된 오디오 WAV 파일 경로
     """
-    if not MOVIEPY_AVAILABLE:
-        raise ImportError("moviepy가 설치되지 않았습니다. pip install moviepy")
-    
     audio_path = os.path.join(TEMP_DIR, f"{uuid.uuid4().hex}.wav")
     
-    clip = VideoFileClip(video_path)
     # B 모듈이 기대하는 샘플링 레이트(16000)로 맞춤
-    clip.audio.write_audiofile(
-        audio_path,
-        fps=16000,
-        codec="pcm_s16le",
-        verbose=False,
-        logger=None,
-    )
-    clip.close()
+    return extract_audio_to_wav(video_path, audio_path, sr=SAMPLE_RATE)
+
+
+def load_pcm(audio_path: str) -> np.ndarray:
+    """
+    오디오 파일을 16kHz mono float32 배열로 한 번만 디코딩.
     
-    return audio_path
+    반환된 배열 하나를 STT(A 모듈)와 사운드 CNN(B 모듈)이 함께 사용한다.
+    """
+    # 경로를 절대 경로로 변환하고 정규화
+    audio_path = os.path.abspath(audio_path)
+    # Windows 경로 구분자를 정규화 (백슬래시 → 슬래시로 변환)
+    audio_path_normalized = audio_path.replace('\\', '/')
+    
+    # 디코더(ffmpeg)에서 Windows 경로 문제가 발생할 수 있으므로 여러 방법 시도
+    # 방법 1: 원본 절대 경로 사용 (Windows 백슬래시)
+    try:
+        print(f"   시도 1: 절대 경로 (백슬래시)")
+        audio = decode_audio_file(audio_path)
+        print(f"   ✅ 성공!")
+        return audio
+    except (FileNotFoundError, OSError) as e1:
+        print(f"   ❌ 실패: {e1}")
+    
+    # 방법 2: 정규화된 경로 사용 (슬래시)
+    try:
+        print(f"   시도 2: 정규화된 경로 (슬래시)")
+        audio = decode_audio_file(audio_path_normalized)
+        print(f"   ✅ 성공!")
+        return audio
+    except (FileNotFoundError, OSError) as e2:
+        print(f"   ❌ 실패: {e2}")
+    
+    # 방법 3: 상대 경로로 변환 시도
+    try:
+        rel_path = os.path.relpath(audio_path)
+        print(f"   시도 3: 상대 경로")
+        audio = decode_audio_file(rel_path)
+        print(f"   ✅ 성공!")
+        return audio
+    except (FileNotFoundError, OSError) as e3:
+        print(f"   ❌ 실패: {e3}")
+        raise FileNotFoundError(f"모든 경로 형식 시도 실패. 마지막 오류: {e3}")
+
+
+def run_stt_on_audio(audio: np.ndarray) -> str:
+    """
+    이미 디코딩된 16kHz mono PCM에서 음성을 텍스트로 변환 (STT).
+    
+    프로세스 공유 Whisper 모델 사용 (서버 시작 시 한 번만 로드됨).
+    동시에 들어온 요청들은 스케줄러가 모아서 한 배치로 디코딩한다.
+    무음 / 일정한 배경 소음뿐인 오디오는 활동 게이트가 Whisper를 생략한다.
+    """
+    try:
+        if audio.size == 0:
+            print("❌ STT 오류: 오디오가 비어있습니다.")
+            return "음성을 인식할 수 없습니다."
+        
+        # 활동 게이트 (감사 대상이면 건너뛰지 않고 인식해서 놓친 말이 있었는지 기록)
+        gate = get_activity_gate()
+        _, windows = split_windows(audio, hop=DURATION)
+        active, audit, levels = gate.evaluate_clip(windows, source="stt")
+        if not active and not audit:
+            print(f"⏭️  활동 없음 - STT 생략 ({len(audio) / SAMPLE_RATE:.1f}초)")
+            return "음성을 인식할 수 없습니다."
+        
+        print(f"🔄 음성 인식 중... ({len(audio) / SAMPLE_RATE:.1f}초)")
+        text = get_stt_scheduler().transcribe(audio).strip()
+        if audit:
+            gate.record_audit("stt", [bool(text)], [{
+                "text": text[:50],
+                "seconds": round(len(audio) / SAMPLE_RATE, 1),
+                "rms_db": round(float(levels["rms_db"].max()), 2),
+            }])
+        
+        if not text:
+            # STT 실패 시 기본 텍스트 반환
+            print("⚠️  STT 결과가 비어있습니다.")
+            return "음성을 인식할 수 없습니다."
+        
+        print(f"✅ STT 완료: {text[:50]}...")  # 처음 50자만 출력
+        return text
+    except ImportError:
+        # whisper가 설치되지 않은 경우 더미 텍스트 반환
+        print("⚠️  whisper가 설치되지 않았습니다. STT 기능을 사용하려면: pip install openai-whisper")
+        return "할머니가 갑자기 쓰러져서 숨을 안 쉬어요..."
+    except Exception as e:
+        # 기타 오류 발생 시
+        print(f"⚠️  STT 오류 발생: {e}")
+        print(f"   오류 타입: {type(e).__name__}")
+        import traceback
+        print(f"   상세 오류:\n{traceback.format_exc()}")
+        return "음성을 인식할 수 없습니다."
 
 
 def run_stt_on_wav(wav_path: str) -> str:
@@ -80,13 +192,9 @@ def run_stt_on_wav(wav_path: str) -> str:
     오디오 파일에서 음성을 텍스트로 변환 (STT).
     
     Module A의 Whisper 모델을 사용하여 STT 수행.
+    (이미 디코딩된 PCM이 있으면 run_stt_on_audio를 직접 사용)
     """
     try:
-        # 경로를 절대 경로로 변환하고 정규화
-        wav_path = os.path.abspath(wav_path)
-        # Windows 경로 구분자를 정규화 (백슬래시 → 슬래시로 변환)
-        wav_path_normalized = wav_path.replace('\\', '/')
-        
         # 파일 존재 여부 확인
         if not os.path.exists(wav_path):
             print(f"❌ STT 오류: 오디오 파일을 찾을 수 없습니다. 경로: {wav_path}")
@@ -101,69 +209,8 @@ def run_stt_on_wav(wav_path: str) -> str:
             print("❌ STT 오류: 오디오 파일이 비어있습니다.")
             return "음성을 인식할 수 없습니다."
         
-        import whisper
-        # Whisper 모델 로드 (small 모델 사용, 필요시 base/tiny로 변경 가능)
-        print("🔄 Whisper 모델 로드 중...")
-        model = whisper.load_model("small")
-        print("✅ Whisper 모델 로드 완료")
-        
-        # transcribe 호출 전에 파일 존재 재확인
-        if not os.path.exists(wav_path):
-            print(f"❌ STT 오류: transcribe 호출 전 파일이 사라졌습니다. 경로: {wav_path}")
-            return "음성을 인식할 수 없습니다."
-        
-        print(f"🔄 음성 인식 중... (파일: {wav_path})")
-        
-        # Whisper transcribe는 내부적으로 ffmpeg를 사용하는데, 
-        # Windows에서 경로 문제가 발생할 수 있으므로 여러 방법 시도
-        result = None
-        last_error = None
-        
-        # 방법 1: 원본 절대 경로 사용 (Windows 백슬래시)
-        try:
-            print(f"   시도 1: 절대 경로 (백슬래시)")
-            result = model.transcribe(wav_path, language="ko")
-            print(f"   ✅ 성공!")
-        except (FileNotFoundError, OSError) as e1:
-            last_error = e1
-            print(f"   ❌ 실패: {e1}")
-            
-            # 방법 2: 정규화된 경로 사용 (슬래시)
-            try:
-                print(f"   시도 2: 정규화된 경로 (슬래시)")
-                result = model.transcribe(wav_path_normalized, language="ko")
-                print(f"   ✅ 성공!")
-            except (FileNotFoundError, OSError) as e2:
-                last_error = e2
-                print(f"   ❌ 실패: {e2}")
-                
-                # 방법 3: 상대 경로로 변환 시도
-                try:
-                    rel_path = os.path.relpath(wav_path)
-                    print(f"   시도 3: 상대 경로")
-                    result = model.transcribe(rel_path, language="ko")
-                    print(f"   ✅ 성공!")
-                except (FileNotFoundError, OSError) as e3:
-                    last_error = e3
-                    print(f"   ❌ 실패: {e3}")
-                    raise FileNotFoundError(f"모든 경로 형식 시도 실패. 마지막 오류: {e3}")
-        
-        if result is None:
-            raise FileNotFoundError(f"STT transcribe 실패: {last_error}")
-        
-        text = result.get("text", "").strip()
-        
-        if not text:
-            # STT 실패 시 기본 텍스트 반환
-            print("⚠️  STT 결과가 비어있습니다.")
-            return "음성을 인식할 수 없습니다."
-        
-        print(f"✅ STT 완료: {text[:50]}...")  # 처음 50자만 출력
-        return text
-    except ImportError:
-        # whisper가 설치되지 않은 경우 더미 텍스트 반환
-        print("⚠️  whisper가 설치되지 않았습니다. STT 기능을 사용하려면: pip install openai-whisper")
-        return "할머니가 갑자기 쓰러져서 숨을 안 쉬어요..."
+        audio = load_pcm(wav_path)
+        return run_stt_on_audio(audio)
     except FileNotFoundError as e:
         # 파일을 찾을 수 없는 경우
         print(f"❌ STT 오류: 파일을 찾을 수 없습니다. 경로: {wav_path}")
@@ -178,6 +225,87 @@ def run_stt_on_wav(wav_path: str) -> str:
         return "음성을 인식할 수 없습니다."
 
 
+async def iter_upload_chunks(file: UploadFile):
+    """
+    업로드를 UPLOAD_CHUNK_SIZE 단위로 읽어서 하나씩 돌려준다.
+    누적 크기가 MAX_UPLOAD_BYTES를 넘으면 즉시 413으로 중단한다.
+    """
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"업로드 파일이 너무 큽니다. (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)",
+            )
+        yield chunk
+
+
+async def decode_upload_via_disk(file: UploadFile, file_ext: str) -> np.ndarray:
+    """
+    (fallback) 업로드를 청크 단위로 TEMP_DIR에 저장한 뒤 PCM으로 디코딩.
+    영상이면 ffmpeg가 오디오 트랙만 demux 하므로 중간 WAV 파일을 만들지 않는다.
+    사용한 임시 파일은 삭제한다.
+    """
+    uploaded_path = None
+    
+    try:
+        # 업로드된 파일을 TEMP_DIR에 청크 단위로 저장 (전체를 메모리에 올리지 않음)
+        # 확장자는 ffmpeg가 컨테이너 형식을 판별하는 데 사용됨
+        file_id = uuid.uuid4().hex
+        uploaded_path = os.path.join(TEMP_DIR, f"{file_id}{file_ext}")
+        
+        with open(uploaded_path, "wb") as f:
+            async for chunk in iter_upload_chunks(file):
+                f.write(chunk)
+        
+        # 오디오 파일(wav, mp3 등)이든 영상 파일이든 오디오 트랙만 16kHz mono PCM으로 디코딩
+        return await run_in_stage("media", load_pcm, uploaded_path)
+    
+    finally:
+        # 임시 파일 정리
+        if uploaded_path and os.path.exists(uploaded_path):
+            try:
+                os.remove(uploaded_path)
+            except Exception:
+                pass
+
+
+async def decode_upload(file: UploadFile, file_ext: str) -> np.ndarray:
+    """
+    업로드 → 16kHz mono float32 PCM.
+    
+    업로드를 청크 단위로 읽어서 ffmpeg 디코더에 바로 흘려 넣는다 (임시 파일 없음).
+    크기가 INMEMORY_MAX_BYTES를 넘거나 파이프 디코딩이 불가능하면
+    (ffmpeg 없음, 파일 끝에 moov가 있는 mp4 등) 처음부터 다시 읽어 디스크 경로로 처리한다.
+    """
+    upload_size = getattr(file, "size", None)
+    if INMEMORY_MAX_BYTES > 0 and (upload_size is None or upload_size <= INMEMORY_MAX_BYTES):
+        decoder = None
+        try:
+            decoder = StreamingPCMDecoder()
+            async for chunk in iter_upload_chunks(file):
+                # 파이프 쓰기/디코딩 대기는 이벤트 루프 밖(media 스레드 풀)에서
+                await run_in_stage("media", decoder.feed, chunk)
+            pcm = await run_in_stage("media", decoder.finish)
+            print(f"✅ 스트리밍 디코딩 완료 ({decoder.bytes_fed} bytes → {len(pcm) / SAMPLE_RATE:.1f}초)")
+            return pcm
+        except (RuntimeError, OSError) as e:
+            print(f"⚠️  스트리밍 디코딩 실패, 디스크 경로로 처리합니다: {str(e)[:200]}")
+            if decoder is not None:
+                decoder.abort()
+            await file.seek(0)
+        except HTTPException:
+            if decoder is not None:
+                decoder.abort()
+            raise
+    
+    return await decode_upload_via_disk(file, file_ext)
+
+
 class EmergencyAnalyzeRequest(BaseModel):
     stt_text: str
     sound_event: str
@@ -206,10 +334,83 @@ class QuestionResponse(BaseModel):
 # 정적 파일 서빙 (HTML 파일)
 app.mount("/static", StaticFiles(directory="."), name="static")
 
+@app.on_event("startup")
+def configure_runtime():
+    """torch / BLAS 스레드 수를 워커 몫의 코어에 맞추고 워커별 실제 병렬도를 출력 (워밍업보다 먼저)"""
+    apply_runtime_config()
+    report = get_runtime_report()
+    print(f"✅ 런타임 설정 [pid {report['pid']}]: {format_runtime_report(report)}")
+    if report.get("oversubscribed"):
+        print("⚠️  sound 스레드 × torch 스레드가 워커 코어 수보다 많습니다 (TORCH_NUM_THREADS 확인)")
+
+
+@app.on_event("startup")
+def invalidate_cache_on_rules_change():
+    """intent 규칙이 바뀌면 (파일 감시 자동 재로드 포함) 이전 규칙으로 만든 분석 결과 캐시를 비움"""
+    def clear_analyze_cache(previous, rules):
+        removed = get_analyze_cache().invalidate()
+        print(f"✅ intent 규칙 v{previous.version} → v{rules.version}: 분석 결과 캐시 {removed}개 삭제")
+
+    add_reload_listener(clear_analyze_cache)
+
+
+@app.on_event("startup")
+def warmup_models():
+    """
+    서버 시작 시 CNN / Whisper / RAG(임베딩 + 벡터 스토어)를 미리 로드하고
+    더미 추론을 한 번씩 돌려서 첫 요청의 지연을 없앤다. (WHISPER_PRELOAD=0이면 Whisper 제외)
+    """
+    components = [
+        name for name in WARMUP_COMPONENTS if WHISPER_PRELOAD or name != "whisper"
+    ]
+    if components:
+        summary = run_warmup(components)
+        print(f"✅ 워밍업 완료 ({summary['total_seconds']}초)")
+
+
+@app.on_event("shutdown")
+def stop_stage_executors():
+    """서버 종료 시 단계별 스레드 풀 정리"""
+    shutdown_executors()
+
+
 @app.get("/")
 def health_check():
     return {"status": "ok", "message": "Emergency backend running"}
 
+@app.get("/api/system/models")
+def model_status():
+    """로드된 모델의 로드 시간/메모리 사용량"""
+    return {
+        "whisper": get_whisper_stats(),
+        "stt_batching": get_stt_scheduler_stats(),
+        "warmup": get_warmup_status(),
+        "runtime": get_runtime_report(),
+    }
+
+@app.get("/api/system/activity-gate")
+def activity_gate_status():
+    """활동 게이트 통계: CNN 윈도우 / STT 클립별 건너뛴 비율, 감사로 확인한 false skip 비율과 최근 사례"""
+    return get_activity_gate().stats()
+
+@app.get("/api/system/intent-rules")
+def intent_rules_status():
+    """A 모듈 intent 규칙: 현재 버전 / 로드 시각 / 키워드 검증 결과 / 마지막 재로드 오류 / 최근 버전 이력"""
+    return get_rules_status()
+
+@app.post("/api/system/intent-rules/reload")
+def reload_intent_rules():
+    """
+    intent 규칙 파일을 즉시 다시 읽는다 (검증에 실패하면 기존 규칙 유지).
+    규칙이 바뀌었으면 이전 규칙으로 만든 분석 결과 캐시도 비운다 (invalidate_cache_on_rules_change).
+    """
+    return reload_rules()
+
+@app.get("/api/system/warmup")
+def warmup_status():
+    """시작 시 워밍업 결과 (구성 요소별 로드 시간 / 더미 추론 시간)"""
+    return get_warmup_status()
+
 @app.get("/app")
 def serve_app():
     """HTML 앱 제공"""
@@ -221,42 +422,69 @@ def serve_index():
     return FileResponse("index.html")
 
 
+@app.get("/api/system/cache")
+def cache_status():
+    """/api/emergency/analyze 결과 캐시 적중률/크기"""
+    return get_analyze_cache().stats()
+
+@app.get("/api/system/feature-cache")
+def feature_cache_status():
+    """B 모듈 log-mel 특징 캐시 적중률/크기 (FEATURE_CACHE_DIR가 없으면 꺼짐)"""
+    cache = get_feature_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+@app.delete("/api/system/cache")
+def invalidate_cache(stt_text: Optional[str] = None, sound_event: Optional[str] = None):
+    """
+    결과 캐시 무효화.
+    조건 없이 호출하면 전체 삭제, stt_text / sound_event를 주면 해당 항목만 삭제.
+    (규칙/프롬프트/RAG 문서를 바꾼 뒤 호출)
+    """
+    removed = get_analyze_cache().invalidate(stt_text=stt_text, sound_event=sound_event)
+    return {"removed": removed}
+
+
 @app.post("/api/emergency/analyze", response_model=EmergencyAnalyzeResponse)
-def analyze_emergency(req: EmergencyAnalyzeRequest):
+async def analyze_emergency(req: EmergencyAnalyzeRequest, response: Response):
     """
     외부에서 호출하는 메인 API.
     
-    Process Flow:
+    Process Flow (모든 단계가 await 가능한 비동기 파이프라인):
+    0. 결과 캐시 조회 (정규화 텍스트 + 이벤트 + confidence 구간) → 적중 시 바로 반환
     1. A-Module: analyze_speech(stt_text)
     2. B-Module: analyze_sound(sound_event, confidence)
-    3. C-Module: fuse_situation(speech, sound)
-    4. 상황 ID에 따라 간단한 도움말 생성 (추후 Gemini Flash-Lite로 대체)
+    3. C-Module: fuse_situation_async(speech, sound) - Gemini 비동기 호출
+    4. RAG 안내문 생성 - 문서 검색은 전용 스레드 풀, LLM 호출은 await
+    
+    응답 헤더 X-Cache: HIT / MISS
     """
+    # 0. 같은 입력의 최근 결과가 있으면 Gemini/RAG 호출 생략
+    cache = get_analyze_cache()
+    # intent 규칙이 바뀌면 (재로드 중에 시작한 요청 포함) 이전 규칙으로 만든 결과는 다른 키
+    cache_key = cache.make_key(
+        req.stt_text, req.sound_event, req.sound_confidence, get_rules_status().get("sha256")
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        response.headers["X-Cache"] = "HIT"
+        return EmergencyAnalyzeResponse(**cached)
+
     # 1. A 모듈 (음성 분석)
-    speech_result = analyze_speech(req.stt_text)
+    speech_result = await speech_stage(req.stt_text)
 
     # 2. B 모듈 (사운드 분석)
-    sound_result = analyze_sound(req.sound_event, req.sound_confidence)
+    sound_result = await sound_label_stage(req.sound_event, req.sound_confidence)
 
     # 3. C 모듈 (퓨전) - Gemini를 사용한 상황 분석
-    situation = fuse_situation(
-        speech=speech_result,
-        sound=sound_result,
-        source="realtime"
-    )
+    situation = await fusion_stage(speech_result, sound_result, source="realtime")
 
     # 4. 상황에 따른 안내문 생성 (RAG 사용)
-    try:
-        from services.rag_client import generate_guideline_from_situation
-        guideline = generate_guideline_from_situation(situation)
-    except ImportError:
-        # RAG가 없으면 기본 안내문 사용
-        if situation.get("situation_id") == "S2":
-            guideline = "지금 즉시 119에 신고하고, 심폐소생술이 가능한 사람을 찾으세요."
-        elif situation.get("situation_id") in ["S1", "S3", "S5", "S6", "S7"]:
-            guideline = "환자를 편안히 앉히고 통증이 심해지면 즉시 119에 신고하세요."
-        else:
-            guideline = "증상을 관찰하고 악화되면 바로 119에 신고하세요."
+    guideline, guideline_fallback = await guideline_stage_with_status(situation)
+
+    # Gemini 응답 파싱 실패/RAG 기본 안내문 같은 대체 결과는 저장하지 않음 (다음 요청에서 다시 시도)
+    if not (is_fallback_situation(situation) or guideline_fallback):
+        cache.put(cache_key, {"situation": situation, "guideline": guideline})
+    response.headers["X-Cache"] = "MISS"
 
     return EmergencyAnalyzeResponse(
         situation=situation,
@@ -279,15 +507,16 @@ if MULTIPART_AVAILABLE:
         영상 파일 또는 오디오 파일을 업로드하여 응급 상황을 분석하는 API.
         
         지원 형식:
-        - 영상: mp4, avi, mov 등 (moviepy가 지원하는 형식)
+        - 영상: mp4, avi, mov 등 (ffmpeg가 지원하는 형식, 오디오 트랙만 demux)
         - 오디오: wav, mp3 등 (직접 오디오 파일)
         
         Process Flow:
-        1. 파일 업로드 및 임시 저장
-        2. 영상인 경우 → 오디오 추출 (wav는 건너뜀)
-        3. 오디오 → STT → A 모듈 (음성 분석)
-        4. 오디오 → B 모듈 (사운드 분석)
-        5. A+B → C 모듈 (퓨전) → 최종 situation JSON
+        1. 파일 업로드 (청크 단위 스트리밍, MAX_UPLOAD_BYTES 초과 시 413)
+        2. 디코더로 바로 스트리밍 (크기 초과/실패 시 임시 저장 후 디코딩)
+        3. 오디오 → 16kHz mono PCM (한 번만 디코딩)
+        4. PCM → STT → A 모듈 (음성 분석)      ┐ 동시에 실행
+        5. 같은 PCM → B 모듈 (사운드 분석)     ┘ (클립 전체를 2초 슬라이딩 윈도우로)
+        6. A+B → C 모듈 (퓨전) → 최종 situation JSON
         
         Input: mp4 영상 파일 또는 wav 오디오 파일
         Output: {
@@ -295,85 +524,39 @@ if MULTIPART_AVAILABLE:
             "guideline": "..."    # 응급 대처 가이드라인
         }
         """
-        video_path = None
-        audio_path = None
-        
         try:
-            # 1. 업로드된 파일을 TEMP_DIR에 저장
-            file_id = uuid.uuid4().hex
+            # 1. 업로드 파일 형식 확인
             file_ext = os.path.splitext(file.filename)[1] or ".mp4"
-            uploaded_path = os.path.join(TEMP_DIR, f"{file_id}{file_ext}")
-            
-            file_bytes = await file.read()
-            with open(uploaded_path, "wb") as f:
-                f.write(file_bytes)
-            
-            # 2. 파일 형식 확인 및 오디오 추출/복사
-            file_ext_lower = file_ext.lower()
-            
-            # 오디오 파일인 경우 (wav, mp3 등)
-            if file_ext_lower in ['.wav', '.mp3', '.m4a', '.flac', '.ogg']:
-                # 오디오 파일은 그대로 사용
-                audio_path = uploaded_path
-            else:
-                # 영상 파일인 경우 → 오디오 추출
-                if not MOVIEPY_AVAILABLE:
-                    raise ImportError("moviepy가 설치되지 않았습니다. pip install moviepy")
-                
-                video_path = uploaded_path
-                audio_path = extract_audio_from_video(video_path)
             
-            # 3. 오디오로 STT 수행 → A 모듈
-            stt_text = run_stt_on_wav(audio_path)
-            speech_result = analyze_speech(stt_text)
+            # 2~3. 업로드를 청크 단위로 읽으면서 16kHz mono PCM으로 한 번만 디코딩
+            #      (STT와 B 모듈이 같은 버퍼 공유, 실패/크기 초과 시 디스크 경로로 처리)
+            pcm = await decode_upload(file, file_ext)
             
-            # 4. 오디오로 B 모듈 (AED CNN 모델)
-            sound_full = analyze_sound_from_file(audio_path)
-            
-            # C 모듈이 기대하는 형태로 변환
-            sound_result = {
-                "event": sound_full.get("event", "생활소음"),
-                "confidence": sound_full.get("confidence", 0.5),
-            }
-            
-            # 5. C 모듈 (Fusion + Gemini)
-            situation = fuse_situation(
-                speech=speech_result,
-                sound=sound_result,
-                source="realtime"
+            # 4~5. 같은 PCM으로 STT(stt 스레드 풀)와 B 모듈 CNN(sound 스레드 풀)을 동시에 실행
+            #      서로 독립적이므로 지연 시간은 두 단계의 합이 아니라 더 긴 쪽이 된다
+            stt_text, sound_result = await asyncio.gather(
+                run_in_stage("stt", run_stt_on_audio, pcm),
+                sound_waveform_stage(pcm),
             )
+            speech_result = await speech_stage(stt_text)
             
-            # 6. 상황에 따른 안내문 생성 (RAG 사용)
-            try:
-                from services.rag_client import generate_guideline_from_situation
-                guideline = generate_guideline_from_situation(situation)
-            except ImportError:
-                # RAG가 없으면 기본 안내문 사용
-                if situation.get("situation_id") == "S2":
-                    guideline = "지금 즉시 119에 신고하고, 심폐소생술이 가능한 사람을 찾으세요."
-                elif situation.get("situation_id") in ["S1", "S3", "S5", "S6", "S7"]:
-                    guideline = "환자를 편안히 앉히고 통증이 심해지면 즉시 119에 신고하세요."
-                else:
-                    guideline = "증상을 관찰하고 악화되면 바로 119에 신고하세요."
+            # 6. C 모듈 (Fusion + Gemini)
+            situation = await fusion_stage(speech_result, sound_result, source="realtime")
+            
+            # 7. 상황에 따른 안내문 생성 (RAG 사용)
+            guideline = await guideline_stage(situation)
             
             return EmergencyAnalyzeVideoResponse(
                 situation=situation,
                 guideline=guideline,
             )
         
+        except HTTPException:
+            # 업로드 크기 초과 등은 상태 코드 그대로 전달
+            raise
         except Exception as e:
             # 에러 발생 시 상세 정보 반환
             raise Exception(f"영상 분석 중 오류 발생: {str(e)}")
-        
-        finally:
-            # 7. 임시 파일 정리
-            for path in [video_path, audio_path]:
-                if path and os.path.exists(path):
-                    try:
-                        # 원본 업로드 파일과 추출된 오디오 파일 모두 삭제
-                        os.remove(path)
-                    except Exception:
-                        pass
 else:
     # python-multipart가 없으면 엔드포인트를 등록하지 않음
     @app.post("/api/emergency/analyze-video")
@@ -384,6 +567,61 @@ else:
         }
 
 
+@app.websocket("/api/emergency/stream")
+async def analyze_emergency_stream(websocket: WebSocket, format: str = "s16le"):
+    """
+    실시간 오디오 스트림을 받아 응급 상황을 분석하는 WebSocket API.
+    
+    녹음이 끝날 때까지 기다리지 않고, 프레임이 들어오는 대로
+    2초 윈도우 CNN → 이벤트 감지 시 바로 상황 분석 + 안내문을 푸시한다.
+    
+    Client → Server:
+    - binary: 16kHz mono PCM 프레임 (?format=s16le 기본, 또는 f32le), 길이 제한 없음
+    - text: {"type": "stop"} → 남은 오디오로 마지막 STT 후 {"type": "done"} 전송하고 종료
+    
+    Server → Client (JSON):
+    - {"type": "window", "start", "end", "event", "confidence"}   윈도우별 사운드 분석
+    - {"type": "partial_stt", "text", "start", "end"}              부분 STT
+    - {"type": "situation", "trigger", "stt_text", "situation", "guideline"}  이벤트 감지 시
+    - {"type": "error", "stage", "message"}
+    """
+    await websocket.accept()
+    
+    try:
+        session = StreamingAnalysisSession(
+            emit=websocket.send_json,
+            transcribe=run_stt_on_audio,
+            frame_format=format,
+        )
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "stage": "init", "message": str(e)})
+        await websocket.close(code=1003)
+        return
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            if message.get("bytes") is not None:
+                await session.feed(message["bytes"])
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if isinstance(control, dict) and control.get("type") == "stop":
+                    break
+        
+        await websocket.send_json(await session.finish())
+        await websocket.close()
+    except WebSocketDisconnect:
+        # 클라이언트가 먼저 끊으면 진행 중인 STT/상황 분석 정리
+        session.cancel()
+        print("ℹ️  스트리밍 연결 종료")
+
+
 # 질문-답변 API
 @app.post("/api/emergency/ask", response_model=QuestionResponse)
 def ask_question(req: QuestionRequest):
@@ -1,61 +1,575 @@
-INTENT_PATTERNS = [
-    ("traffic_accident", [
-        "교통사고", "차에치", "차가치", "버스사고", "오토바이사고",
-        "접촉사고", "추돌사고",
-    ]),
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-    ("fire", [
-        "불이났", "불났", "화재", "연기가", "타는냄새", "불붙었",
-    ]),
+# 규칙 파일 (intent 순서 = 우선순위, 앞에 있을수록 우선)
+INTENT_RULES_PATH = os.getenv(
+    "INTENT_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_rules.json")
+)
+# 규칙 파일 변경 확인 주기 (초, 0이면 자동 재로드 안 함 - reload_rules()로만)
+INTENT_RULES_POLL_SECONDS = float(os.getenv("INTENT_RULES_POLL_SECONDS", "2"))
+# 1이면 가려진(shadowed) / 겹치는 키워드 경고가 있는 규칙도 거부
+INTENT_RULES_STRICT = os.getenv("INTENT_RULES_STRICT", "0") == "1"
+# 자모 단위 근사 매칭에서 키워드당 허용하는 최대 편집 거리 (규칙 파일 max_edits의 상한, 0이면 근사 매칭 끔)
+INTENT_FUZZY_MAX_EDITS = int(os.getenv("INTENT_FUZZY_MAX_EDITS", "2"))
 
-    ("cardiac_arrest", [
-        "심정지", "심장이안뛰", "맥이안뛰", "호흡이없", 
-        "숨을안쉬", "숨이멎",
-    ]),
 
-    ("breathing_difficulty", [
-        "숨이안쉬", "숨막혀", "숨쉬기힘들", "숨을못쉬",
-        "호흡곤란", "숨이가빠",
-    ]),
+class AhoCorasick:
+    """
+    키워드 여러 개를 텍스트를 한 번 훑으면서 모두 찾는 Aho-Corasick 오토마톤.
+    iter_matches(text)는 (끝 위치, 키워드 번호)를 텍스트 순서대로 돌려준다.
+    ranks(키워드별 우선순위, 작을수록 우선)를 주면 min_rank(text)로 가장 앞선 키워드만 빠르게 찾는다.
+    """
 
-    ("chest_pain", [
-        "가슴이아파", "가슴아파", "흉통", "가슴답답",
-    ]),
+    def __init__(self, keywords: Sequence[str], ranks: Optional[Sequence[int]] = None):
+        self.keywords = list(keywords)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
 
-    ("unconscious", [
-        "의식이없", "기절했", "반응이없", "안깨", "눈을안떠",
-    ]),
+        # 1) trie
+        for kid, kw in enumerate(self.keywords):
+            if not kw:
+                continue
+            node = 0
+            for ch in kw:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(kid)
 
-    ("seizure", [
-        "경련", "발작", "간질", "몸이떨", "거품",
-    ]),
+        # 2) failure link (BFS) + 출력 합치기 (접미사로 끝나는 키워드도 같이 보고)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
 
-    ("falling", [
-        "넘어졌", "미끄러졌", "떨어졌", "낙상", "계단에서굴",
-    ]),
+        # 3) failure link를 미리 따라간 전이표 (스캔할 때 되돌아가는 루프 없음)
+        #    키워드에 없는 글자는 항상 root로 가므로 전이표에 넣지 않는다
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            queue.extend(goto[node].values())
 
-    ("bleeding", [
-        "피가나", "출혈", "피가많이", "피가안멈춰",
-    ]),
+        self._delta = delta
+        self._out = [tuple(kids) for kids in out]
+        # 노드별 출력 키워드의 최소 rank (출력이 없으면 None)
+        ranks = list(ranks) if ranks is not None else list(range(len(self.keywords)))
+        self._node_rank = [min((ranks[kid] for kid in kids), default=None) for kids in out]
 
-    ("dizziness", [
-        "어지러", "현기증", "빙빙돈", "머리가핑",
-    ]),
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        delta, out = self._delta, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            node = delta[node].get(ch, 0)
+            for kid in out[node]:
+                yield i, kid
 
-    ("assault", [
-        "맞았", "폭행", "싸우다가", "칼에", "흉기에",
-    ]),
-]
+    def min_rank(self, text: str, default: int) -> int:
+        """텍스트에 들어있는 키워드 중 가장 작은 rank (없으면 default) - 0이 나오면 바로 중단"""
+        delta, node_rank = self._delta, self._node_rank
+        best = default
+        node = 0
+        for ch in text:
+            node = delta[node].get(ch, 0)
+            rank = node_rank[node]
+            if rank is not None and rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return best
+
+
+# ==========================================
+# 자모 단위 근사 매칭 (STT가 음절 하나를 잘못 적어도 키워드를 찾도록)
+# ==========================================
+_HANGUL_BASE = 0xAC00
+_HANGUL_COUNT = 11172
+# 초성 / 중성 / 종성 → 호환 자모 (초성과 종성의 같은 자음을 같은 글자로, 겹받침은 두 자음으로 나눔)
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = (
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+    "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+_SILENT_CHOSEONG = 11  # 초성 ㅇ (소리 없음)
+
+
+def decompose_jamo(text: str) -> Tuple[str, List[int]]:
+    """
+    한글 음절 → 초성/중성/종성 자모 (한글이 아닌 글자는 그대로).
+    소리가 없는 초성 ㅇ은 빼고 받침과 초성을 같은 자모로 써서
+    연음으로 다르게 적힌 경우("숨을" / "수믈", "넘어" / "너머", "앉아" / "안자")가 같아지게 한다.
+    반환: (자모 문자열, 자모마다 원래 글자 위치)
+    """
+    jamo, owners = [], []
+    for i, ch in enumerate(text):
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code < _HANGUL_COUNT:
+            choseong, rest = divmod(code, 588)
+            jungseong, jongseong = divmod(rest, 28)
+            if choseong != _SILENT_CHOSEONG:
+                jamo.append(_CHOSEONG[choseong])
+                owners.append(i)
+            jamo.append(_JUNGSEONG[jungseong])
+            owners.append(i)
+            for consonant in _JONGSEONG[jongseong]:
+                jamo.append(consonant)
+                owners.append(i)
+        else:
+            jamo.append(ch)
+            owners.append(i)
+    return "".join(jamo), owners
+
+
+def default_max_edits(keyword: str) -> int:
+    """키워드 자모 길이에 따른 기본 허용 편집 거리 (짧은 키워드는 오탐이 많아서 정확히 일치만)"""
+    length = len(decompose_jamo(keyword)[0])
+    if length < 9:
+        return 0
+    if length < 12:
+        return 1
+    return 2
+
+
+class FuzzyMatcher:
+    """
+    여러 키워드를 편집 거리 max_edits 이내로 한 번에 찾는 bit-parallel 매처 (Wu-Manber shift-and).
+    모든 키워드를 하나의 비트 벡터(파이썬 정수)에 이어 붙이고, 편집 거리 d = 0..k마다 상태 벡터 R_d를 둔다.
+    R_d의 i번째 비트 = "키워드의 i번째 자모까지를 편집 d번 이내로 현재 위치에서 끝나게 맞췄음".
+    글자 하나당 정수 연산 O(k)번이라 텍스트 길이에 선형 (키워드 수와 무관).
+    """
+
+    def __init__(self, keywords: Sequence[str], max_edits: Sequence[int]):
+        self.max_edits = max(max_edits, default=0)
+        self._masks: Dict[str, int] = {}
+        self._end_kid: Dict[int, int] = {}  # 키워드 마지막 자모의 비트 위치 → 키워드 번호
+        self._lengths = []
+        # 키워드 첫 자모 비트 / 허용 거리가 d인 키워드의 마지막 자모 비트
+        low = 0
+        accept = [0] * (self.max_edits + 1)
+        pos = 0
+        for kid, (keyword, edits) in enumerate(zip(keywords, max_edits)):
+            low |= 1 << pos
+            for i, ch in enumerate(keyword):
+                self._masks[ch] = self._masks.get(ch, 0) | (1 << (pos + i))
+            end = pos + len(keyword) - 1
+            accept[edits] |= 1 << end
+            self._end_kid[end] = kid
+            self._lengths.append(len(keyword))
+            pos += len(keyword)
+        self._low = low
+        self._all = (1 << pos) - 1
+        self._accept = accept
+        # 텍스트 시작 전 상태: 거리 d면 키워드 앞 d개 자모를 지운(deletion) 상태까지 이미 가능
+        initial = [0]
+        for _ in range(self.max_edits):
+            initial.append(((initial[-1] << 1) | low) & self._all)
+        self._initial = initial
+
+    def iter_matches(self, jamo: str) -> Iterator[Tuple[int, int, int]]:
+        """(키워드가 끝나는 자모 위치, 키워드 번호, 편집 거리)를 위치 순서대로 (같은 위치는 비트 순서)"""
+        masks, low, full, accept = self._masks, self._low, self._all, self._accept
+        k = self.max_edits
+        states = list(self._initial)
+        for j, ch in enumerate(jamo):
+            b = masks.get(ch, 0)
+            old = states[0]
+            new = ((old << 1) | low) & b
+            states[0] = new
+            found = new & accept[0]
+            for d in range(1, k + 1):
+                current = states[d]
+                # 일치 | 삽입(텍스트 자모 하나 더) | 치환 | 삭제(키워드 자모 건너뜀)
+                new = ((((current << 1) | low) & b) | old | (old << 1) | (new << 1) | low) & full
+                old = current
+                states[d] = new
+                found |= new & accept[d]
+            while found:
+                bit = found & -found
+                found ^= bit
+                end = bit.bit_length() - 1
+                distance = next(d for d in range(k + 1) if states[d] & bit)
+                yield j, self._end_kid[end], distance
+
+    def keyword_length(self, kid: int) -> int:
+        return self._lengths[kid]
+
+
+# ==========================================
+# 규칙 검증 + 컴파일
+# ==========================================
+class CompiledRules:
+    """규칙 파일 한 버전을 컴파일한 결과 (만든 뒤에는 바꾸지 않음 - 교체는 통째로)"""
+
+    __slots__ = (
+        "version", "patterns", "keywords", "keyword_priority", "keyword_max_edits", "matcher",
+        "fuzzy", "issues", "source", "sha256", "loaded_at",
+    )
+
+    def __init__(self, version: int, patterns, max_edits, issues: List[Dict], source: str, sha256: str):
+        self.version = version
+        self.patterns: Tuple[Tuple[str, Tuple[str, ...]], ...] = patterns
+        self.keywords = tuple(kw for _, keywords in patterns for kw in keywords)
+        self.keyword_priority = tuple(i for i, (_, keywords) in enumerate(patterns) for _ in keywords)
+        self.keyword_max_edits = tuple(min(edits, INTENT_FUZZY_MAX_EDITS) for edits in max_edits)
+        self.matcher = AhoCorasick(self.keywords, self.keyword_priority)
+        # 근사 매칭은 편집을 허용하는 키워드가 있을 때만 (INTENT_FUZZY_MAX_EDITS=0이면 없음)
+        self.fuzzy: Optional[FuzzyMatcher] = None
+        if INTENT_FUZZY_MAX_EDITS > 0 and any(self.keyword_max_edits):
+            self.fuzzy = FuzzyMatcher([decompose_jamo(kw)[0] for kw in self.keywords], self.keyword_max_edits)
+        self.issues = issues
+        self.source = source
+        self.sha256 = sha256
+        self.loaded_at = time.time()
+
+
+def _parse_max_edits(value, where: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"{where}: max_edits는 0 이상의 정수여야 합니다: {value!r}")
+    return value
+
+
+def _parse_rules(data) -> Tuple[int, Tuple, Tuple[int, ...]]:
+    """
+    규칙 JSON 구조 확인 → (version, ((intent, (공백 뺀 키워드, ...)), ...), 키워드별 max_edits), 잘못되면 ValueError
+    키워드는 문자열 또는 {"keyword": str, "max_edits": int}, intent에 max_edits를 주면 그 intent 키워드의 기본값.
+    (지정하지 않으면 default_max_edits: 자모 길이로 결정)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("규칙 파일 최상위는 object여야 합니다.")
+    version = data.get("version")
+    if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+        raise ValueError(f"version은 1 이상의 정수여야 합니다: {version!r}")
+    intents = data.get("intents")
+    if not isinstance(intents, list) or not intents:
+        raise ValueError("intents는 비어있지 않은 목록이어야 합니다.")
+
+    patterns, max_edits, seen = [], [], set()
+    for i, item in enumerate(intents):
+        intent = item.get("intent") if isinstance(item, dict) else None
+        keywords = item.get("keywords") if isinstance(item, dict) else None
+        if not isinstance(intent, str) or not intent:
+            raise ValueError(f"intents[{i}]: intent 이름이 없습니다.")
+        if intent in seen or intent == "unknown":
+            raise ValueError(f"intents[{i}]: intent 이름이 중복되거나 예약어입니다: {intent}")
+        if not isinstance(keywords, list) or not keywords:
+            raise ValueError(f"{intent}: keywords는 비어있지 않은 목록이어야 합니다.")
+        intent_edits = item.get("max_edits")
+        if intent_edits is not None:
+            intent_edits = _parse_max_edits(intent_edits, intent)
+        stripped = []
+        for kw in keywords:
+            edits = intent_edits
+            if isinstance(kw, dict):
+                if kw.get("max_edits") is not None:
+                    edits = _parse_max_edits(kw["max_edits"], f"{intent}: {kw.get('keyword')!r}")
+                kw = kw.get("keyword")
+            if not isinstance(kw, str) or not kw.replace(" ", ""):
+                raise ValueError(f"{intent}: 빈 키워드 / 문자열이 아닌 키워드: {kw!r}")
+            kw = kw.replace(" ", "")
+            if edits is None:
+                edits = default_max_edits(kw)
+            elif edits >= len(decompose_jamo(kw)[0]):
+                raise ValueError(f"{intent}: {kw!r}의 max_edits({edits})가 자모 길이보다 짧지 않습니다.")
+            stripped.append(kw)
+            max_edits.append(edits)
+        seen.add(intent)
+        patterns.append((intent, tuple(stripped)))
+    return version, tuple(patterns), tuple(max_edits)
+
+
+def find_rule_issues(patterns) -> List[Dict]:
+    """
+    키워드 사이의 문제를 찾는다 (매칭은 공백을 뺀 텍스트의 부분 문자열이므로 포함 관계로 판단).
+    - duplicate: 같은 intent 안에 같은 키워드가 두 번
+    - redundant: 같은 intent의 다른 키워드를 포함 (더 긴 쪽은 걸릴 때 항상 짧은 쪽도 걸림)
+    - shadowed:  앞선 intent의 키워드를 포함하거나 같음 → 대표 intent로 절대 뽑히지 않음
+    - overlapping: 뒤 intent의 키워드를 포함 → 이 키워드가 걸리면 두 intent가 함께 걸림 (복합 판단에 영향)
+    """
+    keywords = [kw for _, kws in patterns for kw in kws]
+    owners = [i for i, (_, kws) in enumerate(patterns) for _ in kws]
+    matcher = AhoCorasick(keywords)
+
+    issues = []
+    for kid, kw in enumerate(keywords):
+        intent = patterns[owners[kid]][0]
+        # 이 키워드 안에 들어있는 (intent, 키워드) → 가장 앞선 키워드 번호 (중복 키워드는 한 번만)
+        contained: Dict[Tuple[int, str], int] = {}
+        for _, other in matcher.iter_matches(kw):
+            contained.setdefault((owners[other], keywords[other]), other)
+        for (other_owner, other_kw), other in sorted(contained.items(), key=lambda item: item[1]):
+            other_intent = patterns[other_owner][0]
+            if other_owner == owners[kid]:
+                if other_kw == kw:
+                    if other < kid:
+                        issues.append({"type": "duplicate", "intent": intent, "keyword": kw})
+                else:
+                    issues.append({"type": "redundant", "intent": intent, "keyword": kw, "covered_by": other_kw})
+            elif other_owner < owners[kid]:
+                issues.append({
+                    "type": "shadowed", "intent": intent, "keyword": kw,
+                    "by_intent": other_intent, "by_keyword": other_kw,
+                })
+            else:
+                issues.append({
+                    "type": "overlapping", "intent": intent, "keyword": kw,
+                    "with_intent": other_intent, "with_keyword": other_kw,
+                })
+    return issues
+
+
+def compile_rules(data, source: str = "<memory>", strict: bool = INTENT_RULES_STRICT) -> CompiledRules:
+    """규칙 dict → 검증 + 컴파일 (구조 오류, strict면 키워드 문제도 ValueError)"""
+    version, patterns, max_edits = _parse_rules(data)
+    issues = find_rule_issues(patterns)
+    if strict and issues:
+        raise ValueError(f"키워드 문제 {len(issues)}개: {issues[:3]}")
+    sha256 = hashlib.sha256(json.dumps(data, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+    return CompiledRules(version, patterns, max_edits, issues, source, sha256)
+
+
+def load_rules_file(path: str = INTENT_RULES_PATH, strict: bool = INTENT_RULES_STRICT) -> CompiledRules:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return compile_rules(data, source=path, strict=strict)
+
+
+# ==========================================
+# 현재 규칙 (원자적 교체 + 파일 변경 시 자동 재로드)
+# ==========================================
+def _file_signature(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+_reload_lock = threading.Lock()
+_signature = _file_signature(INTENT_RULES_PATH)
+_rules: CompiledRules = load_rules_file(INTENT_RULES_PATH)
+_next_check = time.monotonic() + INTENT_RULES_POLL_SECONDS
+_history = deque(maxlen=10)
+_last_error: Optional[Dict] = None
+_reload_listeners: List[Callable[[CompiledRules, CompiledRules], None]] = []
+_history.append({"version": _rules.version, "sha256": _rules.sha256, "loaded_at": _rules.loaded_at})
+if _rules.issues:
+    print(f"⚠️  intent 규칙 v{_rules.version}: 키워드 문제 {len(_rules.issues)}개 (get_rules_status 참고)")
+
+
+def add_reload_listener(callback: Callable[[CompiledRules, CompiledRules], None]):
+    """
+    규칙 내용이 바뀌어 교체될 때마다 callback(이전 규칙, 새 규칙)을 호출 (파일 감시 / 수동 재로드 모두).
+    이전 규칙으로 만든 결과를 캐시하는 쪽에서 무효화할 때 사용.
+    """
+    _reload_listeners.append(callback)
+
+
+def reload_rules(path: Optional[str] = None) -> Dict:
+    """
+    규칙 파일을 다시 읽어서 검증 + 컴파일한 뒤 통째로 교체.
+    실패하면 기존 규칙을 그대로 쓰고 오류를 기록한다. (진행 중인 매칭은 이전 규칙으로 끝까지 진행)
+    """
+    global _rules, _signature, _last_error
+    path = path or INTENT_RULES_PATH
+    with _reload_lock:
+        try:
+            signature = _file_signature(path)
+            rules = load_rules_file(path)
+        except (OSError, ValueError) as e:
+            _last_error = {"time": time.time(), "source": path, "error": str(e)}
+            # 같은 파일 내용으로 계속 재시도하지 않도록 signature는 갱신
+            try:
+                _signature = _file_signature(path)
+            except OSError:
+                pass
+            print(f"❌ intent 규칙 재로드 실패 (v{_rules.version} 유지): {e}")
+            return get_rules_status()
+
+        previous = _rules
+        if rules.sha256 != previous.sha256 and rules.version <= previous.version:
+            print(f"⚠️  intent 규칙 내용이 바뀌었지만 version이 그대로입니다 (v{rules.version})")
+        _rules = rules
+        _signature = signature
+        _last_error = None
+        _history.append({"version": rules.version, "sha256": rules.sha256, "loaded_at": rules.loaded_at})
+        print(f"✅ intent 규칙 로드: v{previous.version} → v{rules.version} "
+              f"({len(rules.patterns)}개 intent, 키워드 {len(rules.keywords)}개, 문제 {len(rules.issues)}개)")
+
+    # 재로드 lock 밖에서 호출 (listener가 느려도 다른 스레드의 규칙 확인을 막지 않음)
+    if rules.sha256 != previous.sha256:
+        for callback in list(_reload_listeners):
+            try:
+                callback(previous, rules)
+            except Exception as e:
+                print(f"⚠️  intent 규칙 재로드 listener 오류: {e}")
+    return get_rules_status()
+
+
+def get_rules() -> CompiledRules:
+    """
+    현재 규칙. INTENT_RULES_POLL_SECONDS마다 한 번 파일 mtime/크기를 확인해서 바뀌었으면 재로드.
+    (다른 스레드가 재로드 중이면 기다리지 않고 현재 규칙을 씀)
+    """
+    global _next_check
+    if INTENT_RULES_POLL_SECONDS > 0 and time.monotonic() >= _next_check:
+        if _reload_lock.acquire(blocking=False):
+            try:
+                _next_check = time.monotonic() + INTENT_RULES_POLL_SECONDS
+                try:
+                    changed = _file_signature(INTENT_RULES_PATH) != _signature
+                except OSError:
+                    changed = False
+            finally:
+                _reload_lock.release()
+            if changed:
+                reload_rules()
+    return _rules
+
+
+def get_rules_status() -> Dict:
+    """현재 규칙 상태 (파일이 바뀌었으면 get_rules처럼 먼저 재로드)"""
+    rules = get_rules()
+    return {
+        "version": rules.version,
+        "source": rules.source,
+        "sha256": rules.sha256,
+        "loaded_at": rules.loaded_at,
+        "intents": len(rules.patterns),
+        "keywords": len(rules.keywords),
+        "fuzzy_keywords": sum(1 for edits in rules.keyword_max_edits if edits),
+        "issues": rules.issues,
+        "last_error": _last_error,
+        "history": list(_history),
+    }
+
+
+def get_intent_patterns() -> List[Tuple[str, List[str]]]:
+    """현재 규칙의 (intent, [키워드]) 목록 (INTENT_PATTERNS와 같은 형태)"""
+    return [(intent, list(keywords)) for intent, keywords in get_rules().patterns]
+
+
+# ==========================================
+# 매칭
+# ==========================================
+def _fuzzy_hits(rules: CompiledRules, t: str) -> Tuple[List[int], List[Tuple[int, int, int, int]]]:
+    """
+    공백을 뺀 텍스트에서 자모 단위 근사 매칭 → (자모별 글자 위치, [(시작 자모, 끝 자모, 키워드 번호, 편집 거리)]).
+    근사 매칭은 한 키워드가 인접한 여러 위치에서 연달아 걸리므로 겹치는 것은 거리가 가장 작은 하나로 합친다.
+    (시작 위치는 키워드 길이로 추정한 근사값)
+    """
+    jamo, owners = decompose_jamo(t)
+    hits: List[List[int]] = []
+    latest: Dict[int, int] = {}
+    for end, kid, distance in rules.fuzzy.iter_matches(jamo):
+        length = rules.fuzzy.keyword_length(kid)
+        previous = latest.get(kid)
+        if previous is not None and end - hits[previous][1] < length:
+            if distance < hits[previous][3]:
+                hits[previous] = [max(0, end - length + 1), end, kid, distance]
+            continue
+        latest[kid] = len(hits)
+        hits.append([max(0, end - length + 1), end, kid, distance])
+    return owners, [tuple(hit) for hit in hits]
 
 
 def map_intent(text: str) -> str:
     if not isinstance(text, str):
         text = str(text)
 
+    rules = get_rules()
     t = text.replace(" ", "")
-    for intent, keywords in INTENT_PATTERNS:
-        for kw in keywords:
-            if kw.replace(" ", "") in t:
-                return intent
-
+    # 텍스트에 들어있는 키워드 중 규칙에서 가장 앞에 있는 intent
+    best = rules.matcher.min_rank(t, len(rules.patterns))
+    if best < len(rules.patterns):
+        return rules.patterns[best][0]
+    # 정확히 일치하는 키워드가 없을 때만 자모 단위 근사 매칭 (정확 매칭 결과가 항상 우선)
+    if rules.fuzzy is not None:
+        _, hits = _fuzzy_hits(rules, t)
+        if hits:
+            return rules.patterns[min(rules.keyword_priority[kid] for _, _, kid, _ in hits)][0]
     return "unknown"
+
+
+def match_intents(text: str) -> Tuple[str, List[Dict]]:
+    """
+    대표 intent(map_intent와 같음)와 걸린 모든 intent 목록을 한 번의 스캔으로 (같은 규칙 버전 기준).
+    정확히 일치하는 키워드가 하나도 없으면 자모 단위 근사 매칭 결과를 쓴다 (fuzzy=True).
+
+    목록 형식 (많이 걸린 순서, 같으면 규칙 순서):
+    [
+        {
+            "intent": str,
+            "hits": int,                 # 키워드가 걸린 횟수 (겹쳐도 각각 셈)
+            "keywords": [str, ...],      # 걸린 키워드 (처음 나온 순서, 중복 없음)
+            "positions": [[start, end], ...],  # 원문 기준 글자 위치 (end는 포함 안 함)
+            "fuzzy": bool,               # 근사 매칭으로 찾았는지
+            "distance": int,             # 걸린 키워드 중 가장 작은 자모 편집 거리 (정확 매칭이면 0)
+        }, ...
+    ]
+    """
+    if not isinstance(text, str):
+        text = str(text)
+
+    rules = get_rules()
+    # 공백을 뺀 텍스트의 글자 위치 → 원문 위치
+    original_index = [i for i, ch in enumerate(text) if ch != " "]
+    t = text.replace(" ", "")
+
+    matches = [
+        (end - len(rules.keywords[kid]) + 1, end, kid, 0) for end, kid in rules.matcher.iter_matches(t)
+    ]
+    fuzzy = False
+    if not matches and rules.fuzzy is not None:
+        owners, hits = _fuzzy_hits(rules, t)
+        # 자모 위치 → 공백을 뺀 텍스트의 글자 위치
+        matches = [(owners[start], owners[end], kid, distance) for start, end, kid, distance in hits]
+        fuzzy = bool(matches)
+
+    scores: Dict[int, Dict] = {}
+    for start, end, kid, distance in matches:
+        priority = rules.keyword_priority[kid]
+        score = scores.get(priority)
+        if score is None:
+            score = scores[priority] = {
+                "intent": rules.patterns[priority][0],
+                "hits": 0,
+                "keywords": [],
+                "positions": [],
+                "fuzzy": fuzzy,
+                "distance": distance,
+            }
+        keyword = rules.keywords[kid]
+        score["hits"] += 1
+        if keyword not in score["keywords"]:
+            score["keywords"].append(keyword)
+        score["positions"].append([original_index[start], original_index[end] + 1])
+        score["distance"] = min(score["distance"], distance)
+
+    primary = rules.patterns[min(scores)][0] if scores else "unknown"
+    ranked = [scores[p] for p in sorted(scores, key=lambda p: (-scores[p]["hits"], p))]
+    return primary, ranked
+
+
+def score_intents(text: str) -> List[Dict]:
+    """
+    텍스트에 들어있는 모든 intent를 한 번의 스캔으로 찾는다.
+    (map_intent는 가장 앞선 intent 하나만, 이 함수는 "넘어졌는데 숨을 안 쉬어요" 같은 복합 신고도 모두)
+    형식은 match_intents의 목록과 같다.
+    """
+    return match_intents(text)[1]
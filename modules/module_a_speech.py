@@ -2,9 +2,12 @@
 # A-Module — Speech Analyzer
 # 독립 모듈: 다른 모듈과 import 금지
 
-from typing import Dict
+import itertools
+import json
 import sys
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
 
 # Module A의 intent_rules.py import
 # module_A 폴더를 경로에 추가
@@ -13,38 +16,29 @@ if str(module_a_path) not in sys.path:
     sys.path.insert(0, str(module_a_path))
 
 try:
-    from intent_rules import map_intent
+    from intent_rules import add_reload_listener, get_rules_status, map_intent, match_intents, reload_rules
 except ImportError:
     # Module A가 없을 경우를 대비한 fallback
     def map_intent(text: str) -> str:
         return "unknown"
 
+    def match_intents(text: str):
+        return "unknown", []
 
-def analyze_speech(stt_text: str) -> Dict:
-    """
-    A 모듈: 신고자 음성(STT 텍스트)을 분석해서
-    재난 분류, 긴급도, 감정 등을 추출.
-    
-    Module A의 intent_rules.py를 사용하여 Intent 분류 후,
-    Intent를 기존 출력 형식으로 변환.
-    
-    Input: STT 텍스트
-    Output: 의료적 의미 태그 dict
-    
-    {
-        "disaster_large": str,      # 예: "구급", "구조", "화재"
-        "disaster_medium": str,      # 예: "심정지", "흉통", "낙상" 등
-        "urgency_level": str,        # "상", "중", "하"
-        "sentiment": str,            # "불안/걱정" 등
-        "raw_text": str              # 원본 STT 텍스트
-    }
-    """
-    
-    # 1. Module A의 intent_rules로 Intent 분류
-    intent = map_intent(stt_text)
-    
-    # 2. Intent → 기존 출력 형식 매핑
-    intent_to_output = {
+    def get_rules_status() -> Dict:
+        return {"version": None, "error": "intent_rules를 불러올 수 없습니다."}
+
+    def reload_rules(path: Optional[str] = None) -> Dict:
+        return get_rules_status()
+
+    def add_reload_listener(callback) -> None:
+        pass
+
+
+# Intent → 기존 출력 형식 (import 시 한 번만 만드는 읽기 전용 테이블)
+_INTENT_TO_OUTPUT: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    intent: MappingProxyType(output)
+    for intent, output in {
         # 교통사고
         "traffic_accident": {
             "disaster_large": "구조",
@@ -122,21 +116,167 @@ def analyze_speech(stt_text: str) -> Dict:
             "urgency_level": "상",
             "sentiment": "불안/걱정",
         },
+    }.items()
+})
+
+# Intent가 없을 때(unknown) 기본값
+_DEFAULT_OUTPUT: Mapping[str, Optional[str]] = MappingProxyType({
+    "disaster_large": "구급",
+    "disaster_medium": None,
+    "urgency_level": "하",
+    "sentiment": "불안/걱정",
+})
+
+
+def analyze_speech(stt_text: str) -> Dict:
+    """
+    A 모듈: 신고자 음성(STT 텍스트)을 분석해서
+    재난 분류, 긴급도, 감정 등을 추출.
+    
+    Module A의 intent_rules.py를 사용하여 Intent 분류 후,
+    Intent를 기존 출력 형식으로 변환.
+    
+    Input: STT 텍스트
+    Output: 의료적 의미 태그 dict
+    
+    {
+        "disaster_large": str,      # 예: "구급", "구조", "화재"
+        "disaster_medium": str,      # 예: "심정지", "흉통", "낙상" 등
+        "urgency_level": str,        # "상", "중", "하"
+        "sentiment": str,            # "불안/걱정" 등
+        "raw_text": str,             # 원본 STT 텍스트
+        "intents": [                 # 걸린 모든 intent (많이 걸린 순, 복합 신고 판단용)
+            {"intent": str, "hits": int, "keywords": [str], "positions": [[start, end]],
+             "fuzzy": bool, "distance": int}, ...   # fuzzy: 정확 매칭이 없어서 자모 근사 매칭으로 찾음
+        ]
     }
+    """
+    
+    # 1. Module A의 intent_rules로 Intent 분류 (대표 intent + 걸린 모든 intent를 같은 규칙 버전으로 한 번에)
+    intent, intents = match_intents(stt_text)
     
-    # 3. Intent에 해당하는 출력 형식 가져오기 (없으면 기본값)
-    output = intent_to_output.get(intent, {
-        "disaster_large": "구급",
-        "disaster_medium": None,
-        "urgency_level": "하",
-        "sentiment": "불안/걱정",
-    })
+    # 2. Intent에 해당하는 출력 형식 가져오기 (없으면 기본값)
+    output = _INTENT_TO_OUTPUT.get(intent, _DEFAULT_OUTPUT)
     
-    # 4. 최종 결과 반환
+    # 3. 최종 결과 반환
     return {
         "disaster_large": output["disaster_large"],
         "disaster_medium": output["disaster_medium"],
         "urgency_level": output["urgency_level"],
         "sentiment": output["sentiment"],
         "raw_text": stt_text,
+        "intents": intents,
     }
+
+
+# ==========================================
+# 배치 분석 (대량 전사 데이터 라벨링)
+# ==========================================
+class SpeechResult:
+    """analyze_speech 결과 한 건 (dict 대신 __slots__로 가볍게, to_dict()로 같은 형식 변환)"""
+
+    __slots__ = (
+        "raw_text",
+        "intent",
+        "disaster_large",
+        "disaster_medium",
+        "urgency_level",
+        "sentiment",
+        "intents",
+    )
+
+    def __init__(self, raw_text: str, intent: str, output: Mapping, intents: Optional[List[Dict]]):
+        self.raw_text = raw_text
+        self.intent = intent
+        self.disaster_large = output["disaster_large"]
+        self.disaster_medium = output["disaster_medium"]
+        self.urgency_level = output["urgency_level"]
+        self.sentiment = output["sentiment"]
+        self.intents = intents
+
+    def to_dict(self, include_text: bool = True) -> Dict:
+        """analyze_speech와 같은 형식 (+ 대표 intent 이름)"""
+        result = {
+            "disaster_large": self.disaster_large,
+            "disaster_medium": self.disaster_medium,
+            "urgency_level": self.urgency_level,
+            "sentiment": self.sentiment,
+            "intent": self.intent,
+        }
+        if include_text:
+            result["raw_text"] = self.raw_text
+        if self.intents is not None:
+            result["intents"] = self.intents
+        return result
+
+    def __repr__(self):
+        return f"SpeechResult(intent={self.intent!r}, disaster_medium={self.disaster_medium!r})"
+
+
+def iter_analyze_speech(texts: Iterable[str], with_intents: bool = True) -> Iterator[SpeechResult]:
+    """
+    STT 텍스트를 하나씩 분석해서 SpeechResult로 돌려주는 generator (입력을 메모리에 다 올리지 않음).
+    with_intents=True면 match_intents 한 번의 스캔으로 대표 intent와 전체 intent 목록을 같이 구한다.
+    """
+    to_output = _INTENT_TO_OUTPUT.get
+    default = _DEFAULT_OUTPUT
+
+    for text in texts:
+        if not isinstance(text, str):
+            text = "" if text is None else str(text)
+        if with_intents:
+            intent, intents = match_intents(text)
+        else:
+            intents = None
+            intent = map_intent(text)
+        yield SpeechResult(text, intent, to_output(intent, default), intents)
+
+
+def analyze_speech_many(texts: Iterable[str], with_intents: bool = True) -> List[SpeechResult]:
+    """여러 STT 텍스트를 한 번에 분석 (입력 순서대로 SpeechResult 목록)"""
+    return list(iter_analyze_speech(texts, with_intents))
+
+
+def _parse_jsonl(src: TextIO) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """입력 줄 → (줄 번호, 레코드 또는 None, 오류 메시지 또는 None), 빈 줄은 건너뜀"""
+    for line_no, line in enumerate(src, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"JSON 파싱 실패: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, f"JSON object가 아닙니다 ({type(record).__name__})"
+            continue
+        yield line_no, record, None
+
+
+def analyze_speech_jsonl(
+    src: TextIO,
+    dst: TextIO,
+    text_field: str = "text",
+    with_intents: bool = True,
+) -> Dict[str, int]:
+    """
+    JSONL 스트림 → JSONL 스트림 라벨링 (한 줄씩 읽고 바로 씀, 메모리 사용량 일정).
+    입력 한 줄: {"<text_field>": "...", ...} (다른 필드는 그대로 유지)
+    출력 한 줄: 입력 레코드 + "speech": SpeechResult.to_dict(include_text=False)
+    JSON이 아니거나 object가 아닌 줄은 멈추지 않고 {"line": 줄 번호, "error": 메시지}를 대신 쓴다.
+    빈 줄은 건너뛰고, {"labeled": 라벨링한 수, "errors": 오류 줄 수}를 돌려준다.
+    """
+    parsed, to_label = itertools.tee(_parse_jsonl(src))
+    texts = (record.get(text_field) if record is not None else "" for _, record, _ in to_label)
+
+    stats = {"labeled": 0, "errors": 0}
+    for (line_no, record, error), result in zip(parsed, iter_analyze_speech(texts, with_intents)):
+        if error is not None:
+            record = {"line": line_no, "error": error}
+            stats["errors"] += 1
+        else:
+            record["speech"] = result.to_dict(include_text=False)
+            stats["labeled"] += 1
+        dst.write(json.dumps(record, ensure_ascii=False))
+        dst.write("\n")
+    return stats
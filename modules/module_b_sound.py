@@ -2,13 +2,23 @@
 # B-Module — Sound Analyzer
 # 독립 모듈: 다른 모듈과 import 금지
 
+import atexit
+import functools
+import hashlib
+import itertools
+import json
 import os
+import random
+import threading
+import time
 import librosa
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
 
 # ==========================================
 # 모델 정의 (SimpleCNN)
@@ -39,6 +49,40 @@ class SimpleCNN(nn.Module):
         return x
 
 
+class QuantizableSimpleCNN(SimpleCNN):
+    """
+    int8 정적 양자화용 SimpleCNN (SimpleCNN과 state_dict 호환).
+    입력/출력에 Quant/DeQuant stub을 두고, conv+bn+relu를 합칠 수 있도록 ReLU를 모듈로 둔다.
+    (scripts/quantize_aed_cnn.py에서 calibration 후 변환)
+    """
+    def __init__(self, n_classes=4):
+        super().__init__(n_classes=n_classes)
+        self.quant = torch.ao.quantization.QuantStub()
+        self.dequant = torch.ao.quantization.DeQuantStub()
+        self.relu1 = nn.ReLU()
+        self.relu2 = nn.ReLU()
+        self.relu3 = nn.ReLU()
+
+    def forward(self, x):
+        x = self.quant(x)
+        x = self.pool(self.relu1(self.bn1(self.conv1(x))))
+        x = self.pool(self.relu2(self.bn2(self.conv2(x))))
+        x = self.pool(self.relu3(self.bn3(self.conv3(x))))
+        x = self.global_pool(x)
+        x = x.reshape(x.size(0), -1)
+        x = self.dropout(x)
+        x = self.fc(x)
+        return self.dequant(x)
+
+    def fuse_model(self):
+        """conv+bn+relu를 하나의 모듈로 합침 (eval 모드에서 호출)"""
+        torch.ao.quantization.fuse_modules(
+            self,
+            [["conv1", "bn1", "relu1"], ["conv2", "bn2", "relu2"], ["conv3", "bn3", "relu3"]],
+            inplace=True,
+        )
+
+
 # ==========================================
 # 전역 변수 (모델 로드)
 # ==========================================
@@ -57,6 +101,17 @@ MODEL_PATH = os.path.join(
     "aed_cnn_final_trainaug_fin.pth"
 )
 
+# BatchNorm을 conv에 합친 TorchScript 모델 (scripts/export_aed_cnn.py로 생성, AED_INFERENCE_MODE=torchscript일 때 사용)
+SCRIPTED_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".ts.pt"
+# int8 양자화 모델 (scripts/quantize_aed_cnn.py로 생성)
+QUANTIZED_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".int8.pt"
+
+# 추론 모드: "float" (기본, eager) | "torchscript" (SCRIPTED_MODEL_PATH가 있어야 함)
+#           | "int8" (CPU 전용, QUANTIZED_MODEL_PATH가 있어야 함)
+# TorchScript는 하드웨어 / 배치 크기에 따라 eager보다 느릴 수 있다 (batch 1에서만 빠르고 16/64에서는 느린 CPU도 있음).
+# export_aed_cnn.py가 출력하는 배치별 지연 시간을 보고 켤 것.
+AED_INFERENCE_MODE = os.getenv("AED_INFERENCE_MODE", "float").strip().lower()
+
 # 오디오 전처리 파라미터
 SR = 16000
 DURATION = 2.0
@@ -64,38 +119,525 @@ N_MELS = 64
 N_FFT = 1024
 HOP_LENGTH = 512
 
+# 긴 클립 분석 (슬라이딩 윈도우): DURATION 길이 윈도우를 WINDOW_HOP 간격으로 겹쳐서 분석
+WINDOW_HOP = 1.0
+# 한 번의 forward에 넣는 최대 윈도우 수 (메모리 상한, 그 이상은 나눠서 forward)
+WINDOW_BATCH_SIZE = 64
+# 최종 이벤트 선택 시 배경으로 보는 클래스
+BACKGROUND_CLASS = "생활소음"
+# predict_audio_events에서 디코딩 + log-mel을 미리 처리하는 스레드 수 / 스레드 작업 하나당 입력 수
+FEATURE_WORKERS = int(os.getenv("SOUND_FEATURE_WORKERS", min(4, os.cpu_count() or 1)))
+FEATURE_CHUNK_SIZE = 16
+
+# 활동 감지 게이트: 무음 / 일정한 배경 소음 윈도우는 CNN을 건너뛰고 바로 생활소음으로 처리
+ACTIVITY_GATE = os.getenv("AED_ACTIVITY_GATE", "1") != "0"
+# 윈도우의 최대 프레임 RMS(dBFS)가 이보다 작으면 무음으로 보고 건너뜀
+ACTIVITY_RMS_FLOOR_DB = float(os.getenv("AED_ACTIVITY_RMS_FLOOR_DB", "-50"))
+# 이보다 크면 소리가 일정해도 항상 추론 (큰 지속음: 경보음 등)
+ACTIVITY_LOUD_DB = float(os.getenv("AED_ACTIVITY_LOUD_DB", "-20"))
+# 윈도우 안에서 프레임 RMS가 중앙값보다 이만큼(dB) 튀면 활동으로 봄 (충격음, 말소리 시작 등)
+ACTIVITY_RANGE_DB = float(os.getenv("AED_ACTIVITY_RANGE_DB", "6"))
+# 연속 프레임 사이 대역 에너지 증가(spectral flux, dB)가 이 이상이면 활동으로 봄
+ACTIVITY_FLUX_DB = float(os.getenv("AED_ACTIVITY_FLUX_DB", "6"))
+# 건너뛴 윈도우 중 이 비율만큼은 그래도 CNN을 돌려서 잘못 건너뛴 비율(false skip)을 기록
+ACTIVITY_AUDIT_RATE = float(os.getenv("AED_ACTIVITY_AUDIT_RATE", "0.02"))
+# 건너뛴 윈도우에 돌려주는 생활소음 confidence
+ACTIVITY_SKIP_CONFIDENCE = float(os.getenv("AED_ACTIVITY_SKIP_CONFIDENCE", "0.9"))
+# 감사 결과 이 confidence 이상의 비배경 이벤트가 나오면 false skip으로 기록
+ACTIVITY_FALSE_SKIP_CONFIDENCE = float(os.getenv("AED_ACTIVITY_FALSE_SKIP_CONFIDENCE", "0.6"))
+# 게이트 프레임 길이 (샘플, 겹치지 않음) / spectral flux 대역 수
+GATE_FRAME = 512
+GATE_BANDS = 16
+
+# log-mel 특징 캐시 (같은 오디오 파일을 다시 분석할 때 디코딩 + log-mel 생략)
+# 저장 폴더 (비우면 캐시 끔) / 최대 크기 (MB, 넘으면 오래 안 쓴 항목부터 삭제)
+# 한 캐시 폴더는 한 프로세스만 쓴다: 프로세스마다 그 아래 worker-N 폴더를 OS 파일 잠금으로 차지
+# (uvicorn 워커가 여러 개여도 같은 FEATURE_CACHE_DIR를 줘도 됨, 재시작하면 빈 slot을 다시 사용)
+FEATURE_CACHE_DIR = os.getenv("FEATURE_CACHE_DIR", "").strip()
+FEATURE_CACHE_MAX_MB = float(os.getenv("FEATURE_CACHE_MAX_MB", "512"))
+
 # 모델 로드 (한 번만 로드)
 _model = None
 _device = None
+_model_backend = None
+_model_lock = threading.Lock()
+
+
+def _has_weights() -> bool:
+    """학습된 가중치(.pth 또는 export된 TorchScript / int8 모델)가 있는지"""
+    return (
+        os.path.exists(MODEL_PATH)
+        or (AED_INFERENCE_MODE == "torchscript" and os.path.exists(SCRIPTED_MODEL_PATH))
+        or (AED_INFERENCE_MODE == "int8" and os.path.exists(QUANTIZED_MODEL_PATH))
+    )
+
+
+def _load_quantized_model():
+    """int8 TorchScript 모델 로드 (export 때 사용한 양자화 엔진으로 맞춤)"""
+    extra_files = {"quantized_engine": ""}
+    model = torch.jit.load(QUANTIZED_MODEL_PATH, map_location="cpu", _extra_files=extra_files)
+    engine = extra_files["quantized_engine"]
+    if isinstance(engine, bytes):
+        engine = engine.decode()
+    if engine and engine in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = engine
+    model.eval()
+    return model
+
+
+def _scripted_model_is_current() -> bool:
+    """TorchScript 파일이 있고, 원본 .pth보다 오래되지 않았는지 (재학습 후 재export 누락 방지)"""
+    if not os.path.exists(SCRIPTED_MODEL_PATH):
+        return False
+    if not os.path.exists(MODEL_PATH):
+        return True
+    return os.path.getmtime(SCRIPTED_MODEL_PATH) >= os.path.getmtime(MODEL_PATH)
 
 
 def _load_model():
-    """모델을 한 번만 로드 (lazy loading)"""
-    global _model, _device
+    """
+    모델을 한 번만 로드 (lazy loading).
+    동시에 들어온 첫 요청들이 각자 모델을 만들지 않도록 lock 안에서 한 번 더 확인하고,
+    가중치까지 다 올린 뒤에 전역 변수에 넣는다 (lock 밖에서 반쯤 로드된 모델을 보지 않도록).
+    """
+    global _model, _device, _model_backend
     
-    if _model is None:
-        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        _model = SimpleCNN(n_classes=4).to(_device)
+    if _model is not None:
+        return _model, _device
+    
+    with _model_lock:
+        if _model is not None:
+            return _model, _device
+        
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
-        if os.path.exists(MODEL_PATH):
-            _model.load_state_dict(torch.load(MODEL_PATH, map_location=_device))
-            _model.eval()
-            print(f"✅ B 모듈: 모델 로드 완료 ({MODEL_PATH})")
+        if AED_INFERENCE_MODE == "int8" and not os.path.exists(QUANTIZED_MODEL_PATH):
+            print(f"⚠️  B 모듈: int8 모델을 찾을 수 없어 float 모델을 사용합니다 ({QUANTIZED_MODEL_PATH})")
+        use_scripted = AED_INFERENCE_MODE == "torchscript" and _scripted_model_is_current()
+        if AED_INFERENCE_MODE == "torchscript" and not use_scripted:
+            print(f"⚠️  B 모듈: 최신 TorchScript 모델이 없어 eager 모델을 사용합니다 ({SCRIPTED_MODEL_PATH})")
+        
+        if AED_INFERENCE_MODE == "int8" and os.path.exists(QUANTIZED_MODEL_PATH):
+            # 양자화 커널은 CPU 전용
+            device = torch.device("cpu")
+            model = _load_quantized_model()
+            backend = "int8"
+            print(f"✅ B 모듈: int8 모델 로드 완료 ({QUANTIZED_MODEL_PATH})")
+        elif use_scripted:
+            # BN이 conv에 합쳐진 TorchScript 모델 (eager 모델과 출력 동일)
+            model = torch.jit.load(SCRIPTED_MODEL_PATH, map_location=device)
+            model.eval()
+            backend = "torchscript"
+            print(f"✅ B 모듈: TorchScript 모델 로드 완료 ({SCRIPTED_MODEL_PATH})")
         else:
-            print(f"⚠️  B 모듈: 모델 파일을 찾을 수 없습니다 ({MODEL_PATH})")
-            print("   더미 모드로 동작합니다.")
+            model = SimpleCNN(n_classes=4).to(device)
+            backend = "eager"
+            
+            if os.path.exists(MODEL_PATH):
+                model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
+                model.eval()
+                print(f"✅ B 모듈: 모델 로드 완료 ({MODEL_PATH})")
+            else:
+                print(f"⚠️  B 모듈: 모델 파일을 찾을 수 없습니다 ({MODEL_PATH})")
+                print("   더미 모드로 동작합니다.")
+        
+        _device = device
+        _model_backend = backend
+        _model = model
     
     return _model, _device
 
 
+# ==========================================
+# log-mel 프론트엔드 (필터뱅크/윈도우 미리 계산)
+# ==========================================
+class LogMelFrontend:
+    """
+    librosa melspectrogram + power_to_db(ref=np.max) + 표준화와 같은 결과를
+    미리 계산한 mel 필터뱅크 / hann 윈도우와 torch.stft로 배치 단위로 계산한다.
+
+    호출할 때마다 필터뱅크와 윈도우를 다시 만들지 않으며,
+    (B, samples) 파형 배치를 한 번에 변환한다. (librosa 결과와 1e-3 이내로 일치)
+    """
+
+    def __init__(
+        self,
+        sr: int = SR,
+        n_fft: int = N_FFT,
+        hop_length: int = HOP_LENGTH,
+        n_mels: int = N_MELS,
+        pad_mode: str = "constant",  # librosa >= 0.10의 stft 기본값
+        amin: float = 1e-10,
+        top_db: float = 80.0,
+    ):
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.pad_mode = pad_mode
+        self.amin = amin
+        self.top_db = top_db
+
+        # (n_mels, 1 + n_fft/2) slaney mel 필터뱅크, periodic hann 윈도우 (librosa와 동일)
+        self.mel_basis = torch.from_numpy(
+            librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+        ).float()
+        self.window = torch.from_numpy(
+            librosa.filters.get_window("hann", n_fft, fftbins=True)
+        ).float()
+
+    def melspectrogram(self, waveforms: torch.Tensor) -> torch.Tensor:
+        """(B, samples) 파형 → (B, n_mels, frames) power mel spectrogram"""
+        spec = torch.stft(
+            waveforms,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length,
+            window=self.window,
+            center=True,
+            pad_mode=self.pad_mode,
+            return_complex=True,
+        )
+        power = spec.real.square() + spec.imag.square()
+        return torch.matmul(self.mel_basis, power)
+
+    def log_mel(self, waveforms: np.ndarray) -> np.ndarray:
+        """
+        (B, samples) 또는 (samples,) 파형 → 표준화된 log-mel (B, n_mels, frames) float32
+        (wav_to_logmel_infer와 같은 처리: 파형마다 ref=max dB 변환 후 평균 0 / 표준편차 1)
+        """
+        x = torch.from_numpy(np.ascontiguousarray(waveforms, dtype=np.float32))
+        single = x.dim() == 1
+        if single:
+            x = x.unsqueeze(0)
+
+        with torch.no_grad():
+            mel = self.melspectrogram(x)
+
+            # power_to_db(ref=np.max, amin=1e-10, top_db=80)
+            db = 10.0 * torch.log10(torch.clamp(mel, min=self.amin))
+            ref = torch.clamp(mel.amax(dim=(1, 2), keepdim=True), min=self.amin)
+            db = db - 10.0 * torch.log10(ref)
+            db = torch.maximum(db, db.amax(dim=(1, 2), keepdim=True) - self.top_db)
+
+            # 표준화 (모집단 표준편차, np.std와 동일)
+            mean = db.mean(dim=(1, 2), keepdim=True)
+            std = db.std(dim=(1, 2), keepdim=True, correction=0)
+            db = (db - mean) / (std + 1e-6)
+
+        out = db.numpy()
+        return out[0] if single else out
+
+
+_frontend = None
+
+
+def _get_frontend() -> LogMelFrontend:
+    """log-mel 프론트엔드를 한 번만 생성 (lazy loading)"""
+    global _frontend
+    if _frontend is None:
+        with _model_lock:
+            if _frontend is None:
+                _frontend = LogMelFrontend()
+    return _frontend
+
+
+# ==========================================
+# log-mel 특징 캐시 (float16 memmap + index)
+# ==========================================
+class FeatureCache:
+    """
+    오디오 내용 해시 + 프론트엔드 파라미터(SR, N_MELS, N_FFT, HOP_LENGTH, DURATION)를 key로
+    log-mel 배열을 디스크에 저장한다.
+
+    - features.f16: float16 배열을 이어 붙인 파일 (np.memmap으로 읽음)
+    - index.json:   key → {offset, shape, meta} (LRU 순서, 오래된 것이 앞)
+    전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 index에서 지우고,
+    데이터 파일에 지워진 공간이 쌓이면(max_bytes의 2배 초과) 남은 항목만 새 파일로 옮긴다.
+    index는 쓰기 후 잠깐 모아서 저장하므로 비정상 종료 시 마지막 몇 항목은 빠질 수 있다 (다시 계산됨).
+    """
+
+    INDEX_VERSION = 1
+    INDEX_SAVE_INTERVAL = 2.0  # 초
+    MAX_WORKER_SLOTS = 64
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        # 데이터 파일 / index는 프로세스 안의 lock으로만 보호하므로 다른 프로세스와 폴더를 나누지 않게 한다
+        self._slot_file = None
+        self.directory = self._claim_directory(directory)
+        self.data_path = os.path.join(self.directory, "features.f16")
+        self.index_path = os.path.join(self.directory, "index.json")
+
+        self._lock = threading.Lock()
+        self._disabled = None
+        self._entries = OrderedDict()
+        self._live_bytes = 0
+        self._mm = None
+        self._dirty = False
+        self._saved_at = 0.0
+        self._stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0, "compactions": 0}
+        self._load_index()
+
+    # ------------------------------------------
+    # key
+    # ------------------------------------------
+    @staticmethod
+    def _params() -> str:
+        return f"sr={SR}|n_mels={N_MELS}|n_fft={N_FFT}|hop_length={HOP_LENGTH}|duration={DURATION}"
+
+    def key_for_file(self, path: Union[str, os.PathLike], kind: str) -> str:
+        """파일 내용(바이트) 해시 + 프론트엔드 파라미터 + 특징 종류 (디코딩 없이 계산)"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return self._key(digest.hexdigest(), kind)
+
+    def _key(self, content_hash: str, kind: str) -> str:
+        return hashlib.blake2b(
+            f"{content_hash}|{kind}|{self._params()}".encode(), digest_size=16
+        ).hexdigest()
+
+    # ------------------------------------------
+    # get / put
+    # ------------------------------------------
+    def _claim_directory(self, base: str) -> str:
+        """
+        base 아래 worker-0, worker-1, ... 중 다른 프로세스가 잠그지 않은 폴더를 골라
+        프로세스가 끝날 때까지 잠가 둔다 (잠금 파일 핸들을 열어 둔 채 유지).
+        """
+        for slot in range(self.MAX_WORKER_SLOTS):
+            directory = os.path.join(base, f"worker-{slot}")
+            os.makedirs(directory, exist_ok=True)
+            lock_file = open(os.path.join(directory, ".lock"), "a+b")
+            if _try_lock_file(lock_file):
+                self._slot_file = lock_file
+                return directory
+            lock_file.close()
+        # slot이 모두 사용 중이면 이 프로세스 전용 폴더 (재시작 후에는 다시 쓰지 않음)
+        directory = os.path.join(base, f"pid-{os.getpid()}")
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _disable(self, error: Exception):
+        """디스크 오류가 나면 이 프로세스에서는 캐시를 끄고 계속 진행 (요청은 실패시키지 않음)"""
+        self._disabled = str(error)
+        self._entries.clear()
+        self._live_bytes = 0
+        self._mm = None
+        print(f"⚠️  B 모듈: 특징 캐시 비활성화 ({error})")
+
+    def get(self, key: str):
+        """캐시된 배열 (float32 복사본)과 meta, 없으면 None"""
+        with self._lock:
+            if self._disabled:
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+
+            count = int(np.prod(entry["shape"]))
+            mm = self._memmap(entry["offset"] + count)
+            array = np.array(mm[entry["offset"]:entry["offset"] + count], dtype=np.float32)
+            return array.reshape(entry["shape"]), entry.get("meta", {})
+
+    def put(self, key: str, array: np.ndarray, meta: Optional[Dict] = None):
+        data = np.ascontiguousarray(array, dtype=np.float16)
+        if data.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if self._disabled:
+                return
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            try:
+                self._put(key, data, meta)
+            except OSError as e:
+                self._disable(e)
+
+    def _put(self, key: str, data: np.ndarray, meta: Optional[Dict]):
+        """put 본체 (lock 안에서 호출, 디스크 오류는 OSError로 올라감)"""
+        # 크기 제한: 오래 안 쓴 항목부터 삭제
+        while self._entries and self._live_bytes + data.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._live_bytes -= self._entry_bytes(old)
+            self._stats["evictions"] += 1
+
+        # 지워진 공간이 너무 많으면 남은 항목만 새 파일로 옮김
+        if self._file_bytes() + data.nbytes > 2 * self.max_bytes:
+            self._compact()
+
+        offset = self._file_bytes() // 2
+        with open(self.data_path, "ab") as f:
+            f.write(data.tobytes())
+        self._entries[key] = {"offset": offset, "shape": list(data.shape), "meta": meta or {}}
+        self._live_bytes += data.nbytes
+        self._stats["puts"] += 1
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.INDEX_SAVE_INTERVAL:
+            self._save_index()
+
+    def flush(self):
+        """index를 지금 저장 (프로세스 종료 시 자동 호출)"""
+        with self._lock:
+            if self._dirty and not self._disabled:
+                try:
+                    self._save_index()
+                except OSError as e:
+                    self._disable(e)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._live_bytes = 0
+            self._mm = None
+            open(self.data_path, "wb").close()
+            self._save_index()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "directory": self.directory,
+                "disabled": self._disabled,
+                "entries": len(self._entries),
+                "live_mb": round(self._live_bytes / 2**20, 2),
+                "file_mb": round(self._file_bytes() / 2**20, 2),
+                "max_mb": round(self.max_bytes / 2**20, 2),
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    # ------------------------------------------
+    # 내부 처리 (lock 안에서 호출)
+    # ------------------------------------------
+    @staticmethod
+    def _entry_bytes(entry: Dict) -> int:
+        return int(np.prod(entry["shape"])) * 2
+
+    def _file_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.data_path)
+        except OSError:
+            return 0
+
+    def _memmap(self, needed: int):
+        """필요한 길이(원소 수)까지 덮는 읽기 전용 memmap (파일이 커졌으면 다시 map)"""
+        if self._mm is None or len(self._mm) < needed:
+            self._mm = np.memmap(self.data_path, dtype=np.float16, mode="r")
+        return self._mm
+
+    def _compact(self):
+        tmp_path = self.data_path + ".tmp"
+        offset = 0
+        with open(tmp_path, "wb") as f:
+            for entry in self._entries.values():
+                count = int(np.prod(entry["shape"]))
+                mm = self._memmap(entry["offset"] + count)
+                f.write(np.asarray(mm[entry["offset"]:entry["offset"] + count]).tobytes())
+                entry["offset"] = offset
+                offset += count
+        # 데이터 파일을 바꾸기 전에 memmap을 모두 닫아야 함 (Windows는 map된 파일을 교체할 수 없음)
+        mm = None
+        self._mm = None
+        os.replace(tmp_path, self.data_path)
+        self._stats["compactions"] += 1
+        self._save_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        if index.get("version") != self.INDEX_VERSION or index.get("params") != self._params():
+            # 프론트엔드 파라미터가 바뀌었으면 기존 특징은 쓸 수 없음
+            print("⚠️  B 모듈: 특징 캐시 파라미터가 달라서 비웁니다.")
+            open(self.data_path, "wb").close()
+            return
+
+        file_elems = self._file_bytes() // 2
+        for key, entry in index.get("entries", []):
+            if entry["offset"] + int(np.prod(entry["shape"])) <= file_elems:
+                self._entries[key] = entry
+                self._live_bytes += self._entry_bytes(entry)
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.INDEX_VERSION,
+                "params": self._params(),
+                "entries": list(self._entries.items()),
+            }, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+
+def _try_lock_file(f) -> bool:
+    """열린 파일에 배타적 OS 잠금 시도 (다른 프로세스가 잡고 있으면 False, 기다리지 않음)"""
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+_feature_cache = None
+
+
+def get_feature_cache() -> Optional[FeatureCache]:
+    """FEATURE_CACHE_DIR가 설정되어 있으면 프로세스 공유 특징 캐시, 아니면 None"""
+    global _feature_cache
+    if _feature_cache is None and FEATURE_CACHE_DIR:
+        with _model_lock:
+            if _feature_cache is None:
+                _feature_cache = FeatureCache(FEATURE_CACHE_DIR, int(FEATURE_CACHE_MAX_MB * 2**20))
+                atexit.register(_feature_cache.flush)
+    return _feature_cache
+
+
 # ==========================================
 # 오디오 전처리 함수
 # ==========================================
 def wav_to_logmel_infer(wav_path: str) -> np.ndarray:
     """
     WAV 파일을 log-mel spectrogram으로 변환 (추론용, augmentation 없음)
+    특징 캐시가 켜져 있으면 같은 내용의 파일은 디코딩 없이 캐시에서 읽는다.
     """
+    cache = get_feature_cache()
+    key = cache.key_for_file(wav_path, "logmel") if cache is not None else None
+    if key is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[0]
+
     y, sr = librosa.load(wav_path, sr=SR, mono=True)
+    log_mel = waveform_to_logmel_infer(y)
+    if key is not None:
+        cache.put(key, log_mel)
+    return log_mel
+
+
+def waveform_to_logmel_infer(y: np.ndarray) -> np.ndarray:
+    """
+    이미 디코딩된 16kHz mono 파형을 log-mel spectrogram으로 변환 (추론용)
+
+    호출 측에서 디코딩한 PCM 버퍼를 그대로 받는다 (float32면 복사하지 않음).
+    """
+    y = np.asarray(y, dtype=np.float32)
 
     # 길이 고정 (2초)
     target_len = int(SR * DURATION)
@@ -104,18 +646,8 @@ def wav_to_logmel_infer(wav_path: str) -> np.ndarray:
     else:
         y = y[:target_len]
 
-    # mel-spectrogram
-    mel = librosa.feature.melspectrogram(
-        y=y, sr=SR, n_fft=N_FFT, hop_length=HOP_LENGTH, n_mels=N_MELS
-    )
-
-    # log scale (dB)
-    log_mel = librosa.power_to_db(mel, ref=np.max)
-
-    # 표준화
-    log_mel = (log_mel - log_mel.mean()) / (log_mel.std() + 1e-6)
-
-    return log_mel.astype(np.float32)
+    # mel-spectrogram → log scale (dB, ref=max) → 표준화 (미리 계산한 프론트엔드)
+    return _get_frontend().log_mel(y)
 
 
 # ==========================================
@@ -131,25 +663,40 @@ def predict_audio_event(wav_path: str) -> Dict:
         "confidence": float  # 0.0 ~ 1.0
     }
     """
+    return _predict(wav_path)
+
+
+def predict_audio_event_from_waveform(y: np.ndarray) -> Dict:
+    """
+    이미 디코딩된 16kHz mono 파형으로 추론 (파일 재디코딩 없음)
+
+    Output: predict_audio_event와 동일
+    """
+    return _predict(y)
+
+
+def _predict(item: Union[str, os.PathLike, np.ndarray]) -> Dict:
+    """경로 또는 파형의 앞 2초 윈도우 하나로 게이트 → forward 후 top-1 결과 반환"""
     model, device = _load_model()
     
     # 모델 파일이 없으면 더미 반환
-    if not os.path.exists(MODEL_PATH):
+    if not _has_weights():
         return {
             "event": "생활소음",
             "confidence": 0.5
         }
     
     try:
-        # 1) wav → logmel
-        log_mel = wav_to_logmel_infer(wav_path)
-        x = torch.tensor(log_mel, dtype=torch.float32).unsqueeze(0).unsqueeze(0)  # (1,1,64,T)
-        x = x.to(device)
+        # 1) 2초 윈도우 → 활동 게이트 → logmel (경로면 특징 캐시 사용)
+        features = _featurize_chunk([item], full_clip=False)[0]
+        if isinstance(features, Exception):
+            raise features
+        _, _, log_mels, audit = features
 
-        # 2) forward
-        with torch.no_grad():
-            outputs = model(x)
-            probs = torch.softmax(outputs, dim=1)[0].cpu().numpy()
+        # 2) forward (게이트가 건너뛴 윈도우는 생략)
+        probs, _ = _probs_from_logmels(log_mels)
+        _record_audit(audit, probs)
+        probs = probs[0]
 
         # 3) 결과 정리
         top_idx = int(np.argmax(probs))
@@ -170,6 +717,587 @@ def predict_audio_event(wav_path: str) -> Dict:
         }
 
 
+def _forward_logmels(log_mels: np.ndarray, batch_size: int = WINDOW_BATCH_SIZE) -> np.ndarray:
+    """
+    (N, N_MELS, T) log-mel 배치 → (N, n_classes) softmax 확률
+    batch_size개씩 나눠서 forward 한다.
+    """
+    model, device = _load_model()
+    probs = []
+    with torch.no_grad():
+        for i in range(0, len(log_mels), batch_size):
+            x = torch.from_numpy(
+                np.ascontiguousarray(log_mels[i:i + batch_size], dtype=np.float32)
+            ).unsqueeze(1)  # (B,1,64,T)
+            outputs = model(x.to(device))
+            probs.append(torch.softmax(outputs, dim=1).cpu().numpy())
+    return np.concatenate(probs, axis=0)
+
+
+# ==========================================
+# 활동 감지 게이트 (RMS + spectral flux)
+# ==========================================
+class ActivityGate:
+    """
+    CNN / Whisper 앞에서 윈도우가 "활동"인지 싸게 판단한다.
+
+    윈도우를 GATE_FRAME 샘플 프레임으로 나눠서
+    1) 최대 프레임 RMS < rms_floor_db          → 무음 (건너뜀)
+    2) 최대 프레임 RMS >= loud_db               → 큰 소리 (추론)
+    3) 프레임 RMS 최대 - 중앙값 >= range_db      → 소리 변화 (추론)
+    4) 대역 에너지 spectral flux >= flux_db     → 스펙트럼 변화 (추론)
+    나머지(일정한 배경 소음)는 건너뛴다. FFT는 1~3으로 결정되지 않은 윈도우만 계산한다.
+
+    건너뛴 윈도우 중 audit_rate 비율은 호출 측이 그래도 추론해서 record_audit으로
+    실제로 놓친 이벤트(false skip)가 있었는지 기록한다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = ACTIVITY_GATE,
+        rms_floor_db: float = ACTIVITY_RMS_FLOOR_DB,
+        loud_db: float = ACTIVITY_LOUD_DB,
+        range_db: float = ACTIVITY_RANGE_DB,
+        flux_db: float = ACTIVITY_FLUX_DB,
+        audit_rate: float = ACTIVITY_AUDIT_RATE,
+        seed: Optional[int] = None,
+    ):
+        self.enabled = enabled
+        self.rms_floor_db = rms_floor_db
+        self.loud_db = loud_db
+        self.range_db = range_db
+        self.flux_db = flux_db
+        self.audit_rate = audit_rate
+
+        self._window = torch.hann_window(GATE_FRAME)
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._recent_false_skips = deque(maxlen=20)
+
+    def measure(self, windows: np.ndarray) -> Dict[str, np.ndarray]:
+        """(N, samples) 윈도우 → 윈도우별 rms_db / range_db / flux_db (flux는 필요한 윈도우만, 나머지 0)"""
+        windows = np.atleast_2d(np.asarray(windows, dtype=np.float32))
+        n_frames = max(1, windows.shape[1] // GATE_FRAME)
+        if windows.shape[1] < n_frames * GATE_FRAME:
+            windows = np.pad(windows, ((0, 0), (0, n_frames * GATE_FRAME - windows.shape[1])))
+        frames = windows[:, :n_frames * GATE_FRAME].reshape(len(windows), n_frames, GATE_FRAME)
+
+        energy = np.einsum("ijk,ijk->ij", frames, frames) / GATE_FRAME
+        frame_db = 10.0 * np.log10(np.maximum(energy, 1e-10))
+        rms_db = frame_db.max(axis=1)
+        range_db = rms_db - np.median(frame_db, axis=1)
+
+        flux_db = np.zeros(len(windows), dtype=np.float32)
+        undecided = (rms_db >= self.rms_floor_db) & (rms_db < self.loud_db) & (range_db < self.range_db)
+        if undecided.any() and n_frames > 1:
+            flux_db[undecided] = self._spectral_flux(frames[undecided])
+
+        return {"rms_db": rms_db, "range_db": range_db, "flux_db": flux_db}
+
+    def _spectral_flux(self, frames: np.ndarray) -> np.ndarray:
+        """(N, F, GATE_FRAME) 프레임 → 윈도우별 최대 (연속 프레임 간 대역 log 에너지 증가량의 평균)"""
+        x = torch.from_numpy(np.ascontiguousarray(frames)) * self._window
+        power = torch.fft.rfft(x, dim=-1).abs().pow(2)[..., 1:]  # DC 제외 GATE_FRAME/2 bin
+        bands = power.reshape(*power.shape[:-1], GATE_BANDS, -1).sum(dim=-1)
+        log_bands = 10.0 * torch.log10(bands + 1e-10)
+        flux = torch.clamp(log_bands[:, 1:] - log_bands[:, :-1], min=0).mean(dim=-1)
+        return flux.max(dim=1).values.numpy()
+
+    def is_active(self, levels: Dict[str, np.ndarray]) -> np.ndarray:
+        rms_db = levels["rms_db"]
+        return (rms_db >= self.rms_floor_db) & (
+            (rms_db >= self.loud_db)
+            | (levels["range_db"] >= self.range_db)
+            | (levels["flux_db"] >= self.flux_db)
+        )
+
+    def evaluate(self, windows: np.ndarray, source: str = "cnn"):
+        """
+        윈도우별 게이트 판정 + 통계 기록.
+
+        Output: (active, audit, levels)
+          active: 추론해야 하는 윈도우 (bool, N)
+          audit:  건너뛰지만 false skip 확인용으로 추론할 윈도우 (bool, N, active와 겹치지 않음)
+          levels: measure 결과 (게이트가 꺼져 있으면 None)
+        """
+        n = len(windows)
+        if not self.enabled:
+            self._count(source, n, 0, 0)
+            return np.ones(n, dtype=bool), np.zeros(n, dtype=bool), None
+
+        levels = self.measure(windows)
+        active = self.is_active(levels)
+        audit = np.zeros(n, dtype=bool)
+        with self._lock:
+            for i in np.flatnonzero(~active):
+                audit[i] = self._rng.random() < self.audit_rate
+        self._count(source, n, int((~active).sum()), int(audit.sum()))
+        return active, audit, levels
+
+    def evaluate_clip(self, windows: np.ndarray, source: str = "stt"):
+        """
+        클립 단위 판정 (윈도우가 하나라도 활동이면 활동). Whisper처럼 클립 전체를 한 번에 처리할 때 사용.
+
+        Output: (active, audit, levels)  active / audit는 bool 하나
+        """
+        if not self.enabled:
+            self._count(source, 1, 0, 0)
+            return True, False, None
+
+        levels = self.measure(windows)
+        active = bool(self.is_active(levels).any())
+        with self._lock:
+            audit = not active and self._rng.random() < self.audit_rate
+        self._count(source, 1, 0 if active else 1, int(audit))
+        return active, audit, levels
+
+    def record_audit(self, source: str, missed: Iterable[bool], details: Iterable[Dict] = ()):
+        """감사로 추론한 결과 기록 (missed: 건너뛰었으면 이벤트를 놓쳤을 윈도우/클립)"""
+        missed = [bool(m) for m in missed]
+        details = list(details)
+        with self._lock:
+            counter = self._counters.setdefault(source, self._new_counter())
+            counter["audit_done"] += len(missed)
+            counter["false_skips"] += sum(missed)
+            for is_missed, detail in itertools.zip_longest(missed, details, fillvalue={}):
+                if is_missed:
+                    self._recent_false_skips.append({"source": source, "time": time.time(), **detail})
+
+    def stats(self) -> Dict:
+        """소스(cnn / stt 등)별 건너뛴 비율과 감사 결과 (false skip 비율은 감사한 것 기준)"""
+        with self._lock:
+            sources = {}
+            for source, counter in self._counters.items():
+                total, skipped, audited = counter["total"], counter["skipped"], counter["audit_done"]
+                sources[source] = {
+                    **counter,
+                    "skip_rate": round(skipped / total, 4) if total else 0.0,
+                    "false_skip_rate": round(counter["false_skips"] / audited, 4) if audited else None,
+                }
+            return {
+                "enabled": self.enabled,
+                "thresholds": {
+                    "rms_floor_db": self.rms_floor_db,
+                    "loud_db": self.loud_db,
+                    "range_db": self.range_db,
+                    "flux_db": self.flux_db,
+                    "audit_rate": self.audit_rate,
+                },
+                "sources": sources,
+                "recent_false_skips": list(self._recent_false_skips),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
+            self._recent_false_skips.clear()
+
+    @staticmethod
+    def _new_counter() -> Dict[str, int]:
+        return {"total": 0, "skipped": 0, "audit_scheduled": 0, "audit_done": 0, "false_skips": 0}
+
+    def _count(self, source: str, total: int, skipped: int, audit: int):
+        with self._lock:
+            counter = self._counters.setdefault(source, self._new_counter())
+            counter["total"] += total
+            counter["skipped"] += skipped
+            counter["audit_scheduled"] += audit
+
+
+_activity_gate = None
+
+
+def get_activity_gate() -> ActivityGate:
+    """프로세스 공유 활동 감지 게이트 (통계도 공유)"""
+    global _activity_gate
+    if _activity_gate is None:
+        with _model_lock:
+            if _activity_gate is None:
+                _activity_gate = ActivityGate()
+    return _activity_gate
+
+
+def _skip_probs(n: int) -> np.ndarray:
+    """게이트가 건너뛴 윈도우의 확률 (생활소음 ACTIVITY_SKIP_CONFIDENCE)"""
+    probs = np.zeros((n, len(CLASS_TO_IDX)), dtype=np.float32)
+    probs[:, CLASS_TO_IDX[BACKGROUND_CLASS]] = ACTIVITY_SKIP_CONFIDENCE
+    return probs
+
+
+def _audit_details(probs: np.ndarray, levels: Optional[Dict], indices: np.ndarray):
+    """감사한 윈도우의 CNN 확률 → (놓쳤는지 여부, 진단 정보) 목록"""
+    missed, details = [], []
+    for row, i in zip(probs, indices):
+        top_idx = int(np.argmax(row))
+        missed.append(
+            top_idx != CLASS_TO_IDX[BACKGROUND_CLASS] and row[top_idx] >= ACTIVITY_FALSE_SKIP_CONFIDENCE
+        )
+        detail = {"event": idx_to_class[top_idx], "confidence": round(float(row[top_idx]), 4)}
+        if levels is not None:
+            detail.update({name: round(float(values[i]), 2) for name, values in levels.items()})
+        details.append(detail)
+    return missed, details
+
+
+def _gated_logmels(windows: np.ndarray, source: str = "cnn", use_gate: bool = True):
+    """
+    (N, samples) 윈도우 → (N, N_MELS, T) log-mel, 감사 정보 (audit_idx, levels) 또는 None.
+    게이트가 건너뛴 윈도우는 log-mel을 계산하지 않고 NaN으로 채운다 (특징 캐시에도 그대로 저장).
+    감사 윈도우는 계산한다 (CNN 결과를 그대로 써서 실제 이벤트를 놓치지 않도록).
+    """
+    n = len(windows)
+    if use_gate:
+        active, audit, levels = get_activity_gate().evaluate(windows, source)
+    else:
+        active, audit, levels = np.ones(n, dtype=bool), np.zeros(n, dtype=bool), None
+    run = active | audit
+
+    log_mels = np.full((n, N_MELS, int(SR * DURATION) // HOP_LENGTH + 1), np.nan, dtype=np.float32)
+    if run.any():
+        log_mels[run] = _get_frontend().log_mel(np.ascontiguousarray(windows[run]))
+    audit_info = (np.flatnonzero(audit), levels) if audit.any() else None
+    return log_mels, audit_info
+
+
+def _probs_from_logmels(log_mels: np.ndarray):
+    """(N, N_MELS, T) log-mel → (N, n_classes) 확률, 게이트로 건너뛴(NaN) 윈도우 mask"""
+    gated = np.isnan(log_mels[:, 0, 0])
+    probs = _skip_probs(len(log_mels))
+    if not gated.all():
+        probs[~gated] = _forward_logmels(log_mels[~gated])
+    return probs, gated
+
+
+def _record_audit(audit_info, probs: np.ndarray, source: str = "cnn"):
+    """감사 윈도우의 CNN 결과로 false skip 여부 기록"""
+    if audit_info is None:
+        return
+    audit_idx, levels = audit_info
+    get_activity_gate().record_audit(source, *_audit_details(probs[audit_idx], levels, audit_idx))
+
+
+def _forward_gated(windows: np.ndarray, source: str = "cnn"):
+    """(N, samples) 윈도우 → (N, n_classes) 확률, 게이트로 건너뛴 윈도우 mask"""
+    log_mels, audit_info = _gated_logmels(windows, source)
+    probs, gated = _probs_from_logmels(log_mels)
+    _record_audit(audit_info, probs, source)
+    return probs, gated
+
+
+# ==========================================
+# 슬라이딩 윈도우 추론 (클립 전체)
+# ==========================================
+def _window_starts(n_samples: int, hop: float = WINDOW_HOP) -> np.ndarray:
+    """split_windows가 만드는 윈도우의 시작 샘플 위치 (파형 없이 길이만으로 계산)"""
+    win = int(SR * DURATION)
+    step = max(1, int(SR * hop))
+    if n_samples <= win:
+        return np.array([0])
+
+    starts = np.arange((n_samples - win) // step + 1) * step
+    # 마지막 윈도우가 클립 끝까지 덮지 못하면 남은 꼬리 구간 윈도우 추가
+    tail_start = int(starts[-1]) + step
+    if int(starts[-1]) + win < n_samples and tail_start < n_samples:
+        starts = np.append(starts, tail_start)
+    return starts
+
+
+def split_windows(y: np.ndarray, hop: float = WINDOW_HOP):
+    """
+    파형을 DURATION 길이 윈도우로 hop 간격마다 자른다 (복사 없는 view).
+    마지막 윈도우가 클립 끝을 넘으면 0으로 패딩한 윈도우를 하나 더 붙인다.
+    
+    Output: (starts, windows)  starts: 윈도우 시작 샘플 위치 (N,), windows: (N, SR*DURATION)
+    """
+    y = np.asarray(y, dtype=np.float32)
+    win = int(SR * DURATION)
+    step = max(1, int(SR * hop))
+    starts = _window_starts(len(y), hop)
+
+    if len(y) <= win:
+        return starts, np.pad(y, (0, win - len(y)))[np.newaxis]
+
+    windows = np.lib.stride_tricks.sliding_window_view(y, win)[::step]
+
+    # 꼬리 구간 윈도우는 0으로 패딩해서 추가
+    if len(starts) > len(windows):
+        tail_start = int(starts[-1])
+        tail = np.pad(y[tail_start:], (0, tail_start + win - len(y)))
+        windows = np.concatenate([windows, tail[np.newaxis]], axis=0)
+
+    return starts, windows
+
+
+def predict_audio_event_timeline(y: np.ndarray, hop: float = WINDOW_HOP) -> Dict:
+    """
+    16kHz mono 파형 전체를 겹치는 2초 윈도우로 나눠 한 번의 배치로 추론.
+    클립 길이에 비례해서 윈도우 수가 늘어난다 (앞 2초만 보고 자르지 않음).
+    
+    활동 게이트가 무음 / 배경 소음으로 판정한 윈도우는 CNN 없이 생활소음으로 채운다 (gated=True).
+    
+    Output: {
+        "event": str,          # 대표 이벤트 (생활소음이 아닌 윈도우 중 confidence 최대, 없으면 생활소음)
+        "confidence": float,
+        "peak_time": float,    # 대표 이벤트 윈도우 시작 시각 (초)
+        "timeline": [          # 윈도우별 top-1 결과 (시간순)
+            {"start": float, "end": float, "event": str, "confidence": float, "gated": bool}, ...
+        ]
+    }
+    """
+    y = np.asarray(y, dtype=np.float32)
+    starts, windows = split_windows(y, hop)
+    ends = np.minimum(starts + int(SR * DURATION), max(len(y), 1))
+
+    _load_model()
+    gated = None
+    if not _has_weights():
+        # 모델 파일이 없으면 더미 (윈도우 구간은 그대로 돌려줌)
+        probs = _dummy_probs(len(windows))
+    else:
+        try:
+            # 활동 윈도우만 모아서 한 번의 배치 STFT + CNN
+            probs, gated = _forward_gated(windows)
+        except Exception as e:
+            print(f"❌ B 모듈 추론 에러: {e}")
+            probs = _dummy_probs(len(windows))
+
+    return _summarize_timeline(starts, ends, probs, gated)
+
+
+def _dummy_probs(n: int) -> np.ndarray:
+    """모델이 없거나 추론에 실패했을 때의 확률 (생활소음 0.5)"""
+    probs = np.zeros((n, len(CLASS_TO_IDX)), dtype=np.float32)
+    probs[:, CLASS_TO_IDX[BACKGROUND_CLASS]] = 0.5
+    return probs
+
+
+def _summarize_timeline(
+    starts: np.ndarray, ends: np.ndarray, probs: np.ndarray, gated: Optional[np.ndarray] = None
+) -> Dict:
+    """윈도우별 확률 (+ 게이트로 건너뛴 윈도우 mask) → timeline + 대표 이벤트 (predict_audio_event_timeline 출력 형식)"""
+    top_idx = probs.argmax(axis=1)
+    top_conf = probs[np.arange(len(probs)), top_idx]
+    if gated is None:
+        gated = np.zeros(len(probs), dtype=bool)
+    timeline = [
+        {
+            "start": round(float(start) / SR, 3),
+            "end": round(float(end) / SR, 3),
+            "event": idx_to_class[int(idx)],
+            "confidence": float(conf),
+            "gated": bool(skipped),
+        }
+        for start, end, idx, conf, skipped in zip(starts, ends, top_idx, top_conf, gated)
+    ]
+
+    # 대표 이벤트: 배경이 아닌 윈도우 중 가장 확신이 높은 것, 없으면 배경 중 최대
+    background = CLASS_TO_IDX[BACKGROUND_CLASS]
+    candidates = np.flatnonzero(top_idx != background)
+    if len(candidates) == 0:
+        candidates = np.arange(len(top_idx))
+    peak = int(candidates[np.argmax(top_conf[candidates])])
+
+    return {
+        "event": timeline[peak]["event"],
+        "confidence": timeline[peak]["confidence"],
+        "peak_time": timeline[peak]["start"],
+        "timeline": timeline,
+    }
+
+
+# ==========================================
+# 여러 클립 배치 추론
+# ==========================================
+def _window_bounds(n_samples: int, full_clip: bool):
+    """클립 길이 → 윈도우별 (starts, ends) 샘플 위치"""
+    starts = _window_starts(n_samples) if full_clip else np.array([0])
+    ends = np.minimum(starts + int(SR * DURATION), max(n_samples, 1))
+    return starts, ends
+
+
+def _load_clip(item: Union[str, os.PathLike, np.ndarray], full_clip: bool):
+    """
+    경로 또는 파형 하나 → (windows, n_samples)
+    full_clip=False면 predict_audio_event와 같이 앞 2초 윈도우 하나만 만든다.
+    """
+    if isinstance(item, (str, os.PathLike)):
+        # 앞 2초만 쓸 때는 그만큼만 디코딩
+        y, _ = librosa.load(item, sr=SR, mono=True, duration=None if full_clip else DURATION)
+    else:
+        y = item
+    y = np.asarray(y, dtype=np.float32)
+
+    if full_clip:
+        _, windows = split_windows(y)
+    else:
+        win = int(SR * DURATION)
+        windows = np.pad(y[:win], (0, max(0, win - len(y))))[np.newaxis]
+    return windows, len(y)
+
+
+def _clip_cache_kind(full_clip: bool, use_gate: bool) -> str:
+    """특징 캐시의 종류 문자열 (윈도우 방식 + 게이트 설정이 다르면 다른 항목)"""
+    gate = get_activity_gate()
+    if use_gate and gate.enabled:
+        gate_key = f"gate={gate.rms_floor_db},{gate.loud_db},{gate.range_db},{gate.flux_db}"
+    else:
+        gate_key = "gate=off"
+    return f"clip|full={int(full_clip)}|hop={WINDOW_HOP}|{gate_key}"
+
+
+def _featurize_chunk(items: List, full_clip: bool, use_gate: bool = True) -> List:
+    """
+    입력 여러 개 → 디코딩 → 활동 게이트 → 모든 윈도우의 log-mel을 한 번의 배치 STFT로 계산.
+    경로 입력은 특징 캐시를 먼저 확인하고, 있으면 디코딩 / 게이트 / log-mel을 모두 생략한다.
+    입력마다 (starts, ends, log_mels, audit) 또는 실패 시 Exception을 돌려준다.
+      log_mels: (N, N_MELS, T), 게이트가 건너뛴 윈도우는 NaN
+      audit:    (감사 윈도우 번호, levels) - 감사 결과 기록용, 없으면 None
+    """
+    cache = get_feature_cache()
+    kind = _clip_cache_kind(full_clip, use_gate) if cache is not None else None
+
+    results = [None] * len(items)
+    misses = []  # (입력 번호, windows, 샘플 수, 캐시 key)
+    for i, item in enumerate(items):
+        try:
+            key = None
+            if cache is not None and isinstance(item, (str, os.PathLike)):
+                key = cache.key_for_file(item, kind)
+                hit = cache.get(key)
+                if hit is not None:
+                    log_mels, meta = hit
+                    results[i] = (*_window_bounds(meta["samples"], full_clip), log_mels, None)
+                    continue
+            windows, n_samples = _load_clip(item, full_clip)
+            misses.append((i, windows, n_samples, key))
+        except Exception as e:
+            results[i] = e
+
+    if not misses:
+        return results
+    log_mels, audit_info = _gated_logmels(
+        np.concatenate([windows for _, windows, _, _ in misses]), use_gate=use_gate
+    )
+
+    offset = 0
+    for i, windows, n_samples, key in misses:
+        clip_log_mels = log_mels[offset:offset + len(windows)]
+        clip_audit = None
+        if audit_info is not None:
+            audit_idx, levels = audit_info
+            mine = (audit_idx >= offset) & (audit_idx < offset + len(windows))
+            if mine.any():
+                clip_audit = (audit_idx[mine] - offset, {
+                    name: values[offset:offset + len(windows)] for name, values in levels.items()
+                })
+        if key is not None:
+            cache.put(key, clip_log_mels, {"samples": n_samples})
+        results[i] = (*_window_bounds(n_samples, full_clip), clip_log_mels, clip_audit)
+        offset += len(windows)
+    return results
+
+
+def predict_audio_events(
+    inputs: Iterable[Union[str, os.PathLike, np.ndarray]],
+    batch_size: int = WINDOW_BATCH_SIZE,
+    num_workers: int = FEATURE_WORKERS,
+    full_clip: bool = False,
+) -> List[Dict]:
+    """
+    여러 클립(WAV 경로 또는 16kHz mono 파형)을 한꺼번에 추론.
+    
+    - 디코딩 + log-mel은 num_workers개 스레드가 미리 처리 (CNN forward와 겹쳐서 진행,
+      미리 준비하는 묶음은 최대 2 * num_workers개라 입력이 많아도 메모리는 일정)
+    - 특징 캐시(FEATURE_CACHE_DIR)에 있는 파일은 디코딩 / log-mel 없이 바로 CNN forward
+    - 활동 게이트가 무음 / 배경 소음으로 판정한 윈도우는 log-mel / CNN 없이 생활소음으로 채움
+    - 준비된 윈도우를 batch_size개씩 모아 CNN forward
+    - 결과는 입력 순서대로 반환
+    
+    Output (입력마다 하나):
+      full_clip=False: predict_audio_event와 동일 ({"event", "confidence"}, 앞 2초 기준)
+      full_clip=True:  predict_audio_event_timeline과 동일 ({"event", "confidence", "peak_time", "timeline"})
+      실패한 입력은 {"event": "생활소음", "confidence": 0.5, "error": str}
+    """
+    inputs = list(inputs)
+    if not inputs:
+        return []
+
+    _load_model()
+    has_weights = _has_weights()
+    batch_size = max(1, batch_size)
+
+    features = [None] * len(inputs)   # 입력별 (starts, ends, run_idx, audit)
+    probs = [[] for _ in inputs]      # 입력별 추론한 윈도우의 확률 (run_idx 순서)
+    errors = {}
+    pending, owners = [], []          # forward 대기 중인 log-mel 윈도우 / 소속 입력 index
+
+    def flush(count: int):
+        batch = np.stack(pending[:count])
+        batch_probs = _forward_logmels(batch, batch_size) if has_weights else _dummy_probs(count)
+        for owner, row in zip(owners[:count], batch_probs):
+            probs[owner].append(row)
+        del pending[:count]
+        del owners[:count]
+
+    # 입력을 FEATURE_CHUNK_SIZE개씩 묶어서 워커에 넘김 (묶음마다 log-mel을 한 번에 계산)
+    # (STFT 배치가 너무 크면 캐시 효율이 떨어져서 CNN 배치 크기와 따로 둔다)
+    chunks = (
+        inputs[i:i + FEATURE_CHUNK_SIZE] for i in range(0, len(inputs), FEATURE_CHUNK_SIZE)
+    )
+    # 모델이 없으면 (더미 확률) 게이트 통계를 남기지 않음
+    featurize = functools.partial(_featurize_chunk, full_clip=full_clip, use_gate=has_weights)
+    num_workers = max(1, num_workers)
+    max_in_flight = 2 * num_workers
+
+    def featurized_in_order(pool):
+        """묶음을 입력 순서대로 돌려주면서 뒤쪽 묶음은 최대 max_in_flight개까지만 미리 제출"""
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(featurize, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="aed-featurize") as pool:
+        chunk_results = featurized_in_order(pool)
+        for index, result in enumerate(itertools.chain.from_iterable(chunk_results)):
+            if isinstance(result, Exception):
+                print(f"❌ B 모듈 배치 추론 에러 (입력 {index}): {result}")
+                errors[index] = str(result)
+                continue
+            starts, ends, log_mels, audit = result
+            run_idx = np.flatnonzero(~np.isnan(log_mels[:, 0, 0]))
+            features[index] = (starts, ends, run_idx, audit)
+            log_mels = log_mels[run_idx]
+            pending.extend(log_mels)
+            owners.extend([index] * len(log_mels))
+            while len(pending) >= batch_size:
+                flush(batch_size)
+        if pending:
+            flush(len(pending))
+
+    results = []
+    for index in range(len(inputs)):
+        if index in errors:
+            results.append({"event": "생활소음", "confidence": 0.5, "error": errors[index]})
+            continue
+        starts, ends, run_idx, audit = features[index]
+        clip_probs = _skip_probs(len(starts))
+        if len(run_idx):
+            clip_probs[run_idx] = np.stack(probs[index])
+        _record_audit(audit, clip_probs)
+        gated = np.ones(len(starts), dtype=bool)
+        gated[run_idx] = False
+        summary = _summarize_timeline(starts, ends, clip_probs, gated)
+        if full_clip:
+            results.append(summary)
+        else:
+            results.append({"event": summary["event"], "confidence": summary["confidence"]})
+    return results
+
+
 # ==========================================
 # FastAPI에서 호출하는 메인 함수
 # ==========================================
@@ -204,12 +1332,43 @@ def analyze_sound(event: str, confidence: float) -> Dict:
 # ==========================================
 def analyze_sound_from_file(wav_path: str) -> Dict:
     """
-    WAV 파일 경로를 받아서 모델로 분석
+    WAV 파일 경로를 받아서 클립 전체를 슬라이딩 윈도우로 분석
     
     Input: wav 파일 경로
+    Output: predict_audio_event_timeline과 동일 ({"event", "confidence", "peak_time", "timeline"})
+    """
+    _load_model()
+    try:
+        if not _has_weights():
+            y, _ = librosa.load(wav_path, sr=SR, mono=True)
+            return predict_audio_event_timeline(y)
+
+        # 특징 캐시에 있으면 디코딩 / log-mel 생략
+        features = _featurize_chunk([wav_path], full_clip=True)[0]
+        if isinstance(features, Exception):
+            raise features
+        starts, ends, log_mels, audit = features
+        probs, gated = _probs_from_logmels(log_mels)
+        _record_audit(audit, probs)
+        return _summarize_timeline(starts, ends, probs, gated)
+
+    except Exception as e:
+        print(f"❌ B 모듈 추론 에러: {e}")
+        # 에러 발생 시 기본값 (생활소음 0.5, 구간 정보 없음)
+        return _summarize_timeline(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64), _dummy_probs(1))
+
+
+def analyze_sound_from_waveform(y: np.ndarray) -> Dict:
+    """
+    이미 디코딩된 16kHz mono float32 파형 전체를 슬라이딩 윈도우로 분석
+    (STT와 같은 PCM 버퍼를 공유할 때 사용)
+    
+    Input: np.ndarray (16kHz, mono)
     Output: {
         "event": str,
-        "confidence": float
+        "confidence": float,
+        "peak_time": float,
+        "timeline": [...]
     }
     """
-    return predict_audio_event(wav_path)
+    return predict_audio_event_timeline(y)
@@ -226,15 +226,8 @@ model = genai.GenerativeModel(
 )
 
 
-def build_situation_with_gemini(
-    speech_result: dict | None,
-    sound_result: dict | None,
-    source: str = "test"
-) -> dict:
-    """
-    speech_result, sound_result를 받아 Gemini에게 상황 요약 JSON 생성을 요청.
-    """
-    # 1) 모델 입력 준비
+def _build_prompt(speech_result: dict | None, sound_result: dict | None, source: str) -> str:
+    """A/B 결과를 Gemini 입력 JSON 문자열로 변환"""
     model_input = {
         "speech_result": speech_result,
         "sound_result": sound_result,
@@ -245,31 +238,44 @@ def build_situation_with_gemini(
     }
 
     # dict -> JSON 문자열로 변환해서 프롬프트로 사용
-    prompt = json.dumps(model_input, ensure_ascii=False)
+    return json.dumps(model_input, ensure_ascii=False)
 
-    # 2) Gemini 호출
-    response = model.generate_content(
-        prompt,
-        generation_config={
-            "response_mime_type": "application/json",
-            "temperature": 0.0
-        }
-    )
 
-    # 3) 응답 텍스트 추출
+# Gemini 호출 설정 (동기/비동기 공통)
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.0
+}
+
+
+def _parse_situation(
+    response,
+    speech_result: dict | None,
+    sound_result: dict | None,
+    source: str
+) -> dict:
+    """
+    Gemini 응답에서 상황 JSON을 꺼내고 누락 필드를 보정.
+    응답을 쓸 수 없어 기본값으로 채운 경우 meta["fallback"] = True 로 표시한다.
+    """
+    fallback = False
+
+    # 1) 응답 텍스트 추출
     try:
         raw = response.candidates[0].content.parts[0].text
     except Exception as e:
         print("[ERROR] 응답 텍스트 추출 실패:", e)
         print("[RAW RESPONSE OBJECT]", response)
         raw = "{}"  # 최소한 빈 JSON 문자열로 처리
+        fallback = True
 
-    # 4) JSON 파싱
+    # 2) JSON 파싱
     try:
         situation = json.loads(raw)
     except Exception as e:
         print("[WARN] Gemini JSON 파싱 실패:", e)
         print("[RAW RESPONSE]", raw)
+        fallback = True
         # fallback JSON
         situation = {
             "situation_id": "S0",
@@ -285,7 +291,7 @@ def build_situation_with_gemini(
             }
         }
 
-    # 5) 누락 필드 보정
+    # 3) 누락 필드 보정
     situation.setdefault("situation_id", "S0")
     situation.setdefault("situation_label", "normal_or_unclear")
     situation.setdefault("emergency_level", "low")
@@ -297,19 +303,59 @@ def build_situation_with_gemini(
         "language": "ko",
         "source": source
     })
+    if fallback and isinstance(situation["meta"], dict):
+        situation["meta"]["fallback"] = True
 
     return situation
 
 
-def fuse_situation(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
+def is_fallback_situation(situation: Dict) -> bool:
+    """Gemini 응답 대신 기본값으로 채운 상황 JSON인지 (_parse_situation 참고)"""
+    meta = situation.get("meta")
+    return isinstance(meta, dict) and bool(meta.get("fallback"))
+
+
+def build_situation_with_gemini(
+    speech_result: dict | None,
+    sound_result: dict | None,
+    source: str = "test"
+) -> dict:
     """
-    FastAPI에서 호출하는 메인 함수.
-    A/B 모듈이 반환한 dict를 Gemini 프롬프트에서 기대하는 구조로 변환한 뒤,
-    build_situation_with_gemini를 호출한다.
-    
-    Input: A 모듈 결과 dict + B 모듈 결과 dict
-    Output: 최종 상황 요약 dict
+    speech_result, sound_result를 받아 Gemini에게 상황 요약 JSON 생성을 요청.
     """
+    prompt = _build_prompt(speech_result, sound_result, source)
+
+    # Gemini 호출
+    response = model.generate_content(
+        prompt,
+        generation_config=GENERATION_CONFIG
+    )
+
+    return _parse_situation(response, speech_result, sound_result, source)
+
+
+async def build_situation_with_gemini_async(
+    speech_result: dict | None,
+    sound_result: dict | None,
+    source: str = "test"
+) -> dict:
+    """
+    build_situation_with_gemini의 비동기 버전.
+    네트워크 대기 동안 스레드를 점유하지 않도록 generate_content_async를 await 한다.
+    """
+    prompt = _build_prompt(speech_result, sound_result, source)
+
+    # Gemini 호출 (비동기)
+    response = await model.generate_content_async(
+        prompt,
+        generation_config=GENERATION_CONFIG
+    )
+
+    return _parse_situation(response, speech_result, sound_result, source)
+
+
+def _to_gemini_inputs(speech: Dict, sound: Dict):
+    """A/B 모듈이 반환한 dict를 Gemini 프롬프트에서 기대하는 구조로 변환"""
     # A 모듈 결과(speech)를 Gemini 입력 형식으로 변환
     speech_for_gemini = None
     if speech is not None:
@@ -334,6 +380,20 @@ def fuse_situation(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
             "confidence": sound.get("confidence"),
         }
 
+    return speech_for_gemini, sound_for_gemini
+
+
+def fuse_situation(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
+    """
+    FastAPI에서 호출하는 메인 함수.
+    A/B 모듈이 반환한 dict를 Gemini 프롬프트에서 기대하는 구조로 변환한 뒤,
+    build_situation_with_gemini를 호출한다.
+    
+    Input: A 모듈 결과 dict + B 모듈 결과 dict
+    Output: 최종 상황 요약 dict
+    """
+    speech_for_gemini, sound_for_gemini = _to_gemini_inputs(speech, sound)
+
     # 최종 상황 JSON 생성
     situation = build_situation_with_gemini(
         speech_result=speech_for_gemini,
@@ -344,6 +404,22 @@ def fuse_situation(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
     return situation
 
 
+async def fuse_situation_async(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
+    """
+    fuse_situation의 비동기 버전 (async 파이프라인에서 사용).
+    
+    Input: A 모듈 결과 dict + B 모듈 결과 dict
+    Output: 최종 상황 요약 dict
+    """
+    speech_for_gemini, sound_for_gemini = _to_gemini_inputs(speech, sound)
+
+    return await build_situation_with_gemini_async(
+        speech_result=speech_for_gemini,
+        sound_result=sound_for_gemini,
+        source=source,
+    )
+
+
 # 아래 mock/demo 코드는 로컬 테스트용으로만 남기고,
 # import 될 때 자동 실행되지 않도록 __main__ 보호문 안에 둔다.
 def mock_speech_result_fall_cardiac() -> dict:
@@ -0,0 +1,188 @@
+"""
+영상 → 16kHz mono PCM 추출 벤치마크 스크립트
+moviepy(VideoFileClip → WAV → 디코딩)와 ffmpeg 오디오 전용 demux를 긴 영상에서 비교한다.
+
+사용법:
+    python scripts/bench_audio_extract.py                      # 합성 영상 (60초, 300초) 생성 후 비교
+    python scripts/bench_audio_extract.py --durations 600      # 10분짜리 합성 영상
+    python scripts/bench_audio_extract.py video1.mp4 video2.mp4 --repeat 5 --json result.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가 (services 모듈 import용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.media_decoder import (  # noqa: E402
+    SAMPLE_RATE,
+    decode_audio_file,
+    get_ffmpeg_binary,
+    iter_audio_pcm,
+)
+
+
+def make_synthetic_video(path: str, seconds: int):
+    """ffmpeg lavfi로 640x360 30fps 테스트 영상 + 440Hz 사인파 오디오(AAC) mp4 생성"""
+    cmd = [
+        get_ffmpeg_binary(), "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=size=640x360:rate=30:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", path,
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def extract_with_moviepy(video_path: str, work_dir: str) -> np.ndarray:
+    """기존 방식: VideoFileClip으로 열어서 오디오를 WAV로 쓴 뒤 다시 디코딩"""
+    try:
+        from moviepy.editor import VideoFileClip  # moviepy 1.x
+    except ImportError:
+        from moviepy import VideoFileClip  # moviepy 2.x
+
+    audio_path = os.path.join(work_dir, "moviepy_audio.wav")
+    clip = VideoFileClip(video_path)
+    try:
+        try:
+            clip.audio.write_audiofile(
+                audio_path, fps=SAMPLE_RATE, codec="pcm_s16le", verbose=False, logger=None
+            )
+        except TypeError:
+            # moviepy 2.x에는 verbose 인자가 없음
+            clip.audio.write_audiofile(
+                audio_path, fps=SAMPLE_RATE, codec="pcm_s16le", logger=None
+            )
+    finally:
+        clip.close()
+
+    pcm = decode_audio_file(audio_path)
+    os.remove(audio_path)
+    return pcm
+
+
+def extract_with_ffmpeg(video_path: str, work_dir: str) -> np.ndarray:
+    """새 방식: 오디오 트랙만 demux + 리샘플해서 바로 PCM으로 받음"""
+    return decode_audio_file(video_path)
+
+
+def first_chunk_with_ffmpeg(video_path: str) -> float:
+    """스트리밍 방식에서 첫 1초 블록이 나오기까지 걸린 시간 (초)"""
+    start = time.perf_counter()
+    chunks = iter_audio_pcm(video_path, chunk_seconds=1.0)
+    try:
+        next(chunks)
+    finally:
+        chunks.close()
+    return time.perf_counter() - start
+
+
+def time_method(fn, video_path: str, work_dir: str, repeat: int):
+    timings = []
+    pcm = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pcm = fn(video_path, work_dir)
+        timings.append(time.perf_counter() - start)
+    return timings, pcm
+
+
+def summarize(timings):
+    return {
+        "median_s": round(statistics.median(timings), 4),
+        "min_s": round(min(timings), 4),
+        "max_s": round(max(timings), 4),
+    }
+
+
+def bench_video(video_path: str, repeat: int, skip_moviepy: bool) -> dict:
+    work_dir = tempfile.mkdtemp(prefix="bench_audio_")
+    result = {"video": video_path, "size_mb": round(os.path.getsize(video_path) / 2**20, 2)}
+
+    ffmpeg_timings, ffmpeg_pcm = time_method(extract_with_ffmpeg, video_path, work_dir, repeat)
+    result["audio_seconds"] = round(len(ffmpeg_pcm) / SAMPLE_RATE, 2)
+    result["ffmpeg_audio_only"] = summarize(ffmpeg_timings)
+    result["ffmpeg_first_chunk"] = summarize(
+        [first_chunk_with_ffmpeg(video_path) for _ in range(repeat)]
+    )
+
+    if not skip_moviepy:
+        try:
+            moviepy_timings, moviepy_pcm = time_method(
+                extract_with_moviepy, video_path, work_dir, repeat
+            )
+        except ImportError:
+            print("⚠️ moviepy가 설치되지 않아 moviepy 측정을 건너뜁니다.")
+        else:
+            result["moviepy"] = summarize(moviepy_timings)
+            result["speedup"] = round(
+                result["moviepy"]["median_s"] / result["ffmpeg_audio_only"]["median_s"], 2
+            )
+            # 두 방식의 리샘플러가 달라 샘플 값은 조금 다를 수 있음 → 길이/RMS만 비교
+            result["length_diff_samples"] = int(abs(len(moviepy_pcm) - len(ffmpeg_pcm)))
+            result["rms_moviepy"] = round(float(np.sqrt(np.mean(moviepy_pcm ** 2))), 5)
+            result["rms_ffmpeg"] = round(float(np.sqrt(np.mean(ffmpeg_pcm ** 2))), 5)
+
+    os.rmdir(work_dir)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="moviepy vs ffmpeg 오디오 추출 벤치마크")
+    parser.add_argument("videos", nargs="*", help="측정할 영상 파일 (없으면 합성 영상 생성)")
+    parser.add_argument("--durations", type=int, nargs="+", default=[60, 300],
+                        help="합성 영상 길이 (초)")
+    parser.add_argument("--repeat", type=int, default=3, help="방식별 반복 횟수 (median 보고)")
+    parser.add_argument("--skip-moviepy", action="store_true", help="ffmpeg 방식만 측정")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("영상 → 오디오 추출 벤치마크")
+    print(f"ffmpeg: {get_ffmpeg_binary()}")
+    print("=" * 60)
+
+    synthetic_dir = None
+    videos = list(args.videos)
+    if not videos:
+        synthetic_dir = tempfile.mkdtemp(prefix="bench_video_")
+        for seconds in args.durations:
+            path = os.path.join(synthetic_dir, f"synthetic_{seconds}s.mp4")
+            print(f"\n합성 영상 생성 중: {seconds}초 ...")
+            make_synthetic_video(path, seconds)
+            videos.append(path)
+
+    results = []
+    try:
+        for video_path in videos:
+            print(f"\n📹 {video_path}")
+            result = bench_video(video_path, args.repeat, args.skip_moviepy)
+            results.append(result)
+            print(f"  오디오 길이: {result['audio_seconds']}초 ({result['size_mb']} MB)")
+            print(f"  ffmpeg 오디오 전용: {result['ffmpeg_audio_only']['median_s']}초")
+            print(f"  ffmpeg 첫 1초 블록: {result['ffmpeg_first_chunk']['median_s']}초")
+            if "moviepy" in result:
+                print(f"  moviepy:            {result['moviepy']['median_s']}초 "
+                      f"(x{result['speedup']} 빠름)")
+    finally:
+        if synthetic_dir:
+            for name in os.listdir(synthetic_dir):
+                os.remove(os.path.join(synthetic_dir, name))
+            os.rmdir(synthetic_dir)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+A/B/C 모듈 단계별 벤치마크 스크립트
+합성 16kHz 오디오와 한국어 신고 문장 fixture로 각 단계를 반복 실행하여
+p50/p95/p99 지연 시간, 처리량, 최대 RSS를 측정하고 JSON으로 저장한다.
+
+- C 모듈(퓨전)은 기본적으로 Gemini 대신 stub을 사용하므로 네트워크/API 키 없이 실행된다.
+  (--fusion-latency-ms로 네트워크 지연을 흉내낼 수 있고, --live-fusion이면 실제 Gemini 호출)
+- 단계마다 별도 프로세스에서 실행해서 최대 RSS가 단계별로 분리된다. (--no-isolate로 끌 수 있음)
+- 결과는 bench_results/pipeline_<커밋>.json에 저장되며, --compare로 이전 결과와 p50을 비교한다.
+
+사용법:
+    python scripts/bench_pipeline.py
+    python scripts/bench_pipeline.py --stages speech fusion --iterations 1000
+    python scripts/bench_pipeline.py --compare bench_results/pipeline_abc1234.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource  # Unix 전용 (Windows는 psutil이 있으면 사용)
+except ImportError:
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# 프로젝트 루트 경로 추가 (modules import용)
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SR = 16000
+
+# 한국어 신고 문장 fixture (intent 규칙에 걸리는 문장 + 걸리지 않는 문장)
+UTTERANCES_KO = [
+    "할머니가 갑자기 쓰러져서 숨을 안 쉬어요",
+    "아버지가 가슴이 아프다고 하세요 식은땀도 나요",
+    "부엌에서 불이 났어요 연기가 너무 많아요",
+    "엄마가 계단에서 굴러서 일어나지를 못해요",
+    "할아버지가 의식이 없고 불러도 반응이 없어요",
+    "아이가 갑자기 경련을 하면서 거품을 물어요",
+    "교통사고가 났는데 사람이 차에 치였어요",
+    "손을 칼에 베였는데 피가 안 멈춰요",
+    "어지러워서 서 있을 수가 없어요 머리가 핑 돌아요",
+    "숨이 가빠서 숨쉬기 힘들어요",
+    "옆집에서 싸우다가 사람이 맞았어요",
+    "할머니가 화장실에서 미끄러졌어요",
+    "안녕하세요 그냥 전화해 봤어요",
+    "오늘 날씨가 좋네요",
+    "약을 먹었는데 괜찮은지 모르겠어요",
+    "남편이 숨이 멎은 것 같아요 빨리 와주세요",
+]
+
+STAGES = [
+    "speech",            # A 모듈: analyze_speech(텍스트)
+    "logmel_file",       # B 모듈: wav_to_logmel_infer(경로) - 디코딩 포함
+    "logmel_waveform",   # B 모듈: waveform_to_logmel_infer(파형)
+    "predict_file",      # B 모듈: predict_audio_event(경로) - 디코딩 + log-mel + CNN
+    "predict_timeline",  # B 모듈: predict_audio_event_timeline(긴 파형) - 슬라이딩 윈도우
+    "fusion",            # C 모듈: fuse_situation(A 결과, B 결과)
+]
+
+# stub 퓨전이 돌려주는 상황 JSON (Gemini 응답 형식)
+STUB_SITUATION = {
+    "situation_id": "S2",
+    "situation_label": "cardiac_arrest_suspected",
+    "emergency_level": "critical",
+    "symptoms": ["unconscious", "no_breathing"],
+}
+
+
+# ------------------------------------------
+# fixture
+# ------------------------------------------
+def synthetic_audio(seconds: float, seed: int) -> np.ndarray:
+    """잡음 + 사인파 + 임펄스(충격음)가 섞인 16kHz mono 파형"""
+    rng = np.random.default_rng(seed)
+    n = int(SR * seconds)
+    t = np.arange(n) / SR
+    y = rng.standard_normal(n) * rng.uniform(0.01, 0.1)
+    y += 0.3 * np.sin(2 * np.pi * rng.uniform(200, 2000) * t)
+    for pos in rng.integers(0, n, size=max(1, int(seconds))):
+        y[pos:pos + 200] += rng.uniform(0.5, 1.0) * np.exp(-np.arange(min(200, n - pos)) / 30)
+    return np.clip(y, -1.0, 1.0).astype(np.float32)
+
+
+def write_wav_fixtures(directory: str, count: int, seconds: float):
+    import soundfile as sf
+
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"synthetic_{i}.wav")
+        sf.write(path, synthetic_audio(seconds, seed=i), SR, subtype="PCM_16")
+        paths.append(path)
+    return paths
+
+
+# ------------------------------------------
+# 퓨전 stub
+# ------------------------------------------
+class _StubResponse:
+    def __init__(self, text: str):
+        part = types.SimpleNamespace(text=text)
+        content = types.SimpleNamespace(parts=[part])
+        self.candidates = [types.SimpleNamespace(content=content)]
+        self.text = text
+
+
+class _StubGenerativeModel:
+    """google.generativeai.GenerativeModel 대신 고정 JSON을 돌려주는 모델"""
+    latency_s = 0.0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return _StubResponse(json.dumps(STUB_SITUATION, ensure_ascii=False))
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        import asyncio
+
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return _StubResponse(json.dumps(STUB_SITUATION, ensure_ascii=False))
+
+
+def install_fusion_stub(latency_ms: float):
+    """module_c_fusion을 import 하기 전에 google.generativeai를 stub으로 바꿔치기 (오프라인 실행)"""
+    _StubGenerativeModel.latency_s = latency_ms / 1000.0
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = _StubGenerativeModel
+
+    try:
+        import google
+    except ImportError:
+        google = types.ModuleType("google")
+        google.__path__ = []
+        sys.modules["google"] = google
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+
+# ------------------------------------------
+# 측정
+# ------------------------------------------
+def _psutil_memory_info():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info()
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    info = _psutil_memory_info()
+    return info.rss / 2**20 if info is not None else float("nan")
+
+
+def peak_rss_mb() -> float:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 byte 단위
+        return peak / 1024 if sys.platform != "darwin" else peak / 2**20
+    # Windows: 최대 working set (psutil이 없으면 측정 안 함)
+    info = _psutil_memory_info()
+    return getattr(info, "peak_wset", info.rss) / 2**20 if info is not None else float("nan")
+
+
+def build_stage(name: str, options: dict):
+    """단계 이름 → 반복 호출할 함수 fn(i) (모델/fixture 준비는 여기서 끝냄)"""
+    if name == "speech":
+        from modules.module_a_speech import analyze_speech
+
+        return lambda i: analyze_speech(UTTERANCES_KO[i % len(UTTERANCES_KO)])
+
+    if name in ("logmel_file", "predict_file"):
+        from modules.module_b_sound import predict_audio_event, wav_to_logmel_infer
+
+        paths = options["wav_paths"]
+        fn = wav_to_logmel_infer if name == "logmel_file" else predict_audio_event
+        return lambda i: fn(paths[i % len(paths)])
+
+    if name == "logmel_waveform":
+        from modules.module_b_sound import waveform_to_logmel_infer
+
+        clips = [synthetic_audio(2.0, seed=i) for i in range(8)]
+        return lambda i: waveform_to_logmel_infer(clips[i % len(clips)])
+
+    if name == "predict_timeline":
+        from modules.module_b_sound import predict_audio_event_timeline
+
+        clip = synthetic_audio(options["clip_seconds"], seed=0)
+        return lambda i: predict_audio_event_timeline(clip)
+
+    if name == "fusion":
+        if not options["live_fusion"]:
+            install_fusion_stub(options["fusion_latency_ms"])
+        from modules.module_a_speech import analyze_speech
+        from modules.module_c_fusion import fuse_situation
+
+        speeches = [analyze_speech(text) for text in UTTERANCES_KO]
+        sounds = [
+            {"event": event, "confidence": conf}
+            for event, conf in (("낙상", 0.91), ("생활소음", 0.55), ("화재", 0.8), ("갇힘", 0.7))
+        ]
+        return lambda i: fuse_situation(speeches[i % len(speeches)], sounds[i % len(sounds)])
+
+    raise ValueError(f"알 수 없는 단계: {name}")
+
+
+def run_stage(name: str, options: dict) -> dict:
+    """단계 하나를 warmup 후 iterations번 실행하고 지연 시간 분포 / 처리량 / 메모리 반환"""
+    rss_before = current_rss_mb()
+    fn = build_stage(name, options)
+    iterations = options["iterations"]
+    if name == "fusion" and options["live_fusion"]:
+        iterations = min(iterations, options["live_fusion_iterations"])
+
+    for i in range(options["warmup"]):
+        fn(i)
+
+    latencies = np.empty(iterations)
+    start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies[i] = time.perf_counter() - t0
+    wall = time.perf_counter() - start
+
+    latencies_ms = latencies * 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 4),
+        "mean_ms": round(float(latencies_ms.mean()), 4),
+        "max_ms": round(float(latencies_ms.max()), 4),
+        "throughput_per_s": round(iterations / wall, 2),
+        "rss_start_mb": round(rss_before, 1),
+        "rss_end_mb": round(current_rss_mb(), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _run_stage_safely(name: str, options: dict) -> dict:
+    try:
+        return run_stage(name, options)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_comparison(results: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n[비교] 기준: {baseline_path} (커밋 {baseline.get('meta', {}).get('commit')})")
+    print(f"{'stage':<18} | {'p50 기준(ms)':>13} | {'p50 현재(ms)':>13} | {'변화':>8}")
+    for name, stage in results["stages"].items():
+        old = baseline.get("stages", {}).get(name, {})
+        if "p50_ms" not in stage or "p50_ms" not in old:
+            continue
+        change = (stage["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+        print(f"{name:<18} | {old['p50_ms']:>13.3f} | {stage['p50_ms']:>13.3f} | {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B/C 모듈 단계별 벤치마크")
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--iterations", type=int, default=200, help="단계별 측정 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=10, help="측정 전 warmup 반복 횟수")
+    parser.add_argument("--clip-seconds", type=float, default=30.0,
+                        help="predict_timeline 단계의 합성 클립 길이 (초)")
+    parser.add_argument("--fusion-latency-ms", type=float, default=0.0,
+                        help="stub 퓨전의 인위적 응답 지연 (네트워크 흉내)")
+    parser.add_argument("--live-fusion", action="store_true",
+                        help="stub 대신 실제 Gemini 호출 (GEMINI_API_KEY 필요)")
+    parser.add_argument("--live-fusion-iterations", type=int, default=10,
+                        help="--live-fusion일 때 최대 반복 횟수 (API 사용량 제한)")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="모든 단계를 한 프로세스에서 실행 (peak RSS가 누적됨)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench_results/pipeline_<커밋>.json)")
+    parser.add_argument("--compare", help="이전 결과 JSON과 p50 비교")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = args.output or str(PROJECT_ROOT / "bench_results" / f"pipeline_{commit}.json")
+
+    print("=" * 60)
+    print(f"A/B/C 파이프라인 벤치마크 (커밋 {commit})")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as fixture_dir:
+        options = {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "clip_seconds": args.clip_seconds,
+            "fusion_latency_ms": args.fusion_latency_ms,
+            "live_fusion": args.live_fusion,
+            "live_fusion_iterations": args.live_fusion_iterations,
+            "wav_paths": write_wav_fixtures(fixture_dir, count=8, seconds=2.0),
+        }
+
+        stages = {}
+        for name in args.stages:
+            print(f"\n▶ {name} ...")
+            if args.no_isolate:
+                result = _run_stage_safely(name, options)
+            else:
+                # 단계마다 새 프로세스 → peak RSS가 그 단계만의 값이 됨
+                context = multiprocessing.get_context("spawn")
+                with context.Pool(1) as pool:
+                    result = pool.apply(_run_stage_safely, (name, options))
+            stages[name] = result
+            if "error" in result:
+                print(f"  ❌ {result['error']}")
+            else:
+                print(f"  p50 {result['p50_ms']:.3f} ms | p95 {result['p95_ms']:.3f} ms | "
+                      f"p99 {result['p99_ms']:.3f} ms | {result['throughput_per_s']:.1f}/s | "
+                      f"peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "isolated": not args.no_isolate,
+            "fusion_backend": "gemini" if args.live_fusion else "stub",
+            "options": {k: v for k, v in options.items() if k != "wav_paths"},
+        },
+        "stages": stages,
+    }
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+B 모듈 log-mel 프론트엔드 검증 스크립트
+LogMelFrontend 결과가 기존 librosa 처리(melspectrogram → power_to_db(ref=np.max) → 표준화)와
+허용 오차 이내로 같은지 확인하고, 배치 크기별 속도를 비교한다.
+
+사용법:
+    python scripts/check_logmel_frontend.py
+    python scripts/check_logmel_frontend.py --batch 1 16 64 --tolerance 1e-3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+
+# 프로젝트 루트 경로 추가 (modules import용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.module_b_sound import (  # noqa: E402
+    DURATION,
+    HOP_LENGTH,
+    N_FFT,
+    N_MELS,
+    SR,
+    LogMelFrontend,
+)
+
+
+def librosa_logmel(y: np.ndarray) -> np.ndarray:
+    """기존 wav_to_logmel_infer의 librosa 처리 (비교 기준)"""
+    mel = librosa.feature.melspectrogram(
+        y=y, sr=SR, n_fft=N_FFT, hop_length=HOP_LENGTH, n_mels=N_MELS
+    )
+    log_mel = librosa.power_to_db(mel, ref=np.max)
+    log_mel = (log_mel - log_mel.mean()) / (log_mel.std() + 1e-6)
+    return log_mel.astype(np.float32)
+
+
+def make_inputs(n: int, rng: np.random.Generator) -> np.ndarray:
+    """잡음 / 사인파 / 무음 / 임펄스가 섞인 2초 파형 배치"""
+    length = int(SR * DURATION)
+    t = np.arange(length) / SR
+    waves = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            y = rng.standard_normal(length) * 0.1
+        elif kind == 1:
+            y = 0.5 * np.sin(2 * np.pi * rng.uniform(100, 4000) * t)
+        elif kind == 2:
+            y = np.zeros(length)
+        else:
+            y = np.zeros(length)
+            y[rng.integers(0, length)] = 1.0
+        waves.append(y)
+    return np.stack(waves).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LogMelFrontend vs librosa 검증")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=1e-3,
+                        help="표준화된 log-mel 최대 절대 오차 허용치")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frontend = LogMelFrontend()
+
+    print("=" * 60)
+    print("LogMelFrontend 검증")
+    print("=" * 60)
+
+    # 1) 정확도
+    waves = make_inputs(32, rng)
+    expected = np.stack([librosa_logmel(y) for y in waves])
+    actual = frontend.log_mel(waves)
+    max_diff = float(np.max(np.abs(actual - expected)))
+    print(f"\n출력 shape: {actual.shape} (librosa: {expected.shape})")
+    print(f"최대 절대 오차: {max_diff:.2e} (허용치 {args.tolerance:.0e})")
+
+    # 2) 속도
+    print(f"\n{'batch':>6} | {'librosa(ms)':>12} | {'frontend(ms)':>12} | {'speedup':>7}")
+    for batch in args.batch:
+        waves = make_inputs(batch, rng)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            [librosa_logmel(y) for y in waves]
+        librosa_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            frontend.log_mel(waves)
+        frontend_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+        print(f"{batch:>6} | {librosa_ms:>12.2f} | {frontend_ms:>12.2f} | {librosa_ms / frontend_ms:>6.1f}x")
+
+    if max_diff > args.tolerance:
+        print("\n❌ 허용 오차를 넘었습니다.")
+        sys.exit(1)
+    print("\n✅ librosa 결과와 일치합니다.")
+
+
+if __name__ == "__main__":
+    main()
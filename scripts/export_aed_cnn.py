@@ -0,0 +1,136 @@
+"""
+B 모듈 SimpleCNN export 스크립트
+BatchNorm을 앞의 conv에 합친(folding) 뒤 TorchScript로 trace + freeze 하여
+aed_cnn_final_trainaug_fin.pth 옆에 aed_cnn_final_trainaug_fin.ts.pt로 저장한다.
+저장 후 eager 모델과 출력이 같은지 확인하고, 윈도우당 CPU 지연 시간을 비교한다.
+
+서버에서 사용하려면 환경변수 AED_INFERENCE_MODE=torchscript 로 설정.
+(_load_model은 .ts.pt가 .pth보다 새로울 때만 사용, .pth를 다시 학습했다면 이 스크립트를 다시 실행)
+CPU / 배치 크기에 따라 eager보다 느릴 수 있으므로 아래 배치별 지연 시간을 보고 켤지 정한다.
+(predict_audio_events는 WINDOW_BATCH_SIZE 단위 배치, 실시간 경로는 작은 배치)
+
+사용법:
+    python scripts/export_aed_cnn.py
+    python scripts/export_aed_cnn.py --weights other.pth --output other.ts.pt --repeat 200
+"""
+import argparse
+import copy
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+# 프로젝트 루트 경로 추가 (modules import용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.module_b_sound import (  # noqa: E402
+    DURATION,
+    HOP_LENGTH,
+    MODEL_PATH,
+    N_MELS,
+    SCRIPTED_MODEL_PATH,
+    SR,
+    SimpleCNN,
+)
+
+# 2초 윈도우의 log-mel 프레임 수 (center=True STFT)
+N_FRAMES = int(SR * DURATION) // HOP_LENGTH + 1
+
+
+def fold_batchnorm(model: SimpleCNN) -> SimpleCNN:
+    """eval 모드 SimpleCNN의 conv+BN 쌍을 하나의 conv로 합친 복사본 (BN은 Identity로 교체)"""
+    fused = copy.deepcopy(model).eval()
+    for conv_name, bn_name in (("conv1", "bn1"), ("conv2", "bn2"), ("conv3", "bn3")):
+        conv = getattr(fused, conv_name)
+        bn = getattr(fused, bn_name)
+        setattr(fused, conv_name, fuse_conv_bn_eval(conv, bn))
+        setattr(fused, bn_name, nn.Identity())
+    return fused
+
+
+def export_torchscript(model: SimpleCNN, output_path: str) -> torch.jit.ScriptModule:
+    """BN folding → trace → freeze 후 저장 (배치 크기는 가변)"""
+    fused = fold_batchnorm(model)
+    example = torch.randn(2, 1, N_MELS, N_FRAMES)
+    with torch.no_grad():
+        traced = torch.jit.trace(fused, example)
+    frozen = torch.jit.freeze(traced)
+    frozen.save(output_path)
+    return frozen
+
+
+def median_latency_ms(model, x: torch.Tensor, repeat: int) -> float:
+    """forward 한 번의 median 지연 시간 (ms)"""
+    timings = []
+    with torch.no_grad():
+        for _ in range(5):  # warmup
+            model(x)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            model(x)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SimpleCNN BN folding + TorchScript export")
+    parser.add_argument("--weights", default=MODEL_PATH, help="학습된 state_dict (.pth)")
+    parser.add_argument("--output", default=SCRIPTED_MODEL_PATH, help="저장할 TorchScript 경로")
+    parser.add_argument("--repeat", type=int, default=100, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16, 64],
+                        help="지연 시간을 측정할 윈도우 배치 크기")
+    parser.add_argument("--atol", type=float, default=1e-4, help="출력 비교 허용 오차")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SimpleCNN export (BN folding + TorchScript)")
+    print("=" * 60)
+
+    if not Path(args.weights).exists():
+        print(f"❌ 가중치 파일을 찾을 수 없습니다: {args.weights}")
+        sys.exit(1)
+
+    torch.set_grad_enabled(False)
+    model = SimpleCNN(n_classes=4)
+    model.load_state_dict(torch.load(args.weights, map_location="cpu"))
+    model.eval()
+
+    exported = export_torchscript(model, args.output)
+    print(f"\n✅ 저장 완료: {args.output}")
+
+    # 1) 출력 비교 (저장한 파일을 다시 로드해서 확인)
+    reloaded = torch.jit.load(args.output, map_location="cpu")
+    x = torch.randn(64, 1, N_MELS, N_FRAMES)
+    eager_logits = model(x)
+    exported_logits = reloaded(x)
+    max_diff = float((eager_logits - exported_logits).abs().max())
+    same_top1 = bool((eager_logits.argmax(1) == exported_logits.argmax(1)).all())
+    print(f"\n최대 logit 오차: {max_diff:.2e} (허용치 {args.atol:.0e}), top-1 일치: {same_top1}")
+
+    # 2) 윈도우당 CPU 지연 시간
+    print(f"\n{'batch':>6} | {'eager(ms/win)':>14} | {'export(ms/win)':>14} | {'speedup':>7}")
+    slower = []
+    for batch in args.batch:
+        xb = torch.randn(batch, 1, N_MELS, N_FRAMES)
+        eager_ms = median_latency_ms(model, xb, args.repeat) / batch
+        export_ms = median_latency_ms(exported, xb, args.repeat) / batch
+        print(f"{batch:>6} | {eager_ms:>14.4f} | {export_ms:>14.4f} | {eager_ms / export_ms:>6.2f}x")
+        if export_ms > eager_ms:
+            slower.append(batch)
+
+    if max_diff > args.atol or not same_top1:
+        print("\n❌ export 모델 출력이 eager 모델과 다릅니다. 저장된 파일을 삭제하세요.")
+        sys.exit(1)
+    print("\n✅ eager 모델과 출력이 일치합니다.")
+    if slower:
+        print(f"⚠️  batch {slower}에서 eager보다 느립니다. 해당 배치를 주로 쓰면 AED_INFERENCE_MODE=float 유지")
+    else:
+        print("   측정한 모든 배치에서 빠릅니다. 사용하려면 AED_INFERENCE_MODE=torchscript")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+A 모듈 대량 라벨링 스크립트
+STT 전사 JSONL을 한 줄씩 읽어서 analyze_speech 결과를 붙인 JSONL로 내보낸다.
+(입력 전체를 메모리에 올리지 않으므로 수십만 건도 그대로 스트리밍)
+
+입력 한 줄:  {"id": ..., "text": "할머니가 쓰러졌어요", ...}
+출력 한 줄:  입력 레코드 + "speech": {"disaster_large", "disaster_medium", "urgency_level",
+                                      "sentiment", "intent", "intents"}
+잘못된 줄 (JSON이 아니거나 object가 아님): {"line": 줄 번호, "error": 메시지} (멈추지 않고 계속 진행)
+
+사용법:
+    python scripts/label_speech_jsonl.py calls.jsonl labeled.jsonl
+    python scripts/label_speech_jsonl.py calls.jsonl - --text-field transcript --no-intents
+    cat calls.jsonl | python scripts/label_speech_jsonl.py - - > labeled.jsonl
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가 (modules import용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.module_a_speech import analyze_speech_jsonl  # noqa: E402
+
+
+def open_stream(path: str, mode: str):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 전사 JSONL → A 모듈 라벨 JSONL")
+    parser.add_argument("input", help="입력 JSONL 경로 (-면 stdin)")
+    parser.add_argument("output", help="출력 JSONL 경로 (-면 stdout)")
+    parser.add_argument("--text-field", default="text", help="STT 텍스트가 들어있는 필드 이름")
+    parser.add_argument("--no-intents", action="store_true",
+                        help="intent 목록(intents) 없이 대표 intent만 (더 빠름)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    src = open_stream(args.input, "r")
+    dst = open_stream(args.output, "w")
+    try:
+        stats = analyze_speech_jsonl(src, dst, text_field=args.text_field, with_intents=not args.no_intents)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - start
+
+    # 진행 메시지는 stderr로 (stdout으로 JSONL을 내보낼 수 있도록)
+    count = stats["labeled"]
+    print(f"✅ {count}건 라벨링 완료 ({elapsed:.2f}초, {count / max(elapsed, 1e-9):.0f}건/초)", file=sys.stderr)
+    if stats["errors"]:
+        print(f"⚠️  잘못된 줄 {stats['errors']}개 (출력에 {{\"line\", \"error\"}} 레코드로 기록)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+B 모듈 SimpleCNN int8 양자화 스크립트
+calibration 오디오의 log-mel로 정적 int8 양자화(conv+bn+relu fusion, per-channel weight)를 한 뒤
+aed_cnn_final_trainaug_fin.int8.pt로 저장하고, 별도 평가 세트에서 float 모델과 비교한
+정확도 / 지연 시간 / 메모리 리포트를 출력한다.
+
+서버에서 사용하려면 환경변수 AED_INFERENCE_MODE=int8 로 설정.
+
+오디오 폴더는 하위 폴더 이름이 클래스(낙상/화재/갇힘/생활소음)이면 정답 라벨로 사용한다.
+    data/낙상/001.wav, data/생활소음/002.wav ...
+
+사용법:
+    python scripts/quantize_aed_cnn.py --calib-dir data/calib --eval-dir data/heldout
+    python scripts/quantize_aed_cnn.py --calib-dir data/all            # 클래스별로 섞어서 80:20으로 나눠 사용
+    python scripts/quantize_aed_cnn.py --synthetic 256                 # 데이터 없이 동작 확인용
+    python scripts/quantize_aed_cnn.py --calib-dir data/all --json report.json
+"""
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import torch
+
+try:
+    import resource  # Unix 전용 (Windows는 psutil이 있으면 사용)
+except ImportError:
+    resource = None
+
+# 프로젝트 루트 경로 추가 (modules import용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.module_b_sound import (  # noqa: E402
+    CLASS_TO_IDX,
+    MODEL_PATH,
+    QUANTIZED_MODEL_PATH,
+    SR,
+    LogMelFrontend,
+    QuantizableSimpleCNN,
+    SimpleCNN,
+    split_windows,
+)
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg"}
+
+
+# ------------------------------------------
+# 데이터
+# ------------------------------------------
+def list_audio_files(directory: str):
+    return sorted(
+        p for p in Path(directory).rglob("*") if p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def split_files(files, ratio: float = 0.8, seed: int = 0):
+    """
+    클래스(상위 폴더)별로 섞은 뒤 ratio만큼 calibration, 나머지를 평가로 나눈다.
+    (정렬된 목록을 그대로 자르면 마지막 클래스만 평가 세트에 들어가고 calibration에서는 빠짐)
+    """
+    by_class = {}
+    for path in files:
+        by_class.setdefault(path.parent.name, []).append(path)
+
+    rng = random.Random(seed)
+    calib, held_out = [], []
+    for name in sorted(by_class):
+        group = by_class[name]
+        rng.shuffle(group)
+        # 파일이 2개 이상이면 양쪽에 최소 하나씩
+        split = min(max(1, round(len(group) * ratio)), len(group) - 1) if len(group) > 1 else 1
+        calib.extend(group[:split])
+        held_out.extend(group[split:])
+    return calib, held_out
+
+
+def load_logmels(files, frontend: LogMelFrontend):
+    """오디오 파일 → 2초 슬라이딩 윈도우 log-mel (N, 1, 64, T) + 라벨 (폴더 이름, 없으면 -1)"""
+    features, labels = [], []
+    for path in files:
+        y, _ = librosa.load(str(path), sr=SR, mono=True)
+        _, windows = split_windows(y)
+        features.append(frontend.log_mel(windows))
+        labels.extend([CLASS_TO_IDX.get(path.parent.name, -1)] * len(windows))
+    x = torch.from_numpy(np.concatenate(features)).unsqueeze(1)
+    return x, np.array(labels)
+
+
+def synthetic_logmels(n: int, frontend: LogMelFrontend, seed: int):
+    """데이터가 없을 때 동작 확인용 (잡음 + 사인파 + 임펄스 파형)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(2 * SR) / SR
+    waves = []
+    for i in range(n):
+        y = rng.standard_normal(len(t)) * rng.uniform(0.01, 0.3)
+        if i % 2:
+            y += 0.5 * np.sin(2 * np.pi * rng.uniform(200, 3000) * t)
+        if i % 3 == 0:
+            y[rng.integers(0, len(t))] += 1.0
+        waves.append(y)
+    x = torch.from_numpy(frontend.log_mel(np.stack(waves).astype(np.float32))).unsqueeze(1)
+    return x, np.full(n, -1)
+
+
+# ------------------------------------------
+# 양자화
+# ------------------------------------------
+def quantize(weights: str, calib_x: torch.Tensor, engine: str, batch_size: int = 64):
+    """float 가중치 → fusion → observer로 calibration → int8 변환"""
+    torch.backends.quantized.engine = engine
+
+    model = QuantizableSimpleCNN(n_classes=4)
+    model.load_state_dict(torch.load(weights, map_location="cpu"))
+    model.eval()
+    model.fuse_model()
+    model.qconfig = torch.ao.quantization.get_default_qconfig(engine)
+    torch.ao.quantization.prepare(model, inplace=True)
+
+    with torch.no_grad():
+        for i in range(0, len(calib_x), batch_size):
+            model(calib_x[i:i + batch_size])
+
+    torch.ao.quantization.convert(model, inplace=True)
+    return model
+
+
+def save_quantized(model, example: torch.Tensor, output: str, engine: str):
+    """TorchScript로 저장 (로드 시 같은 엔진을 쓰도록 extra file에 기록)"""
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(model, example))
+    traced.save(output, _extra_files={"quantized_engine": engine})
+    return traced
+
+
+# ------------------------------------------
+# 리포트
+# ------------------------------------------
+def predict(model, x: torch.Tensor, batch_size: int = 64) -> np.ndarray:
+    probs = []
+    with torch.no_grad():
+        for i in range(0, len(x), batch_size):
+            probs.append(torch.softmax(model(x[i:i + batch_size]), dim=1).numpy())
+    return np.concatenate(probs)
+
+
+def latency_ms_per_window(model, x: torch.Tensor, repeat: int) -> float:
+    timings = []
+    with torch.no_grad():
+        for _ in range(5):  # warmup
+            model(x)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            model(x)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings) / len(x)
+
+
+def serialized_mb(obj) -> float:
+    buffer = io.BytesIO()
+    if isinstance(obj, torch.jit.ScriptModule):
+        torch.jit.save(obj, buffer)
+    else:
+        torch.save(obj.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+
+def _psutil_memory_info():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info()
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    info = _psutil_memory_info()
+    return info.rss / 2**20 if info is not None else float("nan")
+
+
+def peak_rss_mb() -> float:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 byte 단위
+        return peak / 1024 if sys.platform != "darwin" else peak / 2**20
+    # Windows: 최대 working set (psutil이 없으면 측정 안 함)
+    info = _psutil_memory_info()
+    return getattr(info, "peak_wset", info.rss) / 2**20 if info is not None else float("nan")
+
+
+def rss_increase_mb(model, x: torch.Tensor) -> float:
+    """배치 forward 한 번 동안 늘어난 RSS (활성화 메모리 근사)"""
+    before = current_rss_mb()
+    with torch.no_grad():
+        model(x)
+    return max(0.0, current_rss_mb() - before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SimpleCNN int8 정적 양자화 + 리포트")
+    parser.add_argument("--weights", default=MODEL_PATH, help="학습된 float state_dict (.pth)")
+    parser.add_argument("--output", default=QUANTIZED_MODEL_PATH, help="저장할 int8 모델 경로")
+    parser.add_argument("--calib-dir", help="calibration 오디오 폴더")
+    parser.add_argument("--eval-dir", help="평가(held-out) 오디오 폴더 (없으면 calib 파일의 20%%)")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="오디오 폴더 대신 합성 파형 N개로 calibration/평가 (동작 확인용)")
+    parser.add_argument("--engine", default=torch.backends.quantized.engine,
+                        choices=torch.backends.quantized.supported_engines,
+                        help="양자화 엔진 (x86/fbgemm: 서버 CPU, qnnpack: ARM 엣지 기기)")
+    parser.add_argument("--seed", type=int, default=0, help="--eval-dir 없이 나눌 때 섞는 seed")
+    parser.add_argument("--repeat", type=int, default=50, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--json", help="리포트를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SimpleCNN int8 양자화")
+    print("=" * 60)
+
+    if not Path(args.weights).exists():
+        print(f"❌ 가중치 파일을 찾을 수 없습니다: {args.weights}")
+        sys.exit(1)
+
+    torch.set_grad_enabled(False)
+    frontend = LogMelFrontend()
+
+    # 1) calibration / 평가 데이터
+    if args.calib_dir:
+        calib_files = list_audio_files(args.calib_dir)
+        if args.eval_dir:
+            eval_files = list_audio_files(args.eval_dir)
+        else:
+            calib_files, eval_files = split_files(calib_files, seed=args.seed)
+        if not calib_files or not eval_files:
+            print("❌ calibration / 평가 오디오 파일이 부족합니다.")
+            sys.exit(1)
+        calib_x, _ = load_logmels(calib_files, frontend)
+        eval_x, eval_y = load_logmels(eval_files, frontend)
+    elif args.synthetic > 0:
+        calib_x, _ = synthetic_logmels(args.synthetic, frontend, seed=0)
+        eval_x, eval_y = synthetic_logmels(max(1, args.synthetic // 4), frontend, seed=1)
+    else:
+        print("❌ --calib-dir 또는 --synthetic 중 하나를 지정하세요.")
+        sys.exit(1)
+    print(f"\ncalibration 윈도우: {len(calib_x)}개 / 평가 윈도우: {len(eval_x)}개 (엔진: {args.engine})")
+
+    # 2) 양자화 + 저장
+    float_model = SimpleCNN(n_classes=4)
+    float_model.load_state_dict(torch.load(args.weights, map_location="cpu"))
+    float_model.eval()
+
+    int8_model = quantize(args.weights, calib_x, args.engine)
+    int8_model = save_quantized(int8_model, eval_x[:2], args.output, args.engine)
+    print(f"✅ 저장 완료: {args.output}")
+
+    # 3) 정확도 (float 모델 대비 + 정답 라벨이 있으면 라벨 대비)
+    float_probs = predict(float_model, eval_x)
+    int8_probs = predict(int8_model, eval_x)
+    float_top1 = float_probs.argmax(1)
+    int8_top1 = int8_probs.argmax(1)
+    report = {
+        "engine": args.engine,
+        "calibration_windows": int(len(calib_x)),
+        "eval_windows": int(len(eval_x)),
+        "top1_agreement": round(float((float_top1 == int8_top1).mean()), 4),
+        "max_prob_diff": round(float(np.abs(float_probs - int8_probs).max()), 5),
+    }
+    labeled = eval_y >= 0
+    if labeled.any():
+        report["labeled_windows"] = int(labeled.sum())
+        report["accuracy_float"] = round(float((float_top1[labeled] == eval_y[labeled]).mean()), 4)
+        report["accuracy_int8"] = round(float((int8_top1[labeled] == eval_y[labeled]).mean()), 4)
+
+    # 4) 지연 시간 (윈도우당, 단일 / 배치) + 메모리
+    for batch in (1, 64):
+        xb = eval_x[:batch] if len(eval_x) >= batch else eval_x.repeat(batch // len(eval_x) + 1, 1, 1, 1)[:batch]
+        report[f"latency_ms_per_window_b{batch}_float"] = round(latency_ms_per_window(float_model, xb, args.repeat), 4)
+        report[f"latency_ms_per_window_b{batch}_int8"] = round(latency_ms_per_window(int8_model, xb, args.repeat), 4)
+        if batch == 64:
+            report["activation_rss_mb_b64_float"] = round(rss_increase_mb(float_model, xb), 2)
+            report["activation_rss_mb_b64_int8"] = round(rss_increase_mb(int8_model, xb), 2)
+    report["model_size_mb_float"] = round(serialized_mb(float_model), 3)
+    report["model_size_mb_int8"] = round(os.path.getsize(args.output) / 2**20, 3)
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+
+    print("\n[리포트]")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 리포트 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
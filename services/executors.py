@@ -0,0 +1,60 @@
+# services/executors.py
+# 단계별 전용 스레드 풀 - CPU를 쓰는 단계(STT, 사운드 CNN, RAG 검색)를
+# AnyIO 기본 스레드풀과 분리해서 실행한다.
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from services.runtime_config import DEFAULT_STAGE_WORKERS
+
+# 단계별 워커 수 (기본값은 워커당 코어 수에서 계산, 환경변수로 조정 가능)
+STAGE_WORKERS: Dict[str, int] = {
+    # 업로드 디코딩 (ffmpeg 파이프 쓰기/대기, 디스크 fallback의 오디오 추출)
+    "media": int(os.getenv("MEDIA_EXECUTOR_WORKERS", DEFAULT_STAGE_WORKERS["media"])),
+    # Whisper 배치 스케줄러 결과를 기다리는 스레드 (실제 디코딩은 스케줄러 워커가 수행)
+    "stt": int(os.getenv("STT_EXECUTOR_WORKERS", DEFAULT_STAGE_WORKERS["stt"])),
+    # B 모듈 log-mel + CNN forward
+    "sound": int(os.getenv("SOUND_EXECUTOR_WORKERS", DEFAULT_STAGE_WORKERS["sound"])),
+    # RAG 초기화 / 벡터 검색 (임베딩 계산)
+    "rag": int(os.getenv("RAG_EXECUTOR_WORKERS", DEFAULT_STAGE_WORKERS["rag"])),
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(stage: str) -> ThreadPoolExecutor:
+    """단계 이름에 해당하는 전용 스레드 풀 (처음 요청될 때 생성)"""
+    executor = _executors.get(stage)
+    if executor is not None:
+        return executor
+
+    with _executors_lock:
+        executor = _executors.get(stage)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, STAGE_WORKERS.get(stage, 2)),
+                thread_name_prefix=f"{stage}-stage",
+            )
+            _executors[stage] = executor
+    return executor
+
+
+async def run_in_stage(stage: str, fn: Callable, *args, **kwargs):
+    """동기 함수를 해당 단계의 전용 스레드 풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(stage), functools.partial(fn, *args, **kwargs)
+    )
+
+
+def shutdown_executors():
+    """서버 종료 시 모든 단계 스레드 풀 정리"""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
@@ -96,14 +96,8 @@ class ChatGoogleGenerativeAI(BaseChatModel):
     def _llm_type(self) -> str:
         return "google_generative_ai"
     
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        **kwargs: Any
-    ) -> ChatResult:
-        """메시지 생성"""
-        # LangChain 메시지를 Gemini 형식으로 변환
+    def _to_prompt(self, messages: List[BaseMessage]) -> str:
+        """LangChain 메시지를 Gemini 프롬프트 문자열로 변환"""
         prompt_parts = []
         for msg in messages:
             if isinstance(msg, SystemMessage):
@@ -115,50 +109,81 @@ class ChatGoogleGenerativeAI(BaseChatModel):
             else:
                 prompt_parts.append(str(msg.content))
         
-        full_prompt = "\n".join(prompt_parts)
-        
-        # Gemini 호출
+        return "\n".join(prompt_parts)
+    
+    def _generation_config(self, stop: Optional[List[str]] = None):
         generation_config = genai.types.GenerationConfig(
             temperature=self.temperature
         )
         if stop:
             generation_config.stop_sequences = stop
-        
-        try:
-            response = self._client.generate_content(
-                full_prompt,
-                generation_config=generation_config
-            )
-            # 응답 텍스트 추출
-            if hasattr(response, 'text') and response.text:
-                text = response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                text = response.candidates[0].content.parts[0].text
-            else:
-                raise ValueError("Gemini API에서 응답을 받을 수 없습니다.")
-        except Exception as e:
-            logger.error(f"Gemini API 호출 오류: {e}")
-            raise
+        return generation_config
+    
+    @staticmethod
+    def _to_result(response) -> ChatResult:
+        """Gemini 응답에서 텍스트를 꺼내 LangChain ChatResult로 변환"""
+        if hasattr(response, 'text') and response.text:
+            text = response.text
+        elif hasattr(response, 'candidates') and response.candidates:
+            text = response.candidates[0].content.parts[0].text
+        else:
+            raise ValueError("Gemini API에서 응답을 받을 수 없습니다.")
         
         return ChatResult(
             generations=[ChatGeneration(message=AIMessage(content=text))]
         )
     
-    def invoke(self, input, **kwargs):
-        """단순 호출 인터페이스"""
+    @staticmethod
+    def _to_messages(input) -> List[BaseMessage]:
         # ChatPromptTemplate의 format_messages 결과를 처리
         if isinstance(input, list):
-            messages = input
+            return input
         elif isinstance(input, BaseMessage):
-            messages = [input]
+            return [input]
         else:
             # 문자열인 경우
-            messages = [HumanMessage(content=str(input))]
-        
-        result = self._generate(messages, **kwargs)
+            return [HumanMessage(content=str(input))]
+    
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        """메시지 생성"""
+        try:
+            response = self._client.generate_content(
+                self._to_prompt(messages),
+                generation_config=self._generation_config(stop)
+            )
+            return self._to_result(response)
+        except Exception as e:
+            logger.error(f"Gemini API 호출 오류: {e}")
+            raise
+    
+    def invoke(self, input, **kwargs):
+        """단순 호출 인터페이스"""
+        result = self._generate(self._to_messages(input), **kwargs)
         return result.generations[0].message
     
-    async def _agenerate(self, messages, **kwargs):
-        """비동기 생성 (선택적)"""
-        return self._generate(messages, **kwargs)
-
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        """비동기 생성 (응답을 기다리는 동안 스레드를 점유하지 않음)"""
+        try:
+            response = await self._client.generate_content_async(
+                self._to_prompt(messages),
+                generation_config=self._generation_config(stop)
+            )
+            return self._to_result(response)
+        except Exception as e:
+            logger.error(f"Gemini API 호출 오류: {e}")
+            raise
+    
+    async def ainvoke(self, input, **kwargs):
+        """단순 비동기 호출 인터페이스"""
+        result = await self._agenerate(self._to_messages(input), **kwargs)
+        return result.generations[0].message
@@ -2,6 +2,7 @@
 RAG 기반 응급 지침 생성 모듈
 상황 정보를 받아서 관련 지침을 검색하고 LLM으로 맞춤형 지침 생성
 """
+import asyncio
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -362,6 +363,39 @@ class GuidelineGenerator:
                 "steps": ["1단계", "2단계"]
             }
         """
+        prepared = self._prepare_generation(situation_info, additional_context)
+        response = self.llm.invoke(prepared["prompt"])
+        return self._build_result(response.content, prepared)
+    
+    async def agenerate_guideline(
+        self,
+        situation_info: Dict,
+        additional_context: str = "",
+        executor=None
+    ) -> Dict:
+        """
+        generate_guideline의 비동기 버전.
+        
+        문서 검색(임베딩 계산)은 executor 스레드에서 실행하고,
+        LLM 호출은 ainvoke로 await 하여 응답 대기 중 스레드를 점유하지 않는다.
+        
+        Args:
+            situation_info: generate_guideline과 동일
+            additional_context: generate_guideline과 동일
+            executor: 검색을 실행할 concurrent.futures.Executor (None이면 기본 executor)
+        
+        Returns:
+            generate_guideline과 동일한 딕셔너리
+        """
+        loop = asyncio.get_running_loop()
+        prepared = await loop.run_in_executor(
+            executor, self._prepare_generation, situation_info, additional_context
+        )
+        response = await self.llm.ainvoke(prepared["prompt"])
+        return self._build_result(response.content, prepared)
+    
+    def _prepare_generation(self, situation_info: Dict, additional_context: str = "") -> Dict:
+        """검색 쿼리 생성 → 문서 검색 → 프롬프트 구성 (LLM 호출 전까지의 단계)"""
         # 상황 정보 추출
         situation_id = situation_info.get("situation_id", "S0")
         emergency_level = situation_info.get("emergency_level", "low")
@@ -550,9 +584,15 @@ class GuidelineGenerator:
             context=context if context.strip() else "관련 전문 문서를 찾지 못했습니다. 일반 응급처치 지침을 제공합니다."
         )
         
-        response = self.llm.invoke(prompt)
-        guideline_text = response.content
-        
+        return {
+            "prompt": prompt,
+            "sources": sources,
+            "disaster_type": disaster_type,
+            "urgency_level": urgency_level
+        }
+    
+    def _build_result(self, guideline_text: str, prepared: Dict) -> Dict:
+        """LLM 응답 텍스트를 결과 딕셔너리로 정리"""
         # 지침 파싱 (단계별로 분리)
         steps = self._parse_guideline_steps(guideline_text)
         report_message = self._extract_report_message(guideline_text)
@@ -560,10 +600,10 @@ class GuidelineGenerator:
         return {
             "guideline": guideline_text,
             "report_message": report_message,
-            "sources": sources,
+            "sources": prepared["sources"],
             "steps": steps,
-            "disaster_type": disaster_type,
-            "urgency_level": urgency_level
+            "disaster_type": prepared["disaster_type"],
+            "urgency_level": prepared["urgency_level"]
         }
     
     def _parse_guideline_steps(self, guideline_text: str) -> List[str]:
@@ -152,6 +152,29 @@ class RAGSystem:
             chat_history=chat_history
         )
     
+    async def agenerate_guideline(
+        self,
+        situation_info: Dict,
+        additional_context: str = "",
+        executor=None
+    ) -> Dict:
+        """
+        응급 지침 생성 (비동기)
+        
+        Args:
+            situation_info: generate_guideline과 동일
+            additional_context: 추가 상황 설명
+            executor: 문서 검색을 실행할 Executor (None이면 이벤트 루프 기본 executor)
+        
+        Returns:
+            생성된 지침 딕셔너리
+        """
+        return await self.guideline_generator.agenerate_guideline(
+            situation_info=situation_info,
+            additional_context=additional_context,
+            executor=executor
+        )
+    
     def search_documents(self, query: str, k: int = 4) -> List:
         """문서 검색 (디버깅 및 테스트용)"""
         return self.embedding_store.similarity_search(query, k=k)
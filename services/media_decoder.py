@@ -0,0 +1,236 @@
+# services/media_decoder.py
+# 미디어 디코더 - 업로드된 파일을 16kHz mono float32 PCM 배열로 한 번만 디코딩
+
+import os
+import shutil
+import subprocess
+import threading
+import logging
+from typing import Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# A 모듈(Whisper)과 B 모듈(AED CNN)이 모두 기대하는 샘플링 레이트
+SAMPLE_RATE = 16000
+
+# stdin으로 받은 바이트를 디코딩할 때 ffmpeg 입력 이름
+PIPE_INPUT = "pipe:0"
+
+
+_ffmpeg_binary: Optional[str] = None
+
+
+def get_ffmpeg_binary() -> str:
+    """
+    ffmpeg 실행 파일 경로.
+    FFMPEG_BINARY 환경변수 → PATH의 ffmpeg → imageio-ffmpeg 번들 바이너리 순으로 찾는다.
+    (어디에도 없으면 "ffmpeg"를 반환하고, 실행 시 FileNotFoundError가 난다)
+    """
+    global _ffmpeg_binary
+    if _ffmpeg_binary is None:
+        binary = os.getenv("FFMPEG_BINARY") or shutil.which("ffmpeg")
+        if not binary:
+            try:
+                import imageio_ffmpeg
+                binary = imageio_ffmpeg.get_ffmpeg_exe()
+            except (ImportError, RuntimeError):
+                binary = "ffmpeg"
+        _ffmpeg_binary = binary
+    return _ffmpeg_binary
+
+
+def _ffmpeg_input_args(source: str) -> list:
+    """입력 + 오디오 스트림만 demux 하는 공통 인자 (영상/자막/데이터 스트림은 열지 않음)"""
+    # 파일 입력일 때는 stdin을 읽지 않도록 -nostdin, 파이프 입력일 때는 stdin이 곧 입력
+    stdin_flag = [] if source == PIPE_INPUT else ["-nostdin"]
+    return [
+        get_ffmpeg_binary(),
+        *stdin_flag,
+        "-hide_banner",
+        "-nostats",
+        "-loglevel", "error",
+        "-threads", "0",
+        "-i", source,
+        "-map", "0:a:0",
+        "-vn", "-sn", "-dn",
+    ]
+
+
+def _ffmpeg_pcm_command(source: str, sr: int) -> list:
+    """ffmpeg로 첫 번째 오디오 트랙만 mono s16le PCM으로 stdout에 쓰는 명령어 (Whisper load_audio와 동일한 변환)"""
+    return [
+        *_ffmpeg_input_args(source),
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sr),
+        "-",
+    ]
+
+
+def _pcm16_to_float32(raw) -> np.ndarray:
+    """s16le 바이트 → [-1, 1] float32 배열 (쓰기 가능한 새 배열 한 개만 생성)"""
+    pcm = np.frombuffer(raw, np.int16).astype(np.float32)
+    pcm /= 32768.0
+    return pcm
+
+
+def decode_audio_file(path: str, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    오디오/영상 파일을 16kHz mono float32 배열로 디코딩.
+
+    ffmpeg를 사용하며, ffmpeg가 없으면 librosa로 대체한다.
+    반환된 배열은 STT와 사운드 CNN이 그대로 공유한다 (추가 복사/재디코딩 없음).
+    """
+    try:
+        out = subprocess.run(
+            _ffmpeg_pcm_command(path, sr),
+            capture_output=True,
+            check=True,
+        ).stdout
+    except FileNotFoundError:
+        # ffmpeg 실행 파일이 없는 경우에만 librosa로 디코딩 (INSTALL_FFMPEG.md 참고)
+        logger.warning("ffmpeg를 찾을 수 없어 librosa로 디코딩합니다.")
+        import librosa
+        y, _ = librosa.load(path, sr=sr, mono=True)
+        return np.ascontiguousarray(y, dtype=np.float32)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"오디오 디코딩 실패: {e.stderr.decode(errors='ignore')[-500:]}") from e
+
+    return _pcm16_to_float32(out)
+
+
+def iter_audio_pcm(
+    path: str,
+    sr: int = SAMPLE_RATE,
+    chunk_seconds: float = 1.0,
+) -> Iterator[np.ndarray]:
+    """
+    영상/오디오 파일에서 오디오 트랙만 demux + 16kHz mono로 리샘플하여
+    chunk_seconds 단위의 float32 PCM 블록으로 스트리밍한다.
+
+    영상 디코더를 띄우지 않으므로 moviepy VideoFileClip보다 시작이 빠르고,
+    첫 블록은 전체 디코딩이 끝나기 전에 나온다.
+    """
+    chunk_bytes = max(1, int(sr * chunk_seconds)) * 2  # s16le = 샘플당 2바이트
+    proc = subprocess.Popen(
+        _ffmpeg_pcm_command(path, sr),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while True:
+            block = proc.stdout.read(chunk_bytes)
+            if not block:
+                break
+            # 홀수 바이트로 끊긴 경우 마지막 1바이트는 버림 (ffmpeg 종료 직전에만 발생)
+            usable = len(block) - (len(block) % 2)
+            if usable:
+                yield _pcm16_to_float32(block[:usable])
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise RuntimeError(f"오디오 추출 실패: {stderr.decode(errors='ignore')[-500:]}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def extract_audio_to_wav(src_path: str, dst_path: str, sr: int = SAMPLE_RATE) -> str:
+    """영상에서 오디오 트랙만 demux 하여 16kHz mono PCM WAV 파일로 저장"""
+    cmd = [
+        *_ffmpeg_input_args(src_path),
+        "-ac", "1",
+        "-ar", str(sr),
+        "-acodec", "pcm_s16le",
+        "-y", dst_path,
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"오디오 추출 실패: {e.stderr.decode(errors='ignore')[-500:]}") from e
+    return dst_path
+
+
+class StreamingPCMDecoder:
+    """
+    업로드 청크를 받는 대로 ffmpeg stdin에 흘려 넣고 PCM을 받아오는 디코더.
+
+    업로드 전체를 하나의 bytes로 모으지 않으므로 입력 크기와 무관하게
+    입력 쪽 메모리는 청크 하나 크기로 유지된다 (출력 PCM만 오디오 길이에 비례).
+
+        decoder = StreamingPCMDecoder()
+        for chunk in chunks:
+            decoder.feed(chunk)
+        pcm = decoder.finish()
+
+    - ffmpeg가 없으면 생성 시 FileNotFoundError
+    - 입력을 디코딩할 수 없으면 feed에서 BrokenPipeError 또는 finish에서 RuntimeError
+    """
+
+    def __init__(self, sr: int = SAMPLE_RATE):
+        self._proc = subprocess.Popen(
+            _ffmpeg_pcm_command(PIPE_INPUT, sr),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._pcm = bytearray()
+        self._stderr_tail = b""
+        self.bytes_fed = 0
+
+        # stdout/stderr를 비워주지 않으면 ffmpeg가 막혀서 stdin 쓰기도 멈춘다
+        self._stdout_reader = threading.Thread(target=self._drain_stdout, daemon=True)
+        self._stderr_reader = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stdout_reader.start()
+        self._stderr_reader.start()
+
+    def _drain_stdout(self):
+        for block in iter(lambda: self._proc.stdout.read(64 * 1024), b""):
+            self._pcm += block
+
+    def _drain_stderr(self):
+        for block in iter(lambda: self._proc.stderr.read(4096), b""):
+            # 오류 메시지용으로 마지막 부분만 보관
+            self._stderr_tail = (self._stderr_tail + block)[-2000:]
+
+    def feed(self, chunk: bytes):
+        """업로드 청크 하나를 디코더에 전달"""
+        self._proc.stdin.write(chunk)
+        self.bytes_fed += len(chunk)
+
+    def finish(self) -> np.ndarray:
+        """입력을 닫고 디코딩이 끝날 때까지 기다린 뒤 float32 PCM 반환"""
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._proc.wait()
+        self._stdout_reader.join()
+        self._stderr_reader.join()
+
+        if self._proc.returncode != 0:
+            raise RuntimeError(
+                f"스트리밍 디코딩 실패: {self._stderr_tail.decode(errors='ignore')[-500:]}"
+            )
+        if not self._pcm:
+            raise RuntimeError("스트리밍 디코딩 결과가 비어있습니다.")
+
+        return _pcm16_to_float32(self._pcm)
+
+    def abort(self):
+        """디코딩 중단 (fallback으로 넘어갈 때 프로세스 정리)"""
+        try:
+            self._proc.kill()
+        except OSError:
+            pass
+        for stream in (self._proc.stdin, self._proc.stdout, self._proc.stderr):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+        self._proc.wait()
@@ -0,0 +1,65 @@
+# services/pipeline.py
+# 비동기 분석 파이프라인 - A/B/C/RAG 각 단계를 await 가능한 함수로 제공
+#
+# - 네트워크 대기(Gemini 퓨전, RAG의 LLM 호출)는 await 하므로 스레드를 점유하지 않는다.
+# - CPU를 쓰는 단계(사운드 CNN, RAG 문서 검색)는 services.executors의 전용 스레드 풀에서 실행한다.
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from modules.module_a_speech import analyze_speech
+from modules.module_b_sound import analyze_sound, analyze_sound_from_waveform
+from modules.module_c_fusion import fuse_situation_async
+from services.executors import run_in_stage
+
+
+async def speech_stage(stt_text: str) -> Dict:
+    """A 모듈: STT 텍스트 → 의료적 의미 태그 (규칙 매핑이라 이벤트 루프에서 바로 실행)"""
+    return analyze_speech(stt_text)
+
+
+async def sound_label_stage(event: str, confidence: float) -> Dict:
+    """B 모듈: 외부에서 받은 이벤트 라벨 표준화"""
+    return analyze_sound(event, confidence)
+
+
+async def sound_waveform_stage(pcm: np.ndarray) -> Dict:
+    """
+    B 모듈: PCM 전체 → 겹치는 2초 윈도우 log-mel → CNN 배치 (sound 전용 스레드 풀),
+    대표 이벤트를 C 모듈 입력 형태로 변환
+    """
+    sound_full = await run_in_stage("sound", analyze_sound_from_waveform, pcm)
+
+    # C 모듈이 기대하는 형태로 변환
+    return {
+        "event": sound_full.get("event", "생활소음"),
+        "confidence": sound_full.get("confidence", 0.5),
+    }
+
+
+async def fusion_stage(speech: Dict, sound: Dict, source: str = "realtime") -> Dict:
+    """C 모듈: A+B → Gemini 상황 JSON (비동기 호출)"""
+    return await fuse_situation_async(speech=speech, sound=sound, source=source)
+
+
+async def guideline_stage(situation: Dict) -> str:
+    """상황에 따른 안내문 생성 (RAG 사용, 없으면 기본 안내문)"""
+    guideline, _ = await guideline_stage_with_status(situation)
+    return guideline
+
+
+async def guideline_stage_with_status(situation: Dict) -> Tuple[str, bool]:
+    """guideline_stage와 같지만 (안내문, 기본 안내문으로 대체했는지)를 반환"""
+    try:
+        from services.rag_client import generate_guideline_with_status_async
+    except ImportError:
+        # RAG가 없으면 기본 안내문 사용
+        if situation.get("situation_id") == "S2":
+            return "지금 즉시 119에 신고하고, 심폐소생술이 가능한 사람을 찾으세요.", True
+        elif situation.get("situation_id") in ["S1", "S3", "S5", "S6", "S7"]:
+            return "환자를 편안히 앉히고 통증이 심해지면 즉시 119에 신고하세요.", True
+        else:
+            return "증상을 관찰하고 악화되면 바로 119에 신고하세요.", True
+
+    return await generate_guideline_with_status_async(situation)
@@ -3,10 +3,13 @@
 
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import logging
 
+from services.executors import get_executor, run_in_stage
+
 # RAG 모듈 경로 추가 (폴더 이름에 공백이 있어서 sys.path 사용)
 RAG_PROJECT_DIR = Path(__file__).parent / "generative Ai project"
 if str(RAG_PROJECT_DIR) not in sys.path:
@@ -25,15 +28,26 @@ logger = logging.getLogger(__name__)
 
 # 싱글톤 패턴: RAG 시스템을 한 번만 초기화
 _rag_system: Optional[object] = None  # RAGSystem이 없을 수 있으므로 object로 변경
+# 임베딩 모델 + 벡터 스토어 로드는 수 초가 걸리므로, 동시에 들어온 첫 요청이 각자 초기화하지 않도록 lock
+_rag_system_lock = threading.Lock()
 
 
 def _get_rag_system():
     """RAG 시스템 싱글톤 인스턴스 반환"""
-    global _rag_system
-    
     if not RAG_AVAILABLE or RAGSystem is None:
         return None
     
+    if _rag_system is not None:
+        return _rag_system
+    
+    with _rag_system_lock:
+        return _init_rag_system()
+
+
+def _init_rag_system():
+    """RAG 시스템 초기화 (_rag_system_lock 안에서 호출)"""
+    global _rag_system
+    
     if _rag_system is None:
         if RAGSystem is None:
             logger.error("RAGSystem 클래스를 불러올 수 없습니다.")
@@ -316,6 +330,58 @@ def _build_comprehensive_context(situation: Dict) -> str:
     return comprehensive_context
 
 
+def _default_guideline(situation: Dict) -> str:
+    """RAG를 사용할 수 없을 때의 기본 안내문 (혼자 있는 노인이 스스로 대처할 수 있는 방안)"""
+    situation_id = situation.get("situation_id", "S0")
+    emergency_level = situation.get("emergency_level", "low")
+    
+    if situation_id == "S2" or emergency_level == "high":
+        return "**1단계:** 가능한 한 편안한 자세를 취하세요. 무리하게 움직이지 마세요. 전화기가 가까이 있다면 천천히 기어가서 119에 전화하세요.\n\n**2단계:** 119에 전화가 연결되면 \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요. 가능하면 문을 열어두세요."
+    elif situation_id in ["S1", "S3", "S5", "S6", "S7"]:
+        return "**1단계:** 가능하면 편안한 자세를 취하세요. 통증이 심해지면 무리하지 마세요.\n\n**2단계:** 즉시 119에 전화하세요. \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요."
+    else:
+        return "**1단계:** 증상을 관찰하세요. 악화되는지 확인하세요.\n\n**2단계:** 증상이 악화되면 바로 119에 전화하세요. \"혼자 있는데 증상이 악화되고 있습니다\"라고 말하세요."
+
+
+def _build_rag_inputs(situation: Dict):
+    """situation JSON → (situation_info, additional_context)"""
+    # C 모듈의 전체 situation JSON에서 RAG가 필요한 정보 추출
+    # situation_info: RAG 시스템이 기대하는 기본 형식 (disasterLarge, disasterMedium 등)
+    situation_info = _convert_situation_to_rag_format(situation)
+    
+    # additional_context: situation JSON의 모든 추가 정보를 포함
+    # - situation_id, emergency_level, symptoms, situation_label 등
+    additional_context = _build_comprehensive_context(situation)
+    
+    # situation JSON 정보를 situation_info에 추가 (프롬프트에 직접 포함되도록)
+    situation_info["situation_id"] = situation.get("situation_id", "S0")
+    situation_info["emergency_level"] = situation.get("emergency_level", "low")
+    situation_info["situation_label"] = situation.get("situation_label", "")
+    situation_info["symptoms"] = situation.get("symptoms", [])
+    
+    # sound 정보 추가
+    sound = situation.get("sound", {})
+    if isinstance(sound, dict):
+        situation_info["sound_event"] = sound.get("event", "없음")
+        situation_info["sound_confidence"] = sound.get("confidence", "없음")
+    else:
+        situation_info["sound_event"] = "없음"
+        situation_info["sound_confidence"] = "없음"
+    
+    return situation_info, additional_context
+
+
+def _extract_guideline(result: Dict) -> str:
+    """RAG 결과에서 guideline 텍스트 추출"""
+    guideline = result.get("guideline", "")
+    
+    if not guideline:
+        # guideline이 비어있으면 report_message 사용
+        guideline = result.get("report_message", "응급 상황입니다. 즉시 119에 신고하세요.")
+    
+    return guideline
+
+
 def generate_guideline_from_situation(situation: Dict) -> str:
     """
     Situation JSON을 기반으로 RAG/LLM에 요청하여
@@ -333,39 +399,10 @@ def generate_guideline_from_situation(situation: Dict) -> str:
     if rag_system is None:
         # RAG가 없으면 기본 안내문 사용 (혼자 있는 노인이 스스로 대처할 수 있는 방안)
         logger.warning("RAG 시스템을 사용할 수 없어 기본 안내문을 반환합니다.")
-        situation_id = situation.get("situation_id", "S0")
-        emergency_level = situation.get("emergency_level", "low")
-        
-        if situation_id == "S2" or emergency_level == "high":
-            return "**1단계:** 가능한 한 편안한 자세를 취하세요. 무리하게 움직이지 마세요. 전화기가 가까이 있다면 천천히 기어가서 119에 전화하세요.\n\n**2단계:** 119에 전화가 연결되면 \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요. 가능하면 문을 열어두세요."
-        elif situation_id in ["S1", "S3", "S5", "S6", "S7"]:
-            return "**1단계:** 가능하면 편안한 자세를 취하세요. 통증이 심해지면 무리하지 마세요.\n\n**2단계:** 즉시 119에 전화하세요. \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요."
-        else:
-            return "**1단계:** 증상을 관찰하세요. 악화되는지 확인하세요.\n\n**2단계:** 증상이 악화되면 바로 119에 전화하세요. \"혼자 있는데 증상이 악화되고 있습니다\"라고 말하세요."
+        return _default_guideline(situation)
     
     try:
-        # C 모듈의 전체 situation JSON에서 RAG가 필요한 정보 추출
-        # situation_info: RAG 시스템이 기대하는 기본 형식 (disasterLarge, disasterMedium 등)
-        situation_info = _convert_situation_to_rag_format(situation)
-        
-        # additional_context: situation JSON의 모든 추가 정보를 포함
-        # - situation_id, emergency_level, symptoms, situation_label 등
-        additional_context = _build_comprehensive_context(situation)
-        
-        # situation JSON 정보를 situation_info에 추가 (프롬프트에 직접 포함되도록)
-        situation_info["situation_id"] = situation.get("situation_id", "S0")
-        situation_info["emergency_level"] = situation.get("emergency_level", "low")
-        situation_info["situation_label"] = situation.get("situation_label", "")
-        situation_info["symptoms"] = situation.get("symptoms", [])
-        
-        # sound 정보 추가
-        sound = situation.get("sound", {})
-        if isinstance(sound, dict):
-            situation_info["sound_event"] = sound.get("event", "없음")
-            situation_info["sound_confidence"] = sound.get("confidence", "없음")
-        else:
-            situation_info["sound_event"] = "없음"
-            situation_info["sound_confidence"] = "없음"
+        situation_info, additional_context = _build_rag_inputs(situation)
         
         # RAG로 지침 생성 (전체 situation 정보 활용)
         situation_id = situation.get("situation_id", "S0")
@@ -378,11 +415,7 @@ def generate_guideline_from_situation(situation: Dict) -> str:
         )
         
         # 결과에서 guideline 텍스트 추출
-        guideline = result.get("guideline", "")
-        
-        if not guideline:
-            # guideline이 비어있으면 report_message 사용
-            guideline = result.get("report_message", "응급 상황입니다. 즉시 119에 신고하세요.")
+        guideline = _extract_guideline(result)
         
         logger.info("RAG 지침 생성 완료")
         return guideline
@@ -393,13 +426,52 @@ def generate_guideline_from_situation(situation: Dict) -> str:
         traceback.print_exc()
         
         # 오류 발생 시 기본 안내문 반환 (혼자 있는 노인이 스스로 대처할 수 있는 방안)
+        return _default_guideline(situation)
+
+
+async def generate_guideline_from_situation_async(situation: Dict) -> str:
+    """
+    generate_guideline_from_situation의 비동기 버전.
+    
+    RAG 초기화/문서 검색(임베딩 계산)은 "rag" 전용 스레드 풀에서 실행하고,
+    LLM 호출은 await 하여 응답을 기다리는 동안 스레드를 점유하지 않는다.
+    """
+    guideline, _ = await generate_guideline_with_status_async(situation)
+    return guideline
+
+
+async def generate_guideline_with_status_async(situation: Dict) -> Tuple[str, bool]:
+    """
+    generate_guideline_from_situation_async와 같지만 기본 안내문으로 대체했는지도 함께 반환.
+    
+    Output: (guideline, fallback) - RAG를 못 쓰거나 생성 중 오류가 나면 fallback=True
+    """
+    rag_system = await run_in_stage("rag", _get_rag_system)
+    
+    if rag_system is None:
+        logger.warning("RAG 시스템을 사용할 수 없어 기본 안내문을 반환합니다.")
+        return _default_guideline(situation), True
+    
+    try:
+        situation_info, additional_context = _build_rag_inputs(situation)
+        
         situation_id = situation.get("situation_id", "S0")
         emergency_level = situation.get("emergency_level", "low")
+        logger.info(f"RAG 지침 생성 중... (situation_id: {situation_id}, emergency_level: {emergency_level})")
         
-        if situation_id == "S2" or emergency_level == "high":
-            return "**1단계:** 가능한 한 편안한 자세를 취하세요. 무리하게 움직이지 마세요. 전화기가 가까이 있다면 천천히 기어가서 119에 전화하세요.\n\n**2단계:** 119에 전화가 연결되면 \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요. 가능하면 문을 열어두세요."
-        elif situation_id in ["S1", "S3", "S5", "S6", "S7"]:
-            return "**1단계:** 가능하면 편안한 자세를 취하세요. 통증이 심해지면 무리하지 마세요.\n\n**2단계:** 즉시 119에 전화하세요. \"혼자 있는데 응급 상황입니다. 주소는 [주소]입니다\"라고 말하세요."
-        else:
-            return "**1단계:** 증상을 관찰하세요. 악화되는지 확인하세요.\n\n**2단계:** 증상이 악화되면 바로 119에 전화하세요. \"혼자 있는데 증상이 악화되고 있습니다\"라고 말하세요."
-
+        result = await rag_system.agenerate_guideline(
+            situation_info=situation_info,
+            additional_context=additional_context,
+            executor=get_executor("rag")
+        )
+        
+        guideline = _extract_guideline(result)
+        logger.info("RAG 지침 생성 완료")
+        return guideline, False
+        
+    except Exception as e:
+        logger.error(f"RAG 지침 생성 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        
+        return _default_guideline(situation), True
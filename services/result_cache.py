@@ -0,0 +1,157 @@
+# services/result_cache.py
+# /api/emergency/analyze 결과 캐시 (LRU + TTL)
+# 같은 stt_text / sound_event / 비슷한 sound_confidence 요청이 반복되면
+# Gemini 퓨전 + RAG를 다시 돌리지 않고 저장된 situation / guideline을 돌려준다.
+
+import copy
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# 최대 저장 개수 (0이면 캐시 사용 안 함)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+# 저장 후 유효 시간 (초)
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+# confidence를 이 간격으로 묶어서 키로 사용 (0.05면 0.80~0.85가 같은 키)
+RESULT_CACHE_CONFIDENCE_BUCKET = float(os.getenv("RESULT_CACHE_CONFIDENCE_BUCKET", "0.05"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+CacheKey = Tuple[str, str, int, str]
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC 정규화 + 공백 정리 + 소문자 (한글 자모 분리 입력도 같은 키가 되도록)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class AnalyzeResultCache:
+    """
+    (정규화된 텍스트, 이벤트, confidence 구간, 규칙 버전) → {"situation", "guideline"} LRU/TTL 캐시.
+
+    - 가장 오래 사용되지 않은 항목부터 max_entries를 넘으면 제거
+    - ttl_seconds가 지난 항목은 조회 시 만료 처리
+    - 여러 요청 스레드/코루틴에서 동시에 사용해도 안전 (내부 lock)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+        confidence_bucket: float = RESULT_CACHE_CONFIDENCE_BUCKET,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.confidence_bucket = confidence_bucket if confidence_bucket > 0 else 0.05
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def make_key(
+        self, stt_text: str, sound_event: str, sound_confidence: float, rules_version: str = ""
+    ) -> CacheKey:
+        """rules_version: 결과를 만든 규칙의 식별자 (intent 규칙 sha256 등, 바뀌면 이전 결과를 쓰지 않음)"""
+        # 0.85 / 0.05 = 16.999... 같은 부동소수점 오차로 구간이 밀리지 않도록 약간 더해서 내림
+        bucket = math.floor(float(sound_confidence) / self.confidence_bucket + 1e-9)
+        return normalize_text(stt_text), normalize_text(sound_event), bucket, rules_version or ""
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """저장된 결과 (없거나 만료되었으면 None)"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return copy.deepcopy(value)
+
+    def put(self, key: CacheKey, value: Dict):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, stt_text: Optional[str] = None, sound_event: Optional[str] = None) -> int:
+        """
+        조건에 맞는 항목 삭제 후 삭제 개수 반환.
+        둘 다 None이면 전체 삭제, 지정한 값은 정규화 후 비교 (confidence 구간은 무관).
+        """
+        text = normalize_text(stt_text) if stt_text is not None else None
+        event = normalize_text(sound_event) if sound_event is not None else None
+
+        with self._lock:
+            if text is None and event is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [
+                    key for key in self._entries
+                    if (text is None or key[0] == text) and (event is None or key[1] == event)
+                ]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+            self._stats["invalidations"] += removed
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["confidence_bucket"] = self.confidence_bucket
+        return stats
+
+
+_cache: Optional[AnalyzeResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analyze_cache() -> AnalyzeResultCache:
+    """프로세스 공유 /api/emergency/analyze 결과 캐시 싱글톤"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalyzeResultCache()
+    return _cache
@@ -0,0 +1,163 @@
+# services/runtime_config.py
+# 프로세스(uvicorn 워커)별 CPU 스레드 설정을 한 곳에서 정한다.
+#
+# uvicorn --workers N으로 띄우면 워커마다 torch intra-op 풀과 BLAS(OpenBLAS/MKL) 풀이
+# 코어 수만큼 스레드를 만들어서 CNN / Whisper가 동시에 돌 때 CPU가 심하게 과구독된다.
+# 코어를 워커 수로 나눈 값(cores_per_worker)을 기준으로
+# - BLAS 스레드 (librosa / numpy): OMP_NUM_THREADS 등 환경변수 → numpy import 전에 적용해야 함
+# - torch intra-op / inter-op 스레드
+# - 단계별 스레드 풀 크기 (services.executors), B 모듈 배치 특징 추출 워커 수
+# 를 정하고, 시작 시 워커별 실제 병렬도를 출력한다.
+# 각 값은 환경변수로 직접 지정하면 그 값을 그대로 사용한다.
+#
+# 주의: 이 모듈은 numpy / torch를 최상단에서 import 하지 않는다. (main.py 맨 앞에서 import)
+
+import logging
+import os
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def _available_cpus() -> int:
+    """이 프로세스가 쓸 수 있는 코어 수 (컨테이너 / taskset 제한 반영)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+# uvicorn --workers 값 (uvicorn은 WEB_CONCURRENCY를 기본 워커 수로 사용)
+WORKER_COUNT = max(1, _env_int("UVICORN_WORKERS", _env_int("WEB_CONCURRENCY", 1)))
+CPU_COUNT = _available_cpus()
+# 워커 하나가 쓸 수 있는 코어 수 (RUNTIME_CORES_PER_WORKER로 직접 지정 가능)
+CORES_PER_WORKER = max(1, _env_int("RUNTIME_CORES_PER_WORKER", CPU_COUNT // WORKER_COUNT))
+
+# 단계별 스레드 풀 크기 기본값 (services.executors가 사용, 단계별 환경변수가 우선)
+DEFAULT_STAGE_WORKERS: Dict[str, int] = {
+    # ffmpeg 파이프 쓰기/대기가 대부분 (디코딩 자체는 ffmpeg 프로세스가 함)
+    "media": max(2, CORES_PER_WORKER),
+    # Whisper 배치 스케줄러 결과를 기다리기만 하는 스레드 → 코어 수와 무관
+    "stt": 8,
+    # log-mel + CNN forward: 스레드마다 torch intra-op 풀을 쓰므로 적게
+    "sound": max(1, min(2, CORES_PER_WORKER)),
+    # 임베딩 계산 + 벡터 검색
+    "rag": max(1, min(4, CORES_PER_WORKER)),
+}
+
+# torch intra-op: 동시에 도는 CNN forward(sound 스레드 수)가 워커 몫의 코어를 나눠 쓰도록
+# inter-op: 작게 (모델 그래프가 단순해서 거의 쓰지 않음)
+TORCH_NUM_THREADS = max(
+    1, _env_int("TORCH_NUM_THREADS", CORES_PER_WORKER // DEFAULT_STAGE_WORKERS["sound"])
+)
+TORCH_INTEROP_THREADS = max(1, _env_int("TORCH_INTEROP_THREADS", min(2, CORES_PER_WORKER)))
+# librosa / numpy가 쓰는 BLAS 스레드
+BLAS_NUM_THREADS = max(1, _env_int("BLAS_NUM_THREADS", CORES_PER_WORKER))
+# B 모듈 predict_audio_events의 특징 추출 스레드 수
+SOUND_FEATURE_WORKERS = max(1, min(4, CORES_PER_WORKER))
+
+# BLAS 구현별 스레드 수 환경변수 (라이브러리가 로드되기 전에만 효과가 있음)
+_BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+_applied = False
+
+
+def apply_thread_env():
+    """
+    BLAS / OpenMP 스레드 수 환경변수와 B 모듈 특징 추출 워커 수를 설정.
+    numpy / torch / librosa import 전에 호출해야 한다. 이미 지정된 환경변수는 건드리지 않는다.
+    """
+    for name in _BLAS_ENV_VARS:
+        os.environ.setdefault(name, str(BLAS_NUM_THREADS))
+    os.environ.setdefault("SOUND_FEATURE_WORKERS", str(SOUND_FEATURE_WORKERS))
+
+
+def apply_runtime_config():
+    """
+    스레드 설정 전체 적용 (프로세스당 한 번).
+    - BLAS: 환경변수 + (numpy가 이미 로드되었다면) threadpoolctl로 런타임 제한
+    - torch: set_num_threads / set_num_interop_threads
+    """
+    global _applied
+    if _applied:
+        return
+    apply_thread_env()
+
+    try:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=BLAS_NUM_THREADS, user_api="blas")
+    except ImportError:
+        pass
+
+    try:
+        import torch
+
+        torch.set_num_threads(TORCH_NUM_THREADS)
+        try:
+            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+        except RuntimeError as e:
+            # inter-op 풀은 병렬 작업이 한 번이라도 실행된 뒤에는 바꿀 수 없음
+            logger.warning(f"torch inter-op 스레드 수를 바꿀 수 없습니다: {e}")
+    except ImportError:
+        pass
+
+    _applied = True
+
+
+def get_runtime_report() -> Dict:
+    """워커(프로세스)별 실제 병렬도 - 설정값이 아니라 라이브러리가 보고하는 값을 사용"""
+    from services.executors import STAGE_WORKERS
+
+    report = {
+        "pid": os.getpid(),
+        "workers": WORKER_COUNT,
+        "cpus": CPU_COUNT,
+        "cores_per_worker": CORES_PER_WORKER,
+        "stage_workers": dict(STAGE_WORKERS),
+        "sound_feature_workers": int(os.getenv("SOUND_FEATURE_WORKERS", SOUND_FEATURE_WORKERS)),
+        "blas_env": {name: os.getenv(name) for name in _BLAS_ENV_VARS if os.getenv(name)},
+    }
+
+    try:
+        from threadpoolctl import threadpool_info
+
+        report["blas_threads"] = {
+            f"{info['internal_api']}:{info['prefix']}": info["num_threads"] for info in threadpool_info()
+        }
+    except ImportError:
+        pass
+
+    try:
+        import torch
+
+        report["torch_threads"] = torch.get_num_threads()
+        report["torch_interop_threads"] = torch.get_num_interop_threads()
+        # 동시에 CNN forward를 하는 sound 스레드 × torch intra-op 스레드
+        report["sound_peak_threads"] = report["stage_workers"].get("sound", 1) * report["torch_threads"]
+        report["oversubscribed"] = report["sound_peak_threads"] > CORES_PER_WORKER
+    except ImportError:
+        pass
+
+    return report
+
+
+def format_runtime_report(report: Dict) -> str:
+    stages = ", ".join(f"{name}={count}" for name, count in report["stage_workers"].items())
+    return (
+        f"워커 {report['workers']}개 × 코어 {report['cores_per_worker']}개 (전체 {report['cpus']}) | "
+        f"torch {report.get('torch_threads')}/{report.get('torch_interop_threads')} (intra/inter) | "
+        f"BLAS {report.get('blas_threads', report['blas_env'].get('OMP_NUM_THREADS'))} | "
+        f"스레드 풀 {stages}"
+    )
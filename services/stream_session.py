@@ -0,0 +1,269 @@
+# services/stream_session.py
+# 실시간 스트리밍 분석 세션
+# WebSocket으로 들어오는 오디오 프레임을 2초 윈도우로 잘라 B 모듈 CNN을 돌리고,
+# 주기적으로 부분 STT를 만들며, 이벤트가 감지되면 곧바로 상황 분석 + 안내문을 푸시한다.
+
+import asyncio
+import os
+import time
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from modules.module_b_sound import DURATION
+from services.executors import run_in_stage
+from services.media_decoder import SAMPLE_RATE
+from services.pipeline import (
+    fusion_stage,
+    guideline_stage,
+    sound_waveform_stage,
+    speech_stage,
+)
+
+logger = logging.getLogger(__name__)
+
+# CNN 윈도우 간격 (초) - 2초 윈도우를 이 간격으로 겹쳐서 분석
+STREAM_HOP_SECONDS = float(os.getenv("STREAM_HOP_SECONDS", "1.0"))
+# 부분 STT 주기 (초) - 이만큼 새 오디오가 쌓일 때마다 최근 오디오를 다시 인식
+STREAM_STT_INTERVAL_SECONDS = float(os.getenv("STREAM_STT_INTERVAL_SECONDS", "3.0"))
+# 부분 STT에 사용하는 최근 오디오 길이 (초, Whisper 한 번의 입력 길이)
+STREAM_STT_CONTEXT_SECONDS = float(os.getenv("STREAM_STT_CONTEXT_SECONDS", "30"))
+# 이 confidence 이상인 이벤트(생활소음 제외)만 상황 분석을 트리거
+STREAM_EVENT_THRESHOLD = float(os.getenv("STREAM_EVENT_THRESHOLD", "0.6"))
+# 같은 이벤트가 연속으로 감지될 때 다시 상황 분석을 푸시하기까지의 최소 간격 (초)
+STREAM_EVENT_COOLDOWN_SECONDS = float(os.getenv("STREAM_EVENT_COOLDOWN_SECONDS", "10"))
+
+# 상황 분석을 트리거하지 않는 배경 클래스
+BACKGROUND_EVENT = "생활소음"
+
+# run_stt_on_audio가 무음/빈 결과/오류일 때 돌려주는 문구 (부분 STT에서는 빈 결과로 취급)
+UNRECOGNIZED_TEXT = "음성을 인식할 수 없습니다."
+
+# 지원하는 프레임 형식 (16kHz mono, little-endian)
+FRAME_DTYPES = {
+    "s16le": np.int16,
+    "f32le": np.float32,
+}
+
+
+class StreamingAnalysisSession:
+    """
+    WebSocket 연결 하나의 스트리밍 분석 상태.
+
+        session = StreamingAnalysisSession(emit=websocket.send_json, transcribe=run_stt_on_audio)
+        await session.feed(frame_bytes)   # 프레임이 올 때마다
+        await session.finish()            # 스트림 종료 시
+
+    emit으로 보내는 메시지:
+    - {"type": "window", ...}       2초 윈도우마다 CNN 결과
+    - {"type": "partial_stt", ...}  부분 STT 결과
+    - {"type": "situation", ...}    이벤트 감지 시 상황 분석 + 안내문
+    - {"type": "error", ...}        처리 중 오류
+    시간(start/end 등)은 모두 스트림 시작 기준 초 단위.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Dict], Awaitable[None]],
+        transcribe: Callable[[np.ndarray], str],
+        frame_format: str = "s16le",
+        hop_seconds: float = STREAM_HOP_SECONDS,
+        stt_interval_seconds: float = STREAM_STT_INTERVAL_SECONDS,
+        stt_context_seconds: float = STREAM_STT_CONTEXT_SECONDS,
+        event_threshold: float = STREAM_EVENT_THRESHOLD,
+        event_cooldown_seconds: float = STREAM_EVENT_COOLDOWN_SECONDS,
+    ):
+        if frame_format not in FRAME_DTYPES:
+            raise ValueError(f"지원하지 않는 프레임 형식: {frame_format} ({', '.join(FRAME_DTYPES)})")
+
+        self._emit_fn = emit
+        self._transcribe = transcribe
+        self._dtype = np.dtype(FRAME_DTYPES[frame_format])
+
+        self.window_samples = int(SAMPLE_RATE * DURATION)
+        self.hop_samples = max(1, int(SAMPLE_RATE * hop_seconds))
+        self.stt_interval_samples = max(1, int(SAMPLE_RATE * stt_interval_seconds))
+        self.context_samples = max(self.window_samples, int(SAMPLE_RATE * stt_context_seconds))
+        self.event_threshold = event_threshold
+        self.event_cooldown_seconds = event_cooldown_seconds
+
+        # 최근 context_samples 만큼의 PCM (스트림 시작 기준 절대 샘플 위치 = _buffer_start)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._total_samples = 0
+        # 프레임이 샘플 경계에서 끊기지 않았을 때 남은 바이트
+        self._pending_bytes = b""
+
+        self._next_window_end = self.window_samples
+        self._next_stt_at = self.stt_interval_samples
+
+        self.transcript = ""
+        self._stt_end = 0
+        self._stt_task: Optional[asyncio.Task] = None
+        self._situation_tasks = set()
+        self._last_trigger: Optional[Dict] = None
+
+        self._send_lock = asyncio.Lock()
+        self._started_at = time.perf_counter()
+
+    # ------------------------------------------
+    # 외부 인터페이스
+    # ------------------------------------------
+    async def feed(self, frame: bytes):
+        """오디오 프레임 하나를 추가하고, 준비된 윈도우를 분석"""
+        self._append(self._frame_to_pcm(frame))
+
+        # 2초 윈도우가 준비될 때마다 CNN (hop 간격으로 겹침)
+        while self._next_window_end <= self._total_samples:
+            end = self._next_window_end
+            self._next_window_end += self.hop_samples
+            if end - self.window_samples < self._buffer_start:
+                # 한 프레임이 STT 문맥보다 길어서 이미 버려진 윈도우는 건너뜀
+                continue
+            await self._analyze_window(end - self.window_samples, end)
+
+        # 부분 STT는 백그라운드에서 (진행 중이면 다음 주기로 미룸)
+        if self._total_samples >= self._next_stt_at and not self._stt_running():
+            self._next_stt_at = self._total_samples + self.stt_interval_samples
+            self._stt_task = asyncio.create_task(self._run_partial_stt())
+
+    async def finish(self) -> Dict:
+        """스트림 종료: 마지막 STT와 진행 중인 상황 분석을 기다린 뒤 요약 반환"""
+        if self._stt_running():
+            await self._stt_task
+        if self._total_samples > self._stt_end:
+            # 마지막 부분 STT 이후에 들어온 오디오가 있으면 한 번 더 인식
+            await self._run_partial_stt()
+        if self._situation_tasks:
+            await asyncio.gather(*self._situation_tasks, return_exceptions=True)
+
+        return {
+            "type": "done",
+            "audio_seconds": round(self._total_samples / SAMPLE_RATE, 3),
+            "transcript": self.transcript,
+            "last_event": self._last_trigger,
+        }
+
+    def cancel(self):
+        """연결이 끊겼을 때 백그라운드 작업 정리"""
+        if self._stt_task is not None:
+            self._stt_task.cancel()
+        for task in list(self._situation_tasks):
+            task.cancel()
+
+    # ------------------------------------------
+    # 내부 처리
+    # ------------------------------------------
+    def _frame_to_pcm(self, frame: bytes) -> np.ndarray:
+        data = self._pending_bytes + frame
+        usable = len(data) - (len(data) % self._dtype.itemsize)
+        self._pending_bytes = data[usable:]
+        pcm = np.frombuffer(data[:usable], dtype=self._dtype)
+        if self._dtype == np.int16:
+            pcm = pcm.astype(np.float32)
+            pcm /= 32768.0
+        return pcm
+
+    def _append(self, pcm: np.ndarray):
+        if not len(pcm):
+            return
+        self._buffer = np.concatenate([self._buffer, pcm])
+        self._total_samples += len(pcm)
+
+        # STT 문맥 길이만큼만 보관 (오래된 오디오는 버림)
+        overflow = len(self._buffer) - self.context_samples
+        if overflow > 0:
+            self._buffer = self._buffer[overflow:]
+            self._buffer_start += overflow
+
+    def _slice(self, start: int, end: int) -> np.ndarray:
+        """절대 샘플 위치 [start, end) 구간 (버퍼에 남아있는 부분만)"""
+        lo = max(0, start - self._buffer_start)
+        hi = max(0, end - self._buffer_start)
+        return self._buffer[lo:hi]
+
+    def _stt_running(self) -> bool:
+        return self._stt_task is not None and not self._stt_task.done()
+
+    async def _emit(self, message: Dict):
+        message["elapsed_ms"] = round((time.perf_counter() - self._started_at) * 1000.0, 1)
+        async with self._send_lock:
+            await self._emit_fn(message)
+
+    async def _analyze_window(self, start: int, end: int):
+        sound = await sound_waveform_stage(self._slice(start, end))
+        window = {
+            "start": round(start / SAMPLE_RATE, 3),
+            "end": round(end / SAMPLE_RATE, 3),
+            "event": sound["event"],
+            "confidence": sound["confidence"],
+        }
+        await self._emit({"type": "window", **window})
+
+        if self._should_trigger(window):
+            self._last_trigger = window
+            task = asyncio.create_task(self._push_situation(window))
+            self._situation_tasks.add(task)
+            task.add_done_callback(self._situation_tasks.discard)
+
+    def _should_trigger(self, window: Dict) -> bool:
+        if window["event"] == BACKGROUND_EVENT or window["confidence"] < self.event_threshold:
+            return False
+        last = self._last_trigger
+        if last is None or last["event"] != window["event"]:
+            return True
+        return window["end"] - last["end"] >= self.event_cooldown_seconds
+
+    async def _run_partial_stt(self):
+        audio = self._slice(self._buffer_start, self._total_samples).copy()
+        audio_end = self._total_samples
+        try:
+            text = await run_in_stage("stt", self._transcribe, audio)
+        except Exception as e:
+            logger.error(f"스트리밍 부분 STT 실패: {e}")
+            await self._emit({"type": "error", "stage": "stt", "message": str(e)})
+            return
+
+        self._stt_end = audio_end
+        text = text.strip()
+        if not text or text == UNRECOGNIZED_TEXT:
+            # 인식된 말이 없으면 이전 transcript를 유지하고 푸시하지 않음
+            return
+
+        self.transcript = text
+        await self._emit({
+            "type": "partial_stt",
+            "text": text,
+            "start": round((audio_end - len(audio)) / SAMPLE_RATE, 3),
+            "end": round(audio_end / SAMPLE_RATE, 3),
+        })
+
+    async def _push_situation(self, trigger: Dict):
+        """이벤트 윈도우 + 최근 부분 STT로 상황 분석 → 안내문까지 만들어 푸시"""
+        try:
+            # 아직 부분 STT가 없으면 지금까지의 오디오로 한 번 인식
+            if not self.transcript:
+                if self._stt_running():
+                    await self._stt_task
+                else:
+                    await self._run_partial_stt()
+
+            speech = await speech_stage(self.transcript)
+            sound = {"event": trigger["event"], "confidence": trigger["confidence"]}
+            situation = await fusion_stage(speech, sound, source="realtime")
+            guideline = await guideline_stage(situation)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"스트리밍 상황 분석 실패: {e}")
+            await self._emit({"type": "error", "stage": "situation", "message": str(e)})
+            return
+
+        await self._emit({
+            "type": "situation",
+            "trigger": trigger,
+            "stt_text": self.transcript,
+            "situation": situation,
+            "guideline": guideline,
+        })
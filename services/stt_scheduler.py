@@ -0,0 +1,268 @@
+# services/stt_scheduler.py
+# STT 마이크로 배칭 스케줄러
+# 동시에 들어온 STT 요청을 몇 ms 동안 모아서 Whisper 인코더/디코더에 하나의 배치로 넣는다.
+
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.whisper_registry import get_whisper_model, whisper_inference_lock
+
+logger = logging.getLogger(__name__)
+
+# 한 배치에 넣을 최대 요청 수
+STT_BATCH_MAX_SIZE = int(os.getenv("STT_BATCH_MAX_SIZE", "8"))
+# 첫 요청이 들어온 뒤 다른 요청을 기다리는 최대 시간 (ms)
+STT_BATCH_WAIT_MS = float(os.getenv("STT_BATCH_WAIT_MS", "10"))
+
+# 30초 이하 배치 디코딩에도 model.transcribe와 같은 temperature fallback 적용 (0이면 greedy 한 번만)
+# 반복이 심하거나(compression ratio) 확신이 낮은(avg logprob) 결과만 더 높은 temperature로 다시 디코딩
+STT_TEMPERATURE_FALLBACK = os.getenv("STT_TEMPERATURE_FALLBACK", "1") != "0"
+# whisper.transcribe 기본값과 동일
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+# temperature > 0 에서 샘플링할 후보 수 (whisper CLI 기본값과 동일)
+BEST_OF = 5
+
+# Whisper 입력 샘플링 레이트 / 한 번에 인코딩하는 길이 (30초)
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 30 * SAMPLE_RATE
+
+
+class _STTJob:
+    __slots__ = ("audio", "future", "enqueued_at")
+
+    def __init__(self, audio: np.ndarray):
+        self.audio = audio
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class STTBatchScheduler:
+    """
+    STT 요청을 모아서 배치로 처리하는 스케줄러.
+
+    - 30초 이하 클립: 패딩 후 (B, n_mels, 3000) mel 배치로 whisper.decode 한 번에 처리
+      (transcribe처럼 실패한 항목만 temperature를 올려 다시 디코딩, 무음으로 판단되면 빈 텍스트)
+    - 30초 초과 클립: 배치에 넣을 수 없으므로 같은 워커에서 model.transcribe로 개별 처리
+    결과는 각 요청의 Future로 돌려준다.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = STT_BATCH_MAX_SIZE,
+        max_wait_ms: float = STT_BATCH_WAIT_MS,
+        language: str = "ko",
+        model_size: Optional[str] = None,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.language = language
+        self.model_size = model_size
+
+        self._queue: "queue.Queue[_STTJob]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "jobs": 0,
+            "batches": 0,
+            "long_clips": 0,
+            "fallback_decodes": 0,
+            "no_speech_skips": 0,
+            "max_batch_size_seen": 0,
+            "queue_wait_ms_total": 0.0,
+        }
+
+    # ------------------------------------------
+    # 외부 인터페이스
+    # ------------------------------------------
+    def submit(self, audio: np.ndarray) -> Future:
+        """16kHz mono float32 오디오를 큐에 넣고 Future 반환 (결과: 텍스트)"""
+        self._ensure_worker()
+        job = _STTJob(np.asarray(audio, dtype=np.float32))
+        self._queue.put(job)
+        return job.future
+
+    def transcribe(self, audio: np.ndarray, timeout: Optional[float] = None) -> str:
+        """submit 후 결과가 나올 때까지 대기"""
+        return self.submit(audio).result(timeout=timeout)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        stats["avg_batch_size"] = (
+            round((stats["jobs"] - stats["long_clips"]) / batches, 2) if batches else 0.0
+        )
+        stats["avg_queue_wait_ms"] = (
+            round(stats["queue_wait_ms_total"] / stats["jobs"], 2) if stats["jobs"] else 0.0
+        )
+        stats["pending"] = self._queue.qsize()
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        return stats
+
+    # ------------------------------------------
+    # 워커
+    # ------------------------------------------
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="stt-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> List[_STTJob]:
+        """첫 요청은 블로킹으로 기다리고, 이후 max_wait 동안 최대 max_batch_size까지 모은다."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            now = time.perf_counter()
+            with self._stats_lock:
+                for job in batch:
+                    self._stats["queue_wait_ms_total"] += (now - job.enqueued_at) * 1000.0
+                self._stats["jobs"] += len(batch)
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"STT 배치 처리 실패: {e}")
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def _process(self, batch: List[_STTJob]):
+        import torch
+        import whisper
+
+        model = get_whisper_model(self.model_size)
+        lock = whisper_inference_lock(self.model_size)
+
+        short_jobs = [job for job in batch if len(job.audio) <= CHUNK_SAMPLES]
+        long_jobs = [job for job in batch if len(job.audio) > CHUNK_SAMPLES]
+
+        if short_jobs:
+            # 각 클립을 30초로 패딩 → log-mel → (B, n_mels, 3000) 한 배치로 디코딩
+            mels = [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(torch.from_numpy(job.audio)),
+                    n_mels=model.dims.n_mels,
+                )
+                for job in short_jobs
+            ]
+            mel_batch = torch.stack(mels).to(model.device)
+            with lock:
+                results = self._decode_with_fallback(model, mel_batch)
+
+            skipped = 0
+            for job, result in zip(short_jobs, results):
+                # transcribe와 같은 무음 판정 (말소리가 없을 확률이 높고 확신도 낮으면 버림)
+                if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob <= LOGPROB_THRESHOLD:
+                    skipped += 1
+                    job.future.set_result("")
+                else:
+                    job.future.set_result(result.text.strip())
+
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["no_speech_skips"] += skipped
+                self._stats["max_batch_size_seen"] = max(
+                    self._stats["max_batch_size_seen"], len(short_jobs)
+                )
+
+        for job in long_jobs:
+            # 30초 초과 클립은 슬라이딩 디코딩이 필요하므로 transcribe로 개별 처리
+            with self._stats_lock:
+                self._stats["long_clips"] += 1
+            try:
+                with lock:
+                    result = model.transcribe(job.audio, language=self.language)
+                job.future.set_result(result.get("text", "").strip())
+            except Exception as e:
+                job.future.set_exception(e)
+
+    def _decode_with_fallback(self, model, mel_batch) -> list:
+        """
+        배치 디코딩 + whisper.transcribe의 decode_with_fallback과 같은 판정.
+        temperature 0 결과 중 반복이 심하거나 avg logprob가 낮은 항목만 모아서 다음 temperature로 다시 디코딩
+        (무음으로 보이는 항목은 다시 하지 않음). temperature > 0 에서는 BEST_OF개를 샘플링해 가장 좋은 후보를 고른다.
+        호출자가 추론 lock을 잡고 있어야 한다.
+        """
+        import whisper
+
+        def options(temperature: float):
+            return whisper.DecodingOptions(
+                language=self.language,
+                temperature=temperature,
+                best_of=BEST_OF if temperature > 0 else None,
+                without_timestamps=True,
+                fp16=model.device.type != "cpu",
+            )
+
+        results = list(whisper.decode(model, mel_batch, options(0.0)))
+        if not STT_TEMPERATURE_FALLBACK:
+            return results
+
+        for temperature in TEMPERATURES[1:]:
+            retry = [i for i, result in enumerate(results) if _needs_fallback(result)]
+            if not retry:
+                break
+            with self._stats_lock:
+                self._stats["fallback_decodes"] += len(retry)
+            # whisper.decode는 best_of > 1 일 때 오디오 특징을 후보 수만큼 늘리지 않아
+            # 배치(n_audio > 1)로 넘기면 cross-attention 크기가 맞지 않으므로 항목별로 디코딩
+            for i in retry:
+                results[i] = whisper.decode(model, mel_batch[i], options(temperature))
+        return results
+
+
+def _needs_fallback(result) -> bool:
+    """whisper.transcribe와 같은 기준 (반복이 심하거나 확신이 낮으면 다시, 단 무음이면 그대로)"""
+    low_logprob = result.avg_logprob < LOGPROB_THRESHOLD
+    if result.no_speech_prob > NO_SPEECH_THRESHOLD and low_logprob:
+        return False
+    return result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or low_logprob
+
+
+_scheduler: Optional[STTBatchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_stt_scheduler() -> STTBatchScheduler:
+    """프로세스 공유 STT 스케줄러 싱글톤"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = STTBatchScheduler()
+    return _scheduler
+
+
+def get_stt_scheduler_stats() -> Optional[Dict]:
+    """스케줄러가 만들어졌으면 배치 통계, 아니면 None"""
+    return _scheduler.stats() if _scheduler is not None else None
@@ -0,0 +1,140 @@
+# services/warmup.py
+# 서버 시작 시 무거운 모델을 미리 로드하고, 더미 입력으로 한 번씩 추론해 둔다.
+# (첫 요청이 모델 로드 + 첫 추론 비용을 떠안지 않도록)
+#
+# - B 모듈 CNN: _load_model (lock) → 2초 잡음 윈도우 log-mel + 추론 (활동 게이트를 거치지 않음)
+# - Whisper: 레지스트리 로드 (lock) → 1초 무음으로 STT 배치 스케줄러 한 번 실행
+# - RAG: 임베딩 모델 + 벡터 스토어 로드 (lock) → 문서 검색 한 번 (LLM 호출은 하지 않음)
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from services.media_decoder import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# 시작 시 워밍업할 구성 요소 (쉼표 구분, 빈 값이면 워밍업 안 함)
+WARMUP_COMPONENTS = [
+    name.strip()
+    for name in os.getenv("WARMUP_COMPONENTS", "sound,whisper,rag").split(",")
+    if name.strip()
+]
+
+_warmup_lock = threading.Lock()
+_warmup_status: Dict = {"components": {}, "total_seconds": None}
+
+
+def _warmup_sound() -> Dict:
+    from modules import module_b_sound
+
+    start = time.perf_counter()
+    module_b_sound._load_model()
+    loaded = time.perf_counter()
+
+    # 2초 윈도우 하나로 log-mel 프론트엔드 생성 + CNN forward
+    # (활동 게이트를 거치면 무음 / 배경 소음은 건너뛰고 게이트 통계에도 남으므로 직접 호출,
+    #  완전한 무음은 표준화에서 0으로 나누게 되므로 작은 잡음을 사용)
+    probe = np.random.default_rng(0).standard_normal(
+        int(module_b_sound.SR * module_b_sound.DURATION)
+    ).astype(np.float32) * 0.01
+    log_mels = module_b_sound._get_frontend().log_mel(probe[None, :])
+    if module_b_sound._has_weights():
+        module_b_sound._forward_logmels(log_mels)
+    done = time.perf_counter()
+
+    return {
+        "load_seconds": round(loaded - start, 3),
+        "inference_ms": round((done - loaded) * 1000, 1),
+        "backend": module_b_sound._model_backend,
+        "weights": module_b_sound._has_weights(),
+    }
+
+
+def _warmup_whisper() -> Dict:
+    from services.whisper_registry import get_whisper_model
+    from services.stt_scheduler import get_stt_scheduler
+
+    start = time.perf_counter()
+    get_whisper_model()
+    loaded = time.perf_counter()
+
+    # 1초 무음으로 배치 디코딩 경로 (mel → encoder → decoder) 한 번 실행
+    get_stt_scheduler().transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    done = time.perf_counter()
+
+    return {
+        "load_seconds": round(loaded - start, 3),
+        "inference_ms": round((done - loaded) * 1000, 1),
+    }
+
+
+def _warmup_rag() -> Dict:
+    from services.rag_client import _get_rag_system
+
+    start = time.perf_counter()
+    rag_system = _get_rag_system()
+    loaded = time.perf_counter()
+    if rag_system is None:
+        raise RuntimeError("RAG 시스템을 초기화할 수 없습니다 (로그 참고).")
+
+    # 쿼리 임베딩 + 벡터 검색 한 번
+    rag_system.search_documents("응급 처치", k=1)
+    done = time.perf_counter()
+
+    return {
+        "load_seconds": round(loaded - start, 3),
+        "inference_ms": round((done - loaded) * 1000, 1),
+    }
+
+
+WARMUP_STEPS = {
+    "sound": _warmup_sound,
+    "whisper": _warmup_whisper,
+    "rag": _warmup_rag,
+}
+
+
+def run_warmup(components: Optional[Iterable[str]] = None) -> Dict:
+    """
+    지정한 구성 요소를 순서대로 로드 + 더미 추론하고 단계별 소요 시간을 반환.
+    실패한 구성 요소는 기록만 하고 넘어간다 (첫 요청 때 다시 lazy 로드 시도).
+    여러 번 동시에 호출되어도 한 번에 하나씩만 실행된다.
+    """
+    names = list(components) if components is not None else WARMUP_COMPONENTS
+
+    with _warmup_lock:
+        components = _warmup_status["components"]
+        total_start = time.perf_counter()
+        for name in names:
+            step = WARMUP_STEPS.get(name)
+            if step is None:
+                components[name] = {"status": "unknown"}
+                continue
+
+            start = time.perf_counter()
+            try:
+                result = {"status": "ok", **step()}
+            except ImportError as e:
+                result = {"status": "skipped", "error": str(e)}
+            except Exception as e:
+                logger.error(f"{name} 워밍업 실패: {e}")
+                result = {"status": "failed", "error": str(e)}
+            result["total_seconds"] = round(time.perf_counter() - start, 3)
+            components[name] = result
+            logger.info(f"워밍업 {name}: {result}")
+
+        _warmup_status["total_seconds"] = round(time.perf_counter() - total_start, 3)
+        return get_warmup_status()
+
+
+def get_warmup_status() -> Dict:
+    """구성 요소별 마지막 워밍업 결과와 전체 소요 시간 (실행 전이면 components가 비어 있음)"""
+    return {
+        "components": {name: dict(result) for name, result in _warmup_status["components"].items()},
+        "total_seconds": _warmup_status["total_seconds"],
+    }
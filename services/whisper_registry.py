@@ -0,0 +1,132 @@
+# services/whisper_registry.py
+# Whisper 모델 레지스트리 - 프로세스당 한 번만 로드하여 모든 요청이 공유
+
+import os
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 사용할 Whisper 모델 크기 (tiny / base / small / medium / large)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+
+# 서버 시작 시 미리 로드할지 여부 (0이면 첫 요청 때 로드)
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "1") != "0"
+
+_models: Dict[str, object] = {}
+_stats: Dict[str, Dict] = {}
+_load_lock = threading.Lock()
+
+# Whisper의 transcribe/decode는 모델에 kv-cache hook을 설치했다가 해제하므로
+# 같은 모델 인스턴스로 동시에 추론하면 서로 간섭한다 → 모델별 추론 락
+_inference_locks: Dict[str, threading.Lock] = {}
+
+
+def _current_rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS (MB). 지원하지 않는 플랫폼이면 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        # Linux는 KB, macOS는 byte 단위 (최대 RSS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if peak < 1 << 40 else peak / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _load_model(size: str):
+    """실제 모델 로드 + 로드 시간/메모리 측정 (호출자가 _load_lock을 잡고 있어야 함)"""
+    import whisper
+
+    print(f"🔄 Whisper 모델 로드 중... ({size})")
+    rss_before = _current_rss_mb()
+    start = time.perf_counter()
+
+    model = whisper.load_model(size)
+
+    load_seconds = time.perf_counter() - start
+    rss_after = _current_rss_mb()
+
+    param_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+    buffer_bytes = sum(b.numel() * b.element_size() for b in model.buffers())
+
+    _stats[size] = {
+        "model_size": size,
+        "device": str(next(model.parameters()).device),
+        "load_seconds": round(load_seconds, 3),
+        "param_memory_mb": round((param_bytes + buffer_bytes) / (1024 * 1024), 1),
+        "rss_delta_mb": (
+            round(rss_after - rss_before, 1)
+            if rss_before is not None and rss_after is not None else None
+        ),
+        "loaded_at": time.time(),
+    }
+    _inference_locks[size] = threading.Lock()
+    _models[size] = model
+
+    print(
+        f"✅ Whisper 모델 로드 완료 ({size}, {load_seconds:.2f}s, "
+        f"파라미터 {_stats[size]['param_memory_mb']} MB)"
+    )
+    return model
+
+
+def get_whisper_model(size: Optional[str] = None):
+    """
+    공유 Whisper 모델 반환 (없으면 로드).
+
+    whisper가 설치되지 않았으면 ImportError가 그대로 올라간다.
+    """
+    size = size or WHISPER_MODEL_SIZE
+
+    model = _models.get(size)
+    if model is not None:
+        return model
+
+    # 동시에 들어온 첫 요청들이 각각 모델을 만들지 않도록 double-checked locking
+    with _load_lock:
+        model = _models.get(size)
+        if model is None:
+            model = _load_model(size)
+    return model
+
+
+def whisper_inference_lock(size: Optional[str] = None) -> threading.Lock:
+    """해당 모델로 추론할 때 잡아야 하는 락 (모델이 없으면 먼저 로드)"""
+    size = size or WHISPER_MODEL_SIZE
+    get_whisper_model(size)
+    return _inference_locks[size]
+
+
+def preload_whisper_model(size: Optional[str] = None) -> Optional[Dict]:
+    """
+    서버 시작 시 호출: 모델을 미리 올려두고 로드 통계를 반환.
+    whisper가 없거나 로드에 실패하면 None (서버 기동은 계속)
+    """
+    size = size or WHISPER_MODEL_SIZE
+    try:
+        get_whisper_model(size)
+    except ImportError:
+        print("⚠️  whisper가 설치되지 않았습니다. STT 기능을 사용하려면: pip install openai-whisper")
+        return None
+    except Exception as e:
+        logger.error(f"Whisper 모델 사전 로드 실패 ({size}): {e}")
+        return None
+    return dict(_stats[size])
+
+
+def get_whisper_stats() -> Dict:
+    """로드된 모델별 로드 시간/메모리 통계"""
+    return {
+        "configured_size": WHISPER_MODEL_SIZE,
+        "models": {size: dict(stat) for size, stat in _stats.items()},
+        "process_rss_mb": _current_rss_mb(),
+    }